@@ -19,6 +19,17 @@ class Settings:
         self.telegram_authorized_users = self._parse_authorized_users(
             os.getenv('TELEGRAM_AUTHORIZED_USERS', '')
         )
+        # Receive updates by webhook when a public base URL is set, otherwise
+        # poll; Telegram posts to <url>/<path>
+        self.telegram_webhook_url = os.getenv('TELEGRAM_WEBHOOK_URL', '')
+        self.telegram_webhook_listen = os.getenv('TELEGRAM_WEBHOOK_LISTEN', '0.0.0.0')
+        self.telegram_webhook_port = int(os.getenv('TELEGRAM_WEBHOOK_PORT', '8443'))
+        self.telegram_webhook_path = os.getenv('TELEGRAM_WEBHOOK_PATH', 'telegram')
+        self.telegram_webhook_secret = os.getenv('TELEGRAM_WEBHOOK_SECRET', '')
+        # Notification subscribers are kept here across restarts
+        self.telegram_subscribers_file = os.getenv(
+            'TELEGRAM_SUBSCRIBERS_FILE', 'data/telegram_subscribers.json'
+        )
         
         # Trading settings
         self.trading_enabled = os.getenv('TRADING_ENABLED', 'false').lower() == 'true'
@@ -4,11 +4,19 @@ Handles all communication with the MXC exchange API
 """
 import json
 import asyncio
+import inspect
 import websockets
 from typing import Dict, Any, Optional, Callable, List
 import logging
 import ccxt.async_support as ccxt
 
+try:
+    # Optional: faster decoding of the WebSocket stream
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 class MXCClient:
     """
@@ -232,6 +240,16 @@ class MXCClient:
             self.logger.error(f"Error getting ticker: {e}")
             return {}
     
+    async def get_last_price(self, symbol: str) -> Optional[float]:
+        """Get the last traded price for a symbol, or None if unavailable."""
+        try:
+            ticker = await self.exchange.fetch_ticker(symbol)
+            last = ticker.get('last')
+            return float(last) if last is not None else None
+        except Exception as e:
+            self.logger.error(f"Error getting last price: {e}")
+            return None
+    
     async def get_depth(self, symbol: str, limit: int = 100) -> Dict[str, Any]:
         """Get order book depth."""
         try:
@@ -287,7 +305,7 @@ class MXCClient:
                     # Listen for messages
                     async for message in ws:
                         try:
-                            data = json.loads(message)
+                            data = _json_loads(message)
                             await self._handle_websocket_message(data)
                         except json.JSONDecodeError:
                             self.logger.error(f"Invalid JSON received: {message}")
@@ -323,11 +341,13 @@ class MXCClient:
             channel = data['channel']
             message_data = data['data']
             
-            # Notify registered callbacks
+            # Notify registered callbacks; plain functions are not awaited
             if channel in self.market_callbacks:
                 for callback in self.market_callbacks[channel]:
                     try:
-                        await callback(message_data)
+                        result = callback(message_data)
+                        if inspect.isawaitable(result):
+                            await result
                     except Exception as e:
                         self.logger.error(f"Error in market callback: {e}")
     
@@ -9,6 +9,13 @@ import websockets
 from typing import Dict, Any, Callable, List
 import logging
 
+try:
+    # Optional: faster decoding of the WebSocket stream
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 class MarketDataHandler:
     """
@@ -82,7 +89,7 @@ class MarketDataHandler:
                     # Listen for messages
                     async for message in ws:
                         try:
-                            data = json.loads(message)
+                            data = _json_loads(message)
                             await self._handle_message(data)
                         except json.JSONDecodeError:
                             self.logger.error(f"Invalid JSON received: {message}")
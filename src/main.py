@@ -18,6 +18,7 @@ from src.monitoring.logger import setup_logging
 from src.monitoring.metrics import MetricsManager
 from src.risk_management.risk_calculator import RiskManager
 from src.web.web_interface import WebBotController
+from src.utils.helpers import install_uvloop
 
 
 class MXCScalpBot:
@@ -101,7 +102,13 @@ class MXCScalpBot:
                     range_scalp_strategy=self.range_scalp_strategy,
                     futures_strategy=self.futures_strategy,
                     metrics_manager=self.metrics_manager,
-                    risk_manager=self.risk_manager
+                    risk_manager=self.risk_manager,
+                    webhook_url=self.settings.telegram_webhook_url,
+                    webhook_listen=self.settings.telegram_webhook_listen,
+                    webhook_port=self.settings.telegram_webhook_port,
+                    webhook_path=self.settings.telegram_webhook_path,
+                    webhook_secret=self.settings.telegram_webhook_secret,
+                    subscribers_file=self.settings.telegram_subscribers_file
                 )
             except InvalidToken as exc:
                 self.logger.warning("Invalid Telegram token provided: %s", exc)
@@ -146,7 +153,7 @@ class MXCScalpBot:
             
             # Start the Telegram bot if available
             if self.telegram_bot:
-                await self.telegram_bot.start_polling()
+                await self.telegram_bot.start_updates()
             
             # Start the web interface in a separate thread
             if self.web_controller:
@@ -194,7 +201,8 @@ class MXCScalpBot:
             self.futures_strategy.stop()
         
         if self.mxc_client:
-            await self.mxc_client.stop_websocket()
+            # Stops the WebSocket and closes the pooled REST session
+            await self.mxc_client.close()
         
         if self.telegram_bot:
             await self.telegram_bot.stop()
@@ -208,6 +216,7 @@ class MXCScalpBot:
 
 def main():
     """Main entry point."""
+    install_uvloop()
     bot = MXCScalpBot()
     
     try:
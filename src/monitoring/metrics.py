@@ -7,8 +7,11 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 from collections import deque
+from itertools import islice
 import statistics
 
+import numpy as np
+
 
 class MetricsManager:
     """
@@ -28,7 +31,8 @@ class MetricsManager:
         self.total_trades = 0
         self.best_trade = float('-inf')
         self.worst_trade = float('inf')
-        self.profit_history = deque(maxlen=max_trades_history)
+        # Ring buffer of the last max_trades_history profits; slot is total_trades % size
+        self._profits = np.empty(max_trades_history, dtype=np.float64)
         
         # Timing and performance
         self.start_time = datetime.now()
@@ -48,9 +52,9 @@ class MetricsManager:
         }
         
         self.trade_history.append(trade_record)
+        self._profits[self.total_trades % len(self._profits)] = profit
         self.total_trades += 1
         self.total_profit += profit
-        self.profit_history.append(profit)
         
         # Update win/loss count
         if profit > 0:
@@ -77,15 +81,18 @@ class MetricsManager:
         """
         win_rate = self.win_count / max(self.total_trades, 1)
         
+        # Profits within the history window (order doesn't matter here)
+        profits = self._profits[:min(self.total_trades, len(self._profits))]
+        
         # Calculate profit factor (gross profit / gross loss)
-        gross_profit = sum(p for p in self.profit_history if p > 0)
-        gross_loss = abs(sum(p for p in self.profit_history if p < 0))
+        gross_profit = float(profits[profits > 0].sum())
+        gross_loss = float(-profits[profits < 0].sum())
         profit_factor = gross_profit / gross_loss if gross_loss != 0 else float('inf')
         
         # Calculate Sharpe ratio (simplified)
-        if len(self.profit_history) > 1:
-            returns_std = statistics.stdev(self.profit_history) if len(self.profit_history) > 1 else 0
-            expected_return = statistics.mean(self.profit_history) if self.profit_history else 0
+        if len(profits) > 1:
+            returns_std = float(profits.std(ddof=1))
+            expected_return = float(profits.mean())
             sharpe_ratio = expected_return / returns_std if returns_std != 0 else 0
         else:
             sharpe_ratio = 0
@@ -108,11 +115,23 @@ class MetricsManager:
             'win_loss_ratio': self.win_count / max(self.loss_count, 1)
         }
     
+    @property
+    def profit_history(self) -> np.ndarray:
+        """Profits of the retained trades, oldest first."""
+        size = len(self._profits)
+        if self.total_trades <= size:
+            return self._profits[:self.total_trades].copy()
+        start = self.total_trades % size
+        return np.concatenate((self._profits[start:], self._profits[:start]))
+    
     def get_recent_trades(self, count: int = 10) -> List[Dict[str, Any]]:
         """
         Get the most recent trades.
         """
-        return list(self.trade_history)[-count:]
+        # Walk back from the newest instead of copying the whole history
+        recent = list(islice(reversed(self.trade_history), count))
+        recent.reverse()
+        return recent
     
     def get_profit_by_symbol(self, symbol: str) -> float:
         """
@@ -154,7 +173,6 @@ class MetricsManager:
         self.total_trades = 0
         self.best_trade = float('-inf')
         self.worst_trade = float('inf')
-        self.profit_history.clear()
         self.trade_execution_times.clear()
         self.start_time = datetime.now()
         
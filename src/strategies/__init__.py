@@ -5,6 +5,12 @@ from .base_strategy import BaseStrategy
 from .scalping_strategy import ScalpingStrategy
 from .range_scalp_strategy import RangeScalpStrategy
 from .futures_strategy import FuturesStrategy
-from .indicators import Indicators
+from .indicators import (
+    Indicators, RollingSMA, RollingStd, BollingerBands, RollingRSI, RollingEMA,
+    RingBuffer, RollingATR, SlidingMinMax, MACDBank
+)
 
-__all__ = ['BaseStrategy', 'ScalpingStrategy', 'RangeScalpStrategy', 'FuturesStrategy', 'Indicators']
\ No newline at end of file
+__all__ = ['BaseStrategy', 'ScalpingStrategy', 'RangeScalpStrategy', 'FuturesStrategy', 'Indicators',
+           'RollingSMA', 'RollingStd', 'BollingerBands', 'RollingRSI',
+           'RollingEMA', 'RingBuffer', 'RollingATR',
+           'SlidingMinMax', 'MACDBank']
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Numerical Kernels for Technical Indicators
+
+JIT-compiled inner loops for the batch indicator paths. Numba is optional:
+without it the kernels run as plain Python and callers keep using the
+NumPy/pandas implementations instead.
+"""
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - depends on the environment
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Minimum series length at which the compiled kernels beat pandas/NumPy
+KERNEL_MIN_LENGTH = 64
+
+
+@njit(cache=True, fastmath=True)
+def ema_1d(x, period):
+    """Recursive EMA seeded with the first value: V_i = k*x_i + (1-k)*V_{i-1}."""
+    out = np.empty(x.shape[0], dtype=np.float64)
+    if x.shape[0] == 0:
+        return out
+    k = 2.0 / (period + 1)
+    v = x[0]
+    out[0] = v
+    for i in range(1, x.shape[0]):
+        v = k * x[i] + (1.0 - k) * v
+        out[i] = v
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def rolling_mean_std(x, period):
+    """
+    Rolling mean and population std (ddof=0) from two running sums.
+    
+    Returns two arrays of len(x) - period + 1 values, one per full window.
+    """
+    n = x.shape[0] - period + 1
+    if n <= 0:
+        return np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64)
+    mean = np.empty(n, dtype=np.float64)
+    std = np.empty(n, dtype=np.float64)
+    s = 0.0
+    s2 = 0.0
+    for i in range(x.shape[0]):
+        v = x[i]
+        s += v
+        s2 += v * v
+        if i >= period:
+            w = x[i - period]
+            s -= w
+            s2 -= w * w
+        if i >= period - 1:
+            m = s / period
+            var = s2 / period - m * m
+            mean[i - period + 1] = m
+            std[i - period + 1] = np.sqrt(var) if var > 0.0 else 0.0
+    return mean, std
+
+
+@njit(cache=True, parallel=True)
+def macd_step(idx, prices, ema_fast, ema_slow, ema_signal, seeded, k_fast, k_slow, k_signal):
+    """
+    Advance per-symbol MACD state stored as parallel arrays (structure of
+    arrays). Row idx[j] receives prices[j]; rows are independent, so they are
+    updated in parallel. A row's first price seeds its EMAs.
+    """
+    for j in prange(idx.shape[0]):
+        i = idx[j]
+        p = prices[j]
+        if seeded[i]:
+            ema_fast[i] = p * k_fast + ema_fast[i] * (1.0 - k_fast)
+            ema_slow[i] = p * k_slow + ema_slow[i] * (1.0 - k_slow)
+            macd = ema_fast[i] - ema_slow[i]
+            ema_signal[i] = macd * k_signal + ema_signal[i] * (1.0 - k_signal)
+        else:
+            ema_fast[i] = p
+            ema_slow[i] = p
+            ema_signal[i] = 0.0
+            seeded[i] = True
+
+
+@njit(cache=True, fastmath=True)
+def wilder_rsi(closes, rsi_period):
+    """
+    Wilder's RSI over a window of closes, seeded at the window's first change.
+    Neutral (50) until the window holds rsi_period + 1 closes.
+    """
+    n = closes.shape[0]
+    if n < rsi_period + 1:
+        return 50.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+    rsi_n = 0
+    for i in range(1, n):
+        change = closes[i] - closes[i - 1]
+        gain = change if change > 0.0 else 0.0
+        loss = -change if change < 0.0 else 0.0
+        if rsi_n < rsi_period:
+            rsi_n += 1
+            avg_gain += (gain - avg_gain) / rsi_n
+            avg_loss += (loss - avg_loss) / rsi_n
+        else:
+            avg_gain = (avg_gain * (rsi_period - 1) + gain) / rsi_period
+            avg_loss = (avg_loss * (rsi_period - 1) + loss) / rsi_period
+    if avg_loss == 0.0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+@njit(cache=True, fastmath=True)
+def scalp_signal_with_rsi(closes, rsi, sma_short, sma_long, bb_period):
+    """
+    scalp_signal() with the RSI supplied by the caller, e.g. the Wilder RSI a
+    streaming state has carried since seeding.
+    """
+    n = closes.shape[0]
+    if n < 2:
+        return False, False, 0.0, 0.0
+    
+    s_short = 0.0
+    s_long = 0.0
+    s_bb = 0.0
+    mad = 0.0
+    for i in range(n):
+        c = closes[i]
+        if i >= n - sma_short:
+            s_short += c
+        if i >= n - sma_long:
+            s_long += c
+        if i >= n - bb_period:
+            s_bb += c
+        if i > 0 and i >= n - 4:
+            mad += abs(c - closes[i - 1])
+    
+    sma_s = s_short / min(n, sma_short)
+    sma_l = s_long / min(n, sma_long)
+    bb_middle = s_bb / min(n, bb_period)
+    momentum = closes[n - 1] - closes[n - 11] if n >= 11 else 0.0
+    mad /= min(4, n - 1)
+    
+    current = closes[n - 1]
+    previous = closes[n - 2]
+    rsi_ok = 30.0 < rsi < 70.0
+    is_bullish = (current > sma_s and sma_s > sma_l and rsi_ok and
+                  previous <= bb_middle and current > bb_middle)
+    is_bearish = (current < sma_s and sma_s < sma_l and rsi_ok and
+                  previous >= bb_middle and current < bb_middle)
+    return is_bullish, is_bearish, momentum, mad
+
+
+# Eagerly compiled for float64 closes so the first tick pays no JIT cost
+@njit('Tuple((b1, b1, f8, f8))(f8[::1], i8, i8, i8, i8)', cache=True, fastmath=True)
+def scalp_signal(closes, rsi_period, sma_short, sma_long, bb_period):
+    """
+    Scalping entry signal over a window of closes, newest last.
+    
+    Uses SMA(sma_short), SMA(sma_long), the Bollinger middle band
+    (SMA(bb_period)), Wilder's RSI over the window, 10-bar momentum and the
+    mean absolute change over the last four bars. Returns
+    (is_bullish, is_bearish, momentum, mean_abs_delta).
+    """
+    return scalp_signal_with_rsi(closes, wilder_rsi(closes, rsi_period),
+                                 sma_short, sma_long, bb_period)
+
+
+@njit(cache=True, parallel=True)
+def scalp_signal_batch(closes, rsi, out_bull, out_bear, out_mom, out_mad,
+                       sma_short, sma_long, bb_period):
+    """
+    scalp_signal_with_rsi() for every row of a (symbols x bars) C-contiguous
+    closes matrix, with rsi[s] the RSI of row s. Rows are independent, so they
+    are evaluated in parallel.
+    """
+    for s in prange(closes.shape[0]):
+        bull, bear, mom, mad = scalp_signal_with_rsi(closes[s], rsi[s], sma_short,
+                                                     sma_long, bb_period)
+        out_bull[s] = bull
+        out_bear[s] = bear
+        out_mom[s] = mom
+        out_mad[s] = mad
@@ -20,6 +20,9 @@ class FuturesStrategy(BaseStrategy):
     Futures trading strategy with leverage and position management.
     """
     
+    # Fall back to a REST price if the stream is silent for this long
+    PRICE_WAIT_TIMEOUT = 5.0
+    
     def __init__(self, exchange_client: MXCClient, metrics_manager: MetricsManager, 
                  settings: Settings):
         super().__init__("FuturesStrategy", {
@@ -41,6 +44,11 @@ class FuturesStrategy(BaseStrategy):
         self.active_positions = {}  # Track active futures positions
         self.trading_pairs = [settings.default_symbol]
         
+        # Last streamed price per symbol; a tick notifies only the position
+        # monitors waiting on that symbol's condition
+        self._last_price: Dict[str, float] = {}
+        self._price_conds: Dict[str, asyncio.Condition] = {}
+        
         # Register callbacks for market data
         for pair in self.trading_pairs:
             self.exchange_client.register_market_callback(pair, self._on_market_update)
@@ -80,6 +88,12 @@ class FuturesStrategy(BaseStrategy):
                 symbol = trade.get('symbol', self.settings.default_symbol)
                 price = float(trade.get('price', 0))
             
+            self._last_price[symbol] = price
+            cond = self._price_conds.get(symbol)
+            if cond is not None:
+                async with cond:
+                    cond.notify_all()
+            
             # Check for futures trading opportunities based on current price
             if self.is_running and self.settings.trading_enabled:
                 await self._check_futures_opportunities(symbol, price)
@@ -178,6 +192,21 @@ class FuturesStrategy(BaseStrategy):
         except Exception as e:
             self.logger.error(f"Error entering futures position: {e}")
     
+    async def _next_price(self, symbol: str) -> Optional[float]:
+        """
+        Wait for the symbol's next streamed tick and return its price; if the
+        symbol stays silent, fetch the price over REST instead.
+        """
+        cond = self._price_conds.get(symbol)
+        if cond is None:
+            cond = self._price_conds[symbol] = asyncio.Condition()
+        try:
+            async with cond:
+                await asyncio.wait_for(cond.wait(), self.PRICE_WAIT_TIMEOUT)
+        except asyncio.TimeoutError:
+            return await self.exchange_client.get_last_price(symbol)
+        return self._last_price[symbol]
+    
     async def _monitor_position(self, position_key: str):
         """Monitor a futures position and manage stop loss/profit taking."""
         if position_key not in self.active_positions:
@@ -194,8 +223,9 @@ class FuturesStrategy(BaseStrategy):
             # Get real-time price updates
             while position_key in self.active_positions:
                 # In a real implementation, you'd get mark price for futures
-                ticker = await self.exchange_client.get_ticker_24hr(symbol)
-                current_price = float(ticker[0]['lastPrice']) if isinstance(ticker, list) else float(ticker['lastPrice'])
+                current_price = await self._next_price(symbol)
+                if current_price is None:
+                    continue
                 
                 # Check stop loss
                 should_stop = (
@@ -237,8 +267,6 @@ class FuturesStrategy(BaseStrategy):
                     else:
                         self.logger.error(f"Failed to close futures position: {close_result}")
                 
-                await asyncio.sleep(1)  # Check every second
-                
         except Exception as e:
             self.logger.error(f"Error monitoring futures position {position_key}: {e}")
     
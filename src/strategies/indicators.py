@@ -3,61 +3,102 @@ Technical Indicators for Trading Strategies
 
 Implements various technical indicators used in trading strategies
 """
-from typing import List, Tuple
-import statistics
+from collections import deque
+from math import sqrt
+from typing import Dict, Optional, Sequence, Tuple
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from src.strategies import _kernels
 
 
 class Indicators:
     """
     Class containing various technical indicators used in trading strategies.
+    
+    The scalar helpers accept any indexable sequence (list, deque, RingBuffer)
+    and walk the trailing window by index instead of slicing it, so no
+    temporary lists are allocated per call.
     """
     
     @staticmethod
-    def simple_moving_average(values: List[float], period: int) -> float:
+    def simple_moving_average(values: Sequence[float], period: int) -> float:
         """
         Calculate Simple Moving Average (SMA).
         """
-        if len(values) < period:
-            return sum(values) / len(values) if values else 0
-        return sum(values[-period:]) / period
+        n = len(values)
+        if n < period:
+            return sum(values) / n if n else 0
+        total = 0.0
+        for i in range(n - period, n):
+            total += values[i]
+        return total / period
     
     @staticmethod
-    def exponential_moving_average(values: List[float], period: int) -> float:
+    def exponential_moving_average(values: Sequence[float], period: int) -> float:
         """
         Calculate Exponential Moving Average (EMA).
+        
+        Deprecated: this re-seeds from an SMA and walks the whole series on
+        every call. Keep a RollingEMA and call update() per price instead, or
+        RollingEMA.seed() to warm it up from history.
         """
-        if not values:
+        warnings.warn(
+            "Indicators.exponential_moving_average is deprecated; use RollingEMA",
+            DeprecationWarning,
+            stacklevel=2
+        )
+        n = len(values)
+        if not n:
             return 0
         
-        if len(values) == 1:
+        if n == 1:
             return values[0]
         
         # For periods >= length of data, fall back to SMA
-        if len(values) <= period:
-            return Indicators.simple_moving_average(values, len(values))
+        if n <= period:
+            return Indicators.simple_moving_average(values, n)
         
         # Calculate multiplier
         multiplier = 2 / (period + 1)
         
-        # Start with SMA for the first value
-        ema = Indicators.simple_moving_average(values[:period], period)
+        # Start with SMA of the first period values
+        ema = 0.0
+        for i in range(period):
+            ema += values[i]
+        ema /= period
         
         # Calculate EMA for remaining values
-        for value in values[period:]:
-            ema = (value * multiplier) + (ema * (1 - multiplier))
+        for i in range(period, n):
+            ema = (values[i] * multiplier) + (ema * (1 - multiplier))
         
         return ema
     
     @staticmethod
-    def bollinger_bands(values: List[float], period: int, std_dev: float = 2.0) -> Tuple[float, float, float]:
+    def bollinger_bands(values: Sequence[float], period: int, std_dev: float = 2.0,
+                        rolling_std: Optional['RollingStd'] = None) -> Tuple[float, float, float]:
         """
         Calculate Bollinger Bands (upper, middle, lower).
+        
+        Uses the population standard deviation (ddof=0). If a RollingStd that
+        has been fed the same values is passed in, its O(1) running value is
+        used instead of re-scanning the window.
         """
         if len(values) < period:
             return 0, 0, 0
         
-        sma = Indicators.simple_moving_average(values[-period:], period)
-        std = statistics.stdev(values[-period:])
+        sma = Indicators.simple_moving_average(values, period)
+        if rolling_std is not None:
+            std = rolling_std.std
+        else:
+            n = len(values)
+            sq_dev = 0.0
+            for i in range(n - period, n):
+                d = values[i] - sma
+                sq_dev += d * d
+            std = sqrt(sq_dev / period)
         
         upper_band = sma + (std_dev * std)
         lower_band = sma - (std_dev * std)
@@ -65,69 +106,40 @@ class Indicators:
         return upper_band, sma, lower_band
     
     @staticmethod
-    def relative_strength_index(values: List[float], period: int = 14) -> float:
+    def relative_strength_index(values: Sequence[float], period: int = 14) -> float:
         """
-        Calculate Relative Strength Index (RSI).
+        Calculate Relative Strength Index (RSI) with Wilder's smoothing.
         """
         if len(values) < period + 1:
             return 50.0  # Neutral RSI value
         
-        # Calculate gains and losses
-        gains = []
-        losses = []
-        
-        for i in range(1, len(values[-(period+1):])):
-            change = values[-(period+1)+i] - values[-(period+1)+i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        # Calculate average gain and loss
-        if len(gains) < period:
-            avg_gain = sum(gains) / len(gains) if gains else 0
-            avg_loss = sum(losses) / len(losses) if losses else 0
-        else:
-            avg_gain = sum(gains[-period:]) / period
-            avg_loss = sum(losses[-period:]) / period
-        
-        # Calculate RSI
-        if avg_loss == 0:
-            return 100.0
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        rsi = RollingRSI(period)
+        for value in values:
+            rsi.update(value)
+        return rsi.value
     
     @staticmethod
-    def moving_average_convergence_divergence(values: List[float], 
+    def moving_average_convergence_divergence(values: Sequence[float], 
                                             fast_period: int = 12, 
                                             slow_period: int = 26, 
                                             signal_period: int = 9) -> Tuple[float, float, float]:
         """
         Calculate MACD (Line, Signal, Histogram).
+        
+        Folds the whole series through persistent EMAs so the signal line is
+        the EMA of the MACD line itself. Streaming callers should keep their
+        own RollingEMA instances instead of calling this on every tick.
         """
         if len(values) < slow_period + signal_period:
             return 0, 0, 0
         
-        # Calculate EMAs
-        slow_ema = Indicators.exponential_moving_average(values[-slow_period:], slow_period)
-        fast_ema = Indicators.exponential_moving_average(values[-fast_period:], fast_period)
+        fast_ema = RollingEMA(fast_period)
+        slow_ema = RollingEMA(slow_period)
+        signal_ema = RollingEMA(signal_period)
         
-        # Calculate MACD line
-        macd_line = fast_ema - slow_ema
-        
-        # Calculate signal line
-        # For simplicity, we'll calculate it from the current MACD line
-        # This is simplified - in practice, you'd track MACD line over time
-        if len(values) >= slow_period + signal_period + fast_period:
-            # This is a simplified approach - a full implementation would maintain historical MACD values
-            signal_line = macd_line  # Placeholder
-        else:
-            signal_line = macd_line  # Placeholder
+        for value in values:
+            macd_line = fast_ema.update(value) - slow_ema.update(value)
+            signal_line = signal_ema.update(macd_line)
         
         # Calculate histogram
         histogram = macd_line - signal_line
@@ -135,41 +147,439 @@ class Indicators:
         return macd_line, signal_line, histogram
     
     @staticmethod
-    def average_true_range(highs: List[float], lows: List[float], closes: List[float], 
-                          period: int = 14) -> float:
+    def average_true_range(highs: Sequence[float], lows: Sequence[float],
+                           closes: Sequence[float], period: int = 14) -> float:
         """
-        Calculate Average True Range (ATR).
+        Calculate Average True Range (ATR) with Wilder's smoothing.
         """
         if len(highs) < period or len(lows) < period or len(closes) < period:
             return 0
-            
-        true_ranges = []
-        for i in range(1, len(closes)):
-            high = highs[-i]
-            low = lows[-i]
-            prev_close = closes[-i-1] if i < len(closes) - 1 else closes[-i]
-            
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
         
-        # Only consider up to period values
-        true_ranges = true_ranges[-period:] if len(true_ranges) >= period else true_ranges
-        
-        if not true_ranges:
-            return 0
-            
-        return sum(true_ranges) / len(true_ranges)
+        return float(Indicators.atr_series(highs, lows, closes, period)[-1])
     
     @staticmethod
-    def momentum(closes: List[float], period: int = 10) -> float:
+    def momentum(closes: Sequence[float], period: int = 10) -> float:
         """
         Calculate Momentum indicator.
         """
         if len(closes) < period + 1:
             return 0
             
-        return closes[-1] - closes[-period - 1]
\ No newline at end of file
+        return closes[-1] - closes[-period - 1]
+
+    
+    # Batch (series) variants for warm-up and backtests, where N >> period
+    
+    @staticmethod
+    def sma_series(values, period: int, dtype=np.float64) -> np.ndarray:
+        """
+        Calculate SMA over a whole series using the cumulative-sum trick.
+        
+        Returns len(values) - period + 1 values, one per full window. Pass
+        dtype=np.float32 to keep the input and output at half the size; the
+        running sum is always accumulated in float64, since a float32 cumsum
+        of prices loses whole units after a few thousand bars.
+        """
+        arr = np.asarray(values, dtype=dtype)
+        if len(arr) < period:
+            return np.empty(0, dtype=dtype)
+        csum = np.cumsum(arr, dtype=np.float64)
+        sma = (csum[period - 1:] - np.concatenate(([0.0], csum[:-period]))) / period
+        return sma.astype(dtype, copy=False)
+    
+    @staticmethod
+    def ema_series(values, period: int, dtype=np.float64) -> np.ndarray:
+        """
+        Calculate EMA over a whole series (seeded with the first value).
+        """
+        arr = np.asarray(values, dtype=dtype)
+        if _kernels.NUMBA_AVAILABLE and len(arr) >= _kernels.KERNEL_MIN_LENGTH:
+            ema = _kernels.ema_1d(arr, period)
+        else:
+            ema = pd.Series(arr).ewm(span=period, adjust=False).mean().to_numpy()
+        return ema.astype(dtype, copy=False)
+    
+    @staticmethod
+    def bbands_series(values, period: int, std_dev: float = 2.0,
+                      dtype=np.float64) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Calculate Bollinger Bands (upper, middle, lower) over a whole series.
+        
+        Uses the population standard deviation (ddof=0), like bollinger_bands.
+        """
+        arr = np.asarray(values, dtype=dtype)
+        if _kernels.NUMBA_AVAILABLE and len(arr) >= _kernels.KERNEL_MIN_LENGTH:
+            middle, std = _kernels.rolling_mean_std(arr, period)
+        else:
+            middle = Indicators.sma_series(arr, period, dtype=np.float64)
+            std = pd.Series(arr).rolling(period).std(ddof=0).to_numpy()[period - 1:]
+        width = float(std_dev) * std
+        return ((middle + width).astype(dtype, copy=False),
+                middle.astype(dtype, copy=False),
+                (middle - width).astype(dtype, copy=False))
+    
+    @staticmethod
+    def atr_series(highs, lows, closes, period: int = 14) -> np.ndarray:
+        """
+        Calculate ATR over a whole series with Wilder's smoothing.
+        
+        The first ATR is the mean of the first `period` true ranges, matching
+        RollingATR. Returns len(closes) - period + 1 values.
+        """
+        h = np.asarray(highs, dtype=np.float64)
+        l = np.asarray(lows, dtype=np.float64)
+        c = np.asarray(closes, dtype=np.float64)
+        if len(c) < period:
+            return np.empty(0, dtype=np.float64)
+        
+        prev_c = np.concatenate((c[:1], c[:-1]))
+        tr = np.maximum.reduce([h - l, np.abs(h - prev_c), np.abs(l - prev_c)])
+        tr[0] = h[0] - l[0]  # No previous close for the first bar
+        
+        seeded = tr[period - 1:].copy()
+        seeded[0] = tr[:period].mean()
+        return pd.Series(seeded).ewm(alpha=1 / period, adjust=False).mean().to_numpy()
+
+
+class RollingSMA:
+    """
+    Simple Moving Average updated in O(1) per sample.
+    """
+    
+    def __init__(self, period: int):
+        self.period = period
+        self.sum = 0.0
+        self.buf = deque(maxlen=period)
+    
+    def update(self, x: float) -> float:
+        """Add a sample and return the current average."""
+        if len(self.buf) == self.period:
+            self.sum -= self.buf[0]
+        self.buf.append(x)
+        self.sum += x
+        return self.sum / len(self.buf)
+    
+    @property
+    def value(self) -> float:
+        return self.sum / len(self.buf) if self.buf else 0.0
+
+
+class RollingStd:
+    """
+    Population standard deviation (ddof=0) over a sliding window, updated in
+    O(1) per sample from running sums of x and x*x.
+    """
+    
+    def __init__(self, period: int):
+        self.period = period
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.buf = deque(maxlen=period)
+    
+    def update(self, x: float) -> float:
+        """Add a sample and return the current standard deviation."""
+        if len(self.buf) == self.period:
+            old = self.buf[0]
+            self.sum -= old
+            self.sum_sq -= old * old
+        self.buf.append(x)
+        self.sum += x
+        self.sum_sq += x * x
+        return self.std
+    
+    @property
+    def std(self) -> float:
+        n = len(self.buf)
+        if not n:
+            return 0.0
+        mean = self.sum / n
+        # Clamp tiny negative values caused by floating point cancellation
+        return sqrt(max(0.0, self.sum_sq / n - mean * mean))
+
+
+class BollingerBands:
+    """
+    Stateful Bollinger Bands keeping a RollingSMA and RollingStd in lockstep.
+    """
+    
+    def __init__(self, period: int = 20, std_dev: float = 2.0):
+        self.period = period
+        self.std_dev = std_dev
+        self.sma = RollingSMA(period)
+        self.rolling_std = RollingStd(period)
+    
+    def update(self, x: float) -> Tuple[float, float, float]:
+        """Add a sample and return (upper, middle, lower)."""
+        middle = self.sma.update(x)
+        std = self.rolling_std.update(x)
+        if len(self.sma.buf) < self.period:
+            return 0, 0, 0
+        width = self.std_dev * std
+        return middle + width, middle, middle - width
+
+
+class RollingRSI:
+    """
+    Relative Strength Index using Wilder's recursive smoothing, O(1) per sample.
+    
+    The first `period` changes seed the averages with a simple mean; after
+    that avg = (avg * (period - 1) + x) / period.
+    """
+    
+    __slots__ = ('prev', 'avg_gain', 'avg_loss', 'n', 'period', 'warmup')
+    
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.n = 0
+        self.warmup = True
+    
+    def update(self, x: float) -> float:
+        """Add a sample and return the current RSI."""
+        if self.prev is None:
+            self.prev = x
+            return 50.0
+        
+        change = x - self.prev
+        self.prev = x
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        period = self.period
+        
+        if self.warmup:
+            self.n += 1
+            self.avg_gain += (gain - self.avg_gain) / self.n
+            self.avg_loss += (loss - self.avg_loss) / self.n
+            if self.n == period:
+                self.warmup = False
+        else:
+            self.avg_gain = (self.avg_gain * (period - 1) + gain) / period
+            self.avg_loss = (self.avg_loss * (period - 1) + loss) / period
+        return self.value
+    
+    @property
+    def value(self) -> float:
+        if self.warmup:
+            return 50.0  # Neutral RSI value until the averages are seeded
+        if self.avg_loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + self.avg_gain / self.avg_loss)
+
+
+class RollingEMA:
+    """
+    Exponential Moving Average using V_i = k * x_i + (1 - k) * V_{i-1}.
+    
+    The first sample seeds the average.
+    """
+    
+    __slots__ = ('k', 'v')
+    
+    def __init__(self, period: int):
+        self.k = 2 / (period + 1)
+        self.v = None
+    
+    def update(self, x: float) -> float:
+        """Add a sample and return the current average."""
+        self.v = x if self.v is None else x * self.k + self.v * (1 - self.k)
+        return self.v
+    
+    def seed(self, values: Sequence[float]) -> Optional[float]:
+        """
+        Reset the average from historical values (first value seeds, the rest
+        are folded in) and return it.
+        """
+        if not len(values):
+            self.v = None
+            return None
+        k = self.k
+        v = values[0]
+        for i in range(1, len(values)):
+            v = values[i] * k + v * (1 - k)
+        self.v = v
+        return v
+
+
+class RingBuffer:
+    """
+    Fixed-capacity float64 ring that overwrites the oldest sample once full.
+    
+    Indexing follows list semantics (0 is the oldest sample, -1 the newest),
+    so a RingBuffer can be passed straight to the Indicators helpers. Every
+    sample is also written twice, `capacity` apart, into a buffer of twice the
+    capacity, so any trailing window is a contiguous NumPy slice for the
+    vectorized series helpers and kernels; no copy on wrap.
+    """
+    
+    __slots__ = ('capacity', '_buf', '_head', '_size')
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf = np.empty(2 * capacity, dtype=np.float64)
+        self._head = 0  # Next write position in [0, capacity)
+        self._size = 0
+    
+    def append(self, x: float):
+        """Add a sample, evicting the oldest one when full."""
+        head = self._head
+        self._buf[head] = x
+        self._buf[head + self.capacity] = x
+        self._head = head + 1 if head + 1 < self.capacity else 0
+        if self._size < self.capacity:
+            self._size += 1
+    
+    def extend(self, values):
+        """Add several samples, oldest first."""
+        for x in values:
+            self.append(x)
+    
+    def replace_last(self, x: float):
+        """Overwrite the newest sample in place."""
+        last = self._head - 1 if self._head else self.capacity - 1
+        self._buf[last] = x
+        self._buf[last + self.capacity] = x
+    
+    def window(self, n: Optional[int] = None) -> np.ndarray:
+        """Return a read-only view of the newest n samples (all by default), oldest first."""
+        if n is None or n > self._size:
+            n = self._size
+        end = self._head + self.capacity
+        view = self._buf[end - n:end]
+        view.flags.writeable = False
+        return view
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __getitem__(self, i: int) -> float:
+        size = self._size
+        if i < 0:
+            i += size
+        if not 0 <= i < size:
+            raise IndexError('RingBuffer index out of range')
+        return float(self._buf[self._head + self.capacity - size + i])
+    
+    def __iter__(self):
+        return iter(self.window().tolist())
+
+
+class RollingATR:
+    """
+    Average True Range with Wilder's smoothing, O(1) per bar.
+    
+    Only the previous close is retained; the first `period` true ranges are
+    averaged to seed the ATR.
+    """
+    
+    __slots__ = ('prev_close', 'atr', 'n', 'period')
+    
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.prev_close = None
+        self.atr = 0.0
+        self.n = 0
+    
+    def update(self, high: float, low: float, close: float) -> float:
+        """Add a bar and return the current ATR."""
+        if self.prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        
+        if self.n < self.period:
+            self.n += 1
+            self.atr += (tr - self.atr) / self.n
+        else:
+            self.atr = (self.atr * (self.period - 1) + tr) / self.period
+        return self.atr
+
+
+class SlidingMinMax:
+    """
+    Sliding-window minimum and maximum using monotonic deques (Lemire),
+    O(1) amortized per sample.
+    """
+    
+    __slots__ = ('window', 'min_dq', 'max_dq', 'i')
+    
+    def __init__(self, window: int):
+        self.window = window
+        self.min_dq = deque()  # (index, value), values increasing
+        self.max_dq = deque()  # (index, value), values decreasing
+        self.i = 0
+    
+    def push(self, v: float):
+        """Add a sample, evicting samples that fell out of the window."""
+        i = self.i
+        min_dq, max_dq = self.min_dq, self.max_dq
+        
+        while min_dq and min_dq[-1][1] >= v:
+            min_dq.pop()
+        min_dq.append((i, v))
+        while i - min_dq[0][0] >= self.window:
+            min_dq.popleft()
+        
+        while max_dq and max_dq[-1][1] <= v:
+            max_dq.pop()
+        max_dq.append((i, v))
+        while i - max_dq[0][0] >= self.window:
+            max_dq.popleft()
+        
+        self.i = i + 1
+    
+    @property
+    def min(self) -> Optional[float]:
+        return self.min_dq[0][1] if self.min_dq else None
+    
+    @property
+    def max(self) -> Optional[float]:
+        return self.max_dq[0][1] if self.max_dq else None
+
+
+class MACDBank:
+    """
+    MACD state for many symbols kept as NumPy arrays, one row per symbol, so
+    a batch of latest prices is stepped in a single (parallel) kernel call.
+    """
+    
+    def __init__(self, fast_period: int = 12, slow_period: int = 26,
+                 signal_period: int = 9, capacity: int = 8):
+        self.k_fast = 2 / (fast_period + 1)
+        self.k_slow = 2 / (slow_period + 1)
+        self.k_signal = 2 / (signal_period + 1)
+        self.index: Dict[str, int] = {}
+        self.ema_fast = np.zeros(capacity)
+        self.ema_slow = np.zeros(capacity)
+        self.ema_signal = np.zeros(capacity)
+        self.seeded = np.zeros(capacity, dtype=np.bool_)
+    
+    def _row(self, symbol: str) -> int:
+        row = self.index.get(symbol)
+        if row is None:
+            row = self.index[symbol] = len(self.index)
+            if row == len(self.seeded):
+                grow = len(self.seeded)
+                self.ema_fast = np.concatenate((self.ema_fast, np.zeros(grow)))
+                self.ema_slow = np.concatenate((self.ema_slow, np.zeros(grow)))
+                self.ema_signal = np.concatenate((self.ema_signal, np.zeros(grow)))
+                self.seeded = np.concatenate((self.seeded, np.zeros(grow, dtype=np.bool_)))
+        return row
+    
+    def update(self, symbols: Sequence[str], prices) -> None:
+        """Feed one price per symbol."""
+        idx = np.fromiter((self._row(s) for s in symbols), dtype=np.int64, count=len(symbols))
+        _kernels.macd_step(idx, np.asarray(prices, dtype=np.float64),
+                           self.ema_fast, self.ema_slow, self.ema_signal, self.seeded,
+                           self.k_fast, self.k_slow, self.k_signal)
+    
+    def values(self, symbol: str) -> Tuple[float, float, float]:
+        """Return (macd, signal, histogram) for a symbol."""
+        row = self.index.get(symbol)
+        if row is None:
+            return 0.0, 0.0, 0.0
+        macd = float(self.ema_fast[row] - self.ema_slow[row])
+        signal = float(self.ema_signal[row])
+        return macd, signal, macd - signal
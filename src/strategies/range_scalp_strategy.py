@@ -6,22 +6,54 @@ and resistance (short) levels based on 1-hour min/max values.
 """
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime, timedelta
+import time
+from collections import deque
+import numpy as np
+from enum import IntEnum
+from typing import Dict, Any, Optional, List, Tuple
 
 from src.strategies.base_strategy import BaseStrategy
 from src.exchange.api_client import MXCClient
 from src.monitoring.metrics import MetricsManager
-from src.strategies.indicators import Indicators
+from src.strategies.indicators import Indicators, MACDBank, SlidingMinMax
 from src.config.settings import Settings
 
 
+class Side(IntEnum):
+    """Direction of a range order; (symbol, Side) tuples key active orders."""
+    LONG = 0
+    SHORT = 1
+
+
 class RangeScalpStrategy(BaseStrategy):
     """
     Range scalping strategy that places both long and short orders based on 
     1-hour min/max levels with 10% stop loss risk.
     """
     
+    # Order statuses as returned by the exchange or by CCXT
+    FILLED_STATUSES = frozenset({'FILLED', 'closed'})
+    CLOSED_STATUSES = frozenset({'CANCELED', 'REJECTED', 'EXPIRED', 'canceled', 'rejected', 'expired'})
+    
+    # Seconds between REST checks of a pending range order
+    ORDER_POLL_INTERVAL = 2.0
+    
+    # Ticks are coalesced and processed in batches at this interval (seconds)
+    TICK_FLUSH_INTERVAL = 0.05
+    # Support/resistance levels are refreshed at most this often (seconds)
+    SR_REFRESH_INTERVAL = 60.0
+    # Number of 1-hour candles (including the forming one) spanned by S/R
+    SR_WINDOW_BARS = 24
+    
+    # Entry zone starts this far from a level and spans three times as much
+    LEVEL_BUFFER = 0.002
+    
+    # Kline interval lengths, used as the klines cache TTL (seconds)
+    INTERVAL_SECONDS = {
+        '1m': 60, '5m': 300, '15m': 900, '30m': 1800,
+        '1h': 3600, '4h': 14400, '1d': 86400
+    }
+    
     def __init__(self, exchange_client: MXCClient, metrics_manager: MetricsManager, 
                  settings: Settings):
         # Initialize with initial settings
@@ -34,6 +66,10 @@ class RangeScalpStrategy(BaseStrategy):
         
         super().__init__("RangeScalpStrategy", initial_settings)
         
+        # Snapshot order parameters as plain floats for the order path
+        self._profit_target = initial_settings['profit_target']
+        self._stop_loss_pct = initial_settings['stop_loss_pct']
+        
         self.exchange_client = exchange_client
         self.metrics_manager = metrics_manager
         self.settings = settings  # This is the global Settings object
@@ -42,9 +78,28 @@ class RangeScalpStrategy(BaseStrategy):
         # Range scalping specific variables
         self.support_level = None
         self.resistance_level = None
+        # Entry zones derived from the levels; recomputed only when a level moves
+        self._sup_lower_band = self._sup_upper_band = 0.0
+        self._res_lower_band = self._res_upper_band = 0.0
         self.active_range_orders = {}  # Track range orders
         self.trading_pairs = [settings.default_symbol]
         
+        # MACD(12, 26, 9) for all symbols, stepped once per tick batch
+        self._macd_bank = MACDBank()
+        
+        # Microbatched tick processing
+        self._tick_buf: deque = deque()
+        self._tick_task: Optional[asyncio.Task] = None
+        # Bound to the matching single-path parser on the first message
+        self._parse_trade = self._detect_trade_format
+        self._last_sr_update = float('-inf')
+        
+        # (symbol, interval, limit) -> (fetched at, klines)
+        self._klines_cache: Dict[Tuple[str, str, int], Tuple[float, list]] = {}
+        
+        # symbol -> (lows window, highs window, open time of last closed bar pushed)
+        self._sr_windows: Dict[str, Tuple[SlidingMinMax, SlidingMinMax, Optional[int]]] = {}
+        
         # Register callbacks for market data
         for pair in self.trading_pairs:
             self.exchange_client.register_market_callback(pair, self._on_market_update)
@@ -57,6 +112,15 @@ class RangeScalpStrategy(BaseStrategy):
         # This will be used internally by the range scalping logic
         return None
     
+    def macd_values(self, symbol: str) -> Tuple[float, float, float]:
+        """(macd, signal, histogram) for a symbol; zeros until it has traded."""
+        return self._macd_bank.values(symbol)
+    
+    @property
+    def macd_histogram(self) -> float:
+        """MACD histogram of the default symbol."""
+        return self._macd_bank.values(self.settings.default_symbol)[2]
+    
     def get_status(self) -> Dict[str, Any]:
         """Get the current status of the range scalping strategy."""
         return {
@@ -64,98 +128,190 @@ class RangeScalpStrategy(BaseStrategy):
             'support_level': self.support_level,
             'resistance_level': self.resistance_level,
             'active_range_orders_count': len(self.active_range_orders),
+            'macd_histogram': self.macd_histogram,
             'trading_pairs': self.trading_pairs,
             'strategy_name': self.name
         }
     
     async def _on_market_update(self, data: Dict[str, Any]):
         """Handle incoming market data updates."""
-        # Process trade data from WebSocket
-        if isinstance(data, list) and len(data) > 0:
-            trade = data[0]  # Get the latest trade
-            if isinstance(trade, list) and len(trade) > 0:
-                # Handle the common data format from MXC WebSocket
-                if len(trade) >= 2:
-                    symbol = self.settings.default_symbol  # Use default symbol
-                    price = float(trade[1]) if isinstance(trade[1], (str, int, float)) else float(trade[0])
-                else:
-                    price = float(trade[0]) if isinstance(trade[0], (str, int, float)) else float(trade[1])
-                    symbol = self.settings.default_symbol
-            else:
-                symbol = trade.get('symbol', self.settings.default_symbol)
-                price = float(trade.get('price', 0))
-            
-            # Update support and resistance levels if needed
-            await self._update_support_resistance_levels(symbol)
-            
-            # Check if we should place range orders based on current price
-            if self.is_running and self.settings.trading_enabled:
+        if not data or not self.is_running:
+            return
+        
+        # Process trade data from WebSocket; malformed frames raise and are
+        # logged by the exchange client
+        symbol, price = self._parse_trade(data)
+        
+        # Coalesce ticks; the flusher processes them in one pass
+        self._tick_buf.append((symbol, price))
+        if self._tick_task is None or self._tick_task.done():
+            self._tick_task = asyncio.create_task(self._tick_flusher())
+    
+    def _detect_trade_format(self, data: List[Any]) -> Tuple[str, float]:
+        """
+        Pick the trade parser from the first message and bind it, so later
+        messages go straight to a single-path parser.
+        """
+        if isinstance(data[0], dict):
+            self._parse_trade = self._parse_trade_dict
+        else:
+            self._parse_trade = self._parse_trade_row
+        return self._parse_trade(data)
+    
+    def _parse_trade_row(self, data: List[Any]) -> Tuple[str, float]:
+        """Parse [[time, price, ...], ...] trade rows (latest trade first)."""
+        return self.settings.default_symbol, float(data[0][1])
+    
+    def _parse_trade_dict(self, data: List[Any]) -> Tuple[str, float]:
+        """Parse [{'symbol': ..., 'price': ...}, ...] trade dicts (latest trade first)."""
+        trade = data[0]
+        return trade.get('symbol', self.settings.default_symbol), float(trade['price'])
+    
+    async def _tick_flusher(self):
+        """Periodically drain the tick buffer while the strategy is running."""
+        while self.is_running:
+            await asyncio.sleep(self.TICK_FLUSH_INTERVAL)
+            if not self._tick_buf:
+                continue
+            batch = list(self._tick_buf)
+            self._tick_buf.clear()
+            try:
+                await self._process_ticks(batch)
+            except Exception as e:
+                self.logger.error(f"Error processing tick batch: {e}")
+    
+    async def _process_ticks(self, batch: List[Tuple[str, float]]):
+        """Process a batch of (symbol, price) ticks."""
+        latest: Dict[str, float] = {}
+        for symbol, price in batch:
+            latest[symbol] = price
+        
+        # One vectorized step for every symbol that traded in this batch
+        self._macd_bank.update(list(latest), np.fromiter(latest.values(), dtype=np.float64, count=len(latest)))
+        
+        # Support/resistance come from hourly candles; refresh them on a timer,
+        # not per tick
+        now = time.monotonic()
+        if now - self._last_sr_update >= self.SR_REFRESH_INTERVAL:
+            self._last_sr_update = now
+            for symbol in latest:
+                await self._update_support_resistance_levels(symbol)
+        
+        # Check if we should place range orders based on current price
+        if self.is_running and self.settings.trading_enabled:
+            for symbol, price in latest.items():
                 await self._check_range_scalp_opportunities(symbol, price)
     
     async def _update_support_resistance_levels(self, symbol: str):
         """Update support and resistance levels based on 1-hour min/max values."""
         try:
             # Get 1-hour klines for the last 24 hours to determine strong support/resistance
-            klines = await self.exchange_client.get_klines(
+            klines = await self._cached_klines(
                 symbol, 
                 interval='1h', 
-                limit=24  # Last 24 hours of 1-hour candles
+                limit=self.SR_WINDOW_BARS  # Last 24 hours of 1-hour candles
             )
             
             if not klines or len(klines) < 2:
                 self.logger.warning(f"Not enough klines data to calculate support/resistance for {symbol}")
                 return
             
-            # Extract high and low prices
-            highs = [float(k[2]) for k in klines]  # High prices
-            lows = [float(k[3]) for k in klines]   # Low prices
+            # Columns: open time, open, high, low, close, volume, ...
+            # Closed candles are pushed into sliding windows once each; the
+            # forming candle is still changing so it is only folded in on read
+            windows = self._sr_windows.get(symbol)
+            if windows is None:
+                closed_bars = self.SR_WINDOW_BARS - 1
+                windows = (SlidingMinMax(closed_bars), SlidingMinMax(closed_bars), None)
+            lows_window, highs_window, last_open = windows
+            
+            for k in klines[:-1]:
+                if last_open is None or k[0] > last_open:
+                    lows_window.push(float(k[3]))
+                    highs_window.push(float(k[2]))
+                    last_open = k[0]
+            self._sr_windows[symbol] = (lows_window, highs_window, last_open)
             
-            # Calculate support as the lowest low (rounded)
-            support = min(lows)
-            # Calculate resistance as the highest high (rounded) 
-            resistance = max(highs)
+            forming = klines[-1]
+            # Calculate support as the lowest low
+            support = min(lows_window.min, float(forming[3]))
+            # Calculate resistance as the highest high
+            resistance = max(highs_window.max, float(forming[2]))
             
             # Update levels if they've changed significantly
             if (self.support_level is None or 
                 abs(support - self.support_level) / self.support_level > 0.005):  # 0.5% change
                 self.logger.info(f"Updated support level for {symbol}: {support}")
                 self.support_level = support
+                sup_buf = support * self.LEVEL_BUFFER
+                self._sup_lower_band = support + sup_buf
+                self._sup_upper_band = support + 3 * sup_buf
             
             if (self.resistance_level is None or 
                 abs(resistance - self.resistance_level) / self.resistance_level > 0.005):  # 0.5% change
                 self.logger.info(f"Updated resistance level for {symbol}: {resistance}")
                 self.resistance_level = resistance
+                res_buf = resistance * self.LEVEL_BUFFER
+                self._res_lower_band = resistance - 3 * res_buf
+                self._res_upper_band = resistance - res_buf
                 
         except Exception as e:
             self.logger.error(f"Error updating support/resistance levels: {e}")
     
+    async def _cached_klines(self, symbol: str, interval: str, limit: int) -> list:
+        """
+        Return klines from a TTL cache keyed by (symbol, interval, limit).
+        
+        Cached data is reused for one bar interval. After that, if only one
+        bar can have rolled, the last two bars are fetched and merged in;
+        otherwise the full window is refetched.
+        """
+        key = (symbol, interval, limit)
+        ttl = self.INTERVAL_SECONDS.get(interval, 60)
+        now = time.monotonic()
+        
+        cached = self._klines_cache.get(key)
+        if cached:
+            fetched_at, klines = cached
+            age = now - fetched_at
+            if age < ttl:
+                return klines
+            if age < 2 * ttl:
+                recent = await self.exchange_client.get_klines(symbol, interval=interval, limit=2)
+                if recent and len(recent) == 2:
+                    # Drop the stale copies of the refreshed bars, keyed by open time
+                    first_open = recent[0][0]
+                    klines = [k for k in klines if k[0] < first_open] + list(recent)
+                    klines = klines[-limit:]
+                    self._klines_cache[key] = (now, klines)
+                    return klines
+        
+        klines = await self.exchange_client.get_klines(symbol, interval=interval, limit=limit)
+        if klines:
+            self._klines_cache[key] = (now, klines)
+        return klines
+    
     async def _check_range_scalp_opportunities(self, symbol: str, current_price: float):
         """Check for opportunities to place range scalping orders at min/max levels."""
         if not self.support_level or not self.resistance_level:
             return
         
         try:
-            # Check if price is approaching support or resistance
-            # Allow for some buffer (e.g., 0.2% from levels)
-            support_buffer = self.support_level * 0.002
-            resistance_buffer = self.resistance_level * 0.002
+            # Check if price is approaching support or resistance, using the
+            # zones precomputed when the levels were last updated
             
             # Place long order if price is near support (but not too close to avoid whipsaw)
-            if (self.support_level + support_buffer <= current_price <= 
-                self.support_level + (support_buffer * 3)):  # Within 0.2% to 0.6% above support
+            if self._sup_lower_band <= current_price <= self._sup_upper_band:  # Within 0.2% to 0.6% above support
                 
                 # Check if we already have a long order at this level
-                long_order_key = f"{symbol}_long_at_support"
-                if long_order_key not in self.active_range_orders:
+                if (symbol, Side.LONG) not in self.active_range_orders:
                     await self._place_range_order(symbol, 'LONG', current_price)
             
             # Place short order if price is near resistance (but not too close to avoid whipsaw)
-            elif (self.resistance_level - (resistance_buffer * 3) <= current_price <= 
-                  self.resistance_level - resistance_buffer):  # Within 0.6% to 0.2% below resistance
+            elif self._res_lower_band <= current_price <= self._res_upper_band:  # Within 0.6% to 0.2% below resistance
                 
                 # Check if we already have a short order at this level
-                short_order_key = f"{symbol}_short_at_resistance"
-                if short_order_key not in self.active_range_orders:
+                if (symbol, Side.SHORT) not in self.active_range_orders:
                     await self._place_range_order(symbol, 'SHORT', current_price)
                     
         except Exception as e:
@@ -176,18 +332,18 @@ class RangeScalpStrategy(BaseStrategy):
                 entry_price = self.support_level * 1.0005  # 0.05% above support
                 side = 'BUY'
                 # Calculate stop loss below support
-                stop_price = self.support_level * (1 - self.strategy_settings['stop_loss_pct'])
+                stop_price = self.support_level * (1 - self._stop_loss_pct)
                 # Calculate take profit at a reasonable target
-                target_price = entry_price * (1 + self.strategy_settings['profit_target'])
+                target_price = entry_price * (1 + self._profit_target)
                 
             elif order_type == 'SHORT':
                 # Place sell order slightly below resistance (for breakdown confirmation)
                 entry_price = self.resistance_level * 0.9995  # 0.05% below resistance
                 side = 'SELL'
                 # Calculate stop loss above resistance
-                stop_price = self.resistance_level * (1 + self.strategy_settings['stop_loss_pct'])
+                stop_price = self.resistance_level * (1 + self._stop_loss_pct)
                 # Calculate take profit at a reasonable target
-                target_price = entry_price * (1 - self.strategy_settings['profit_target'])
+                target_price = entry_price * (1 - self._profit_target)
             else:
                 self.logger.error(f"Invalid order type: {order_type}")
                 return
@@ -204,7 +360,7 @@ class RangeScalpStrategy(BaseStrategy):
             
             if 'orderId' in order_result:
                 # Track the range order 
-                order_key = f"{symbol}_{order_type.lower()}_at_{'support' if order_type == 'LONG' else 'resistance'}"
+                order_key = (symbol, Side[order_type])
                 
                 order_info = {
                     'order_id': order_result['orderId'],
@@ -215,7 +371,7 @@ class RangeScalpStrategy(BaseStrategy):
                     'quantity': quantity,
                     'stop_price': stop_price,
                     'target_price': target_price,
-                    'placed_time': datetime.now()
+                    'placed_ns': time.monotonic_ns()
                 }
                 
                 self.active_range_orders[order_key] = order_info
@@ -230,7 +386,7 @@ class RangeScalpStrategy(BaseStrategy):
         except Exception as e:
             self.logger.error(f"Error placing range order: {e}")
     
-    async def _monitor_range_order(self, order_key: str):
+    async def _monitor_range_order(self, order_key: Tuple[str, Side]):
         """Monitor a range order and manage stop loss/profit taking."""
         if order_key not in self.active_range_orders:
             return
@@ -245,28 +401,28 @@ class RangeScalpStrategy(BaseStrategy):
         
         try:
             # Wait for the order to fill
-            filled = False
-            while order_key in self.active_range_orders and not filled:
+            while order_key in self.active_range_orders:
                 order_status = await self.exchange_client.get_order(
                     symbol=symbol,
                     order_id=order_info['order_id']
                 )
                 
-                if order_status and order_status.get('status') == 'FILLED':
-                    filled = True
+                status = order_status.get('status') if order_status else None
+                if status in self.FILLED_STATUSES:
                     self.logger.info(f"Range order {order_info['order_id']} filled for {symbol}")
                     
                     # Now we need to place stop loss and take profit orders
                     await self._place_exit_orders(order_info)
+                    return
                     
-                elif order_status and order_status.get('status') in ['CANCELED', 'REJECTED', 'EXPIRED']:
-                    self.logger.info(f"Range order {order_info['order_id']} status: {order_status.get('status')}")
+                elif status in self.CLOSED_STATUSES:
+                    self.logger.info(f"Range order {order_info['order_id']} status: {status}")
                     # Remove the order from tracking if it's no longer active
                     if order_key in self.active_range_orders:
                         del self.active_range_orders[order_key]
                     return
                 
-                await asyncio.sleep(2)  # Check every 2 seconds
+                await asyncio.sleep(self.ORDER_POLL_INTERVAL)
                 
         except Exception as e:
             self.logger.error(f"Error monitoring range order {order_key}: {e}")
@@ -362,4 +518,8 @@ class RangeScalpStrategy(BaseStrategy):
     def stop(self):
         """Stop the range scalping strategy."""
         super().stop()
+        if self._tick_task is not None:
+            self._tick_task.cancel()
+            self._tick_task = None
+        self._tick_buf.clear()
         self.logger.info("Range Scalp Strategy stopped")
\ No newline at end of file
@@ -6,15 +6,286 @@ with tight stop losses, optimized for the MXC exchange.
 """
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List
-from datetime import datetime
+import time
+from typing import Dict, Any, Optional, List, Sequence
+
+import numpy as np
 
 from src.exchange.api_client import MXCClient
 from src.exchange.order_manager import OrderManager
 from src.monitoring.metrics import MetricsManager
 from src.config.settings import Settings
 from src.strategies.base_strategy import BaseStrategy
-from src.strategies.indicators import Indicators
+from src.strategies.indicators import Indicators, RingBuffer
+from src.strategies._kernels import scalp_signal, scalp_signal_batch
+
+
+class RollingState:
+    """
+    Streaming 1-minute indicator state for one symbol.
+    
+    Mirrors the last 50 one-minute closes the strategy used to fetch per tick,
+    held in a preallocated RingBuffer:
+    the newest close belongs to the still-forming bar and is replaced by every
+    trade in the same minute; a trade in a new minute appends a bar. Running
+    sums give SMA20/SMA50/Bollinger in O(1); RSI uses Wilder's smoothing over
+    closed bars with the forming bar's change applied on read.
+    """
+    
+    __slots__ = ('closes', 'sum20', 'sum50', 'bar',
+                 'avg_gain', 'avg_loss', 'rsi_n')
+    
+    WINDOW = 50
+    SHORT = 20
+    RSI_PERIOD = 14
+    BAR_MS = 60_000
+    
+    def __init__(self):
+        self.closes = RingBuffer(self.WINDOW)
+        self.sum20 = 0.0
+        self.sum50 = 0.0
+        self.bar = None  # Minute index of the forming bar
+        # Wilder RSI state over closed bars
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.rsi_n = 0
+    
+    def seed(self, closes: Sequence[float], last_bar_time_ms: int):
+        """Initialise from kline closes; the last close is the forming bar."""
+        self.__init__()
+        for close in closes:
+            self._append(float(close))
+        self.bar = int(last_bar_time_ms) // self.BAR_MS
+    
+    def update(self, price: float, trade_time_ms: int):
+        """Fold a trade into the forming bar, or start a new bar."""
+        bar = trade_time_ms // self.BAR_MS
+        if self.bar is not None and bar < self.bar:
+            return  # Late trade for a bar that has already closed
+        if bar == self.bar and self.closes:
+            self._replace_last(price)
+        else:
+            self._append(price)
+            self.bar = bar
+    
+    def _append(self, x: float):
+        closes = self.closes
+        n = len(closes)
+        if n:
+            # The previous forming bar is now closed: commit its RSI change
+            if n >= 2:
+                self._commit_change(closes[-1] - closes[-2])
+        if n == self.WINDOW:
+            self.sum50 -= closes[0]
+        if n >= self.SHORT:
+            self.sum20 -= closes[-self.SHORT]
+        closes.append(x)
+        self.sum50 += x
+        self.sum20 += x
+    
+    def _replace_last(self, x: float):
+        old = self.closes[-1]
+        self.closes.replace_last(x)
+        self.sum50 += x - old
+        self.sum20 += x - old
+    
+    def _commit_change(self, change: float):
+        self.avg_gain, self.avg_loss, self.rsi_n = self._wilder(change)
+    
+    def _wilder(self, change: float):
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        period = self.RSI_PERIOD
+        n = self.rsi_n
+        if n < period:
+            n += 1
+            return (self.avg_gain + (gain - self.avg_gain) / n,
+                    self.avg_loss + (loss - self.avg_loss) / n, n)
+        return ((self.avg_gain * (period - 1) + gain) / period,
+                (self.avg_loss * (period - 1) + loss) / period, n)
+    
+    @property
+    def sma20(self) -> float:
+        return self.sum20 / min(len(self.closes), self.SHORT)
+    
+    @property
+    def sma50(self) -> float:
+        return self.sum50 / len(self.closes)
+    
+    @property
+    def rsi(self) -> float:
+        closes = self.closes
+        if len(closes) < self.RSI_PERIOD + 1:
+            return 50.0  # Neutral RSI value
+        avg_gain, avg_loss, _ = self._wilder(closes[-1] - closes[-2])
+        if avg_loss == 0:
+            return 100.0
+        return 100 - 100 / (1 + avg_gain / avg_loss)
+    
+    @property
+    def momentum(self) -> float:
+        closes = self.closes
+        return closes[-1] - closes[-11] if len(closes) >= 11 else 0.0
+    
+    def signal(self):
+        """
+        Evaluate the entry signal from the running stats.
+        
+        Returns (is_bullish, is_bearish, momentum, mean_abs_delta), the same
+        tuple scalp_signal() computes from a closes array.
+        """
+        closes = self.closes
+        if len(closes) < 2:
+            return False, False, 0.0, 0.0
+        sma_20 = self.sma20
+        sma_50 = self.sma50
+        rsi_ok = 30 < self.rsi < 70  # RSI in normal range (not overbought/oversold)
+        # Bollinger Bands middle band is the 20-period SMA
+        bb_middle = sma_20
+        current_close = closes[-1]
+        previous_close = closes[-2]
+        
+        is_bullish = (
+            current_close > sma_20 and  # Price above short-term MA
+            sma_20 > sma_50 and  # Short-term MA above long-term MA (golden cross)
+            rsi_ok and
+            previous_close <= bb_middle and  # Previous close below middle band
+            current_close > bb_middle  # Current close above middle band
+        )
+        
+        is_bearish = (
+            current_close < sma_20 and  # Price below short-term MA
+            sma_20 < sma_50 and  # Short-term MA below long-term MA (death cross)
+            rsi_ok and
+            previous_close >= bb_middle and  # Previous close above middle band
+            current_close < bb_middle  # Current close below middle band
+        )
+        return is_bullish, is_bearish, self.momentum, self.mean_abs_delta
+    
+    @property
+    def mean_abs_delta(self) -> float:
+        """Mean absolute close-to-close change over the last four bars."""
+        if len(self.closes) < 2:
+            return 0.0
+        return float(np.abs(np.diff(self.closes.window(5))).mean())
+
+
+class PositionBook:
+    """
+    Open positions stored as parallel NumPy arrays (structure of arrays), one
+    row per position, so the take-profit/stop-loss check for a symbol is a few
+    vectorized comparisons over every open position.
+    """
+    
+    BUY = 0
+    SELL = 1
+    
+    def __init__(self, capacity: int = 16):
+        self.index: Dict[str, int] = {}  # order id -> row
+        self.order_ids: List[str] = []
+        self.symbols: List[str] = []
+        self._symbol_codes: Dict[str, int] = {}
+        self.symbol_code = np.empty(capacity, dtype=np.int32)
+        self.side = np.empty(capacity, dtype=np.int8)
+        self.entry = np.empty(capacity)
+        self.target = np.empty(capacity)
+        self.stop = np.empty(capacity)
+        self.size = np.empty(capacity)
+        self.entry_time_ns = np.empty(capacity, dtype=np.int64)
+        self.closing = np.zeros(capacity, dtype=np.bool_)
+    
+    def _grow(self):
+        grow = len(self.side)
+        self.symbol_code = np.concatenate((self.symbol_code, np.empty(grow, dtype=np.int32)))
+        self.side = np.concatenate((self.side, np.empty(grow, dtype=np.int8)))
+        self.entry = np.concatenate((self.entry, np.empty(grow)))
+        self.target = np.concatenate((self.target, np.empty(grow)))
+        self.stop = np.concatenate((self.stop, np.empty(grow)))
+        self.size = np.concatenate((self.size, np.empty(grow)))
+        self.entry_time_ns = np.concatenate((self.entry_time_ns, np.empty(grow, dtype=np.int64)))
+        self.closing = np.concatenate((self.closing, np.zeros(grow, dtype=np.bool_)))
+    
+    def add(self, order_id: str, symbol: str, side: str, entry_price: float,
+            target_price: float, stop_price: float, size: float, entry_time_ns: int):
+        """Track a new open position."""
+        row = len(self.order_ids)
+        if row == len(self.side):
+            self._grow()
+        code = self._symbol_codes.setdefault(symbol, len(self._symbol_codes))
+        self.index[order_id] = row
+        self.order_ids.append(order_id)
+        self.symbols.append(symbol)
+        self.symbol_code[row] = code
+        self.side[row] = self.BUY if side == 'BUY' else self.SELL
+        self.entry[row] = entry_price
+        self.target[row] = target_price
+        self.stop[row] = stop_price
+        self.size[row] = size
+        self.entry_time_ns[row] = entry_time_ns
+        self.closing[row] = False
+    
+    def remove(self, order_id: str):
+        """Stop tracking a position; the last row moves into its slot."""
+        row = self.index.pop(order_id)
+        last = len(self.order_ids) - 1
+        if row != last:
+            moved = self.order_ids[last]
+            self.index[moved] = row
+            self.order_ids[row] = moved
+            self.symbols[row] = self.symbols[last]
+            for arr in (self.symbol_code, self.side, self.entry, self.target,
+                        self.stop, self.size, self.entry_time_ns, self.closing):
+                arr[row] = arr[last]
+        self.order_ids.pop()
+        self.symbols.pop()
+    
+    def get(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Return a position as a dict, or None if it is not open."""
+        row = self.index.get(order_id)
+        if row is None:
+            return None
+        return {
+            'order_id': order_id,
+            'symbol': self.symbols[row],
+            'side': 'BUY' if self.side[row] == self.BUY else 'SELL',
+            'entry_price': float(self.entry[row]),
+            'target_price': float(self.target[row]),
+            'stop_price': float(self.stop[row]),
+            'size': float(self.size[row]),
+            'entry_time_ns': int(self.entry_time_ns[row]),
+        }
+    
+    def hits(self, symbol: str, price: float) -> List[str]:
+        """
+        Order ids of the symbol's positions whose target or stop is reached
+        at price. They are marked as closing and not returned again until
+        released.
+        """
+        code = self._symbol_codes.get(symbol)
+        n = len(self.order_ids)
+        if code is None or n == 0:
+            return []
+        long = self.side[:n] == self.BUY
+        target = self.target[:n]
+        stop = self.stop[:n]
+        take_profit = np.where(long, price >= target, price <= target)
+        stop_loss = np.where(long, price <= stop, price >= stop)
+        hit = (self.symbol_code[:n] == code) & ~self.closing[:n] & (take_profit | stop_loss)
+        rows = np.flatnonzero(hit)
+        self.closing[rows] = True
+        return [self.order_ids[row] for row in rows]
+    
+    def release(self, order_id: str):
+        """Make a position eligible for hits() again, e.g. after a failed close."""
+        row = self.index.get(order_id)
+        if row is not None:
+            self.closing[row] = False
+    
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self.index
+    
+    def __len__(self) -> int:
+        return len(self.order_ids)
 
 
 class ScalpingStrategy(BaseStrategy):
@@ -22,6 +293,12 @@ class ScalpingStrategy(BaseStrategy):
     Implements a scalping strategy for high-frequency trading with small profits.
     """
     
+    DISPATCH_INTERVAL = 0.25
+    # Fall back to a REST ticker if the stream is silent for this long
+    PRICE_WAIT_TIMEOUT = 5.0
+    # Seconds a fetched quote balance is reused for position sizing
+    BALANCE_TTL = 5.0
+    
     def __init__(self, exchange_client: MXCClient, metrics_manager: MetricsManager, 
                  settings: Settings):
         super().__init__("ScalpingStrategy", {
@@ -36,9 +313,26 @@ class ScalpingStrategy(BaseStrategy):
         self.settings = settings
         self.logger = logging.getLogger(__name__)
         
-        self.active_positions = {}
+        self.positions = PositionBook()
+        # Row per traded symbol in the per-symbol arrays; rebuilt with trading_pairs
+        self._symbol_idx: Dict[str, int] = {}
+        self._last_trade_time_ms = np.zeros(0, dtype=np.int64)  # 0 = never traded
         self.trading_pairs = [settings.default_symbol]
-        self.last_trade_time = {}
+        self.rolling_states: Dict[str, RollingState] = {}
+        # (price, bar) of the last evaluation per symbol that found no entry;
+        # an identical window gives the identical signal
+        self._no_signal_at: Dict[str, tuple] = {}
+        self.refresh_settings()
+        # Latest (price, quantity, trade_time) per symbol since the last dispatch;
+        # bursts collapse into one analysis per symbol per interval
+        self._latest_tick: Dict[str, tuple] = {}
+        self._scheduler_task: Optional[asyncio.Task] = None
+        # Last streamed price and its monotonic arrival time per symbol; the
+        # position monitors fall back to REST when the time goes stale
+        self._last_price: Dict[str, float] = {}
+        self._last_tick_at: Dict[str, float] = {}
+        # (quote balance, monotonic fetch time)
+        self._balance_cache = (0.0, float('-inf'))
         
         # Register callbacks for market data
         for pair in self.trading_pairs:
@@ -52,111 +346,201 @@ class ScalpingStrategy(BaseStrategy):
     def stop(self):
         """Stop the scalping strategy."""
         self.is_running = False
+        if self._scheduler_task is not None:
+            self._scheduler_task.cancel()
+            self._scheduler_task = None
+        self._latest_tick.clear()
         self.logger.info("Scalping strategy stopped")
     
+    def refresh_settings(self):
+        """
+        Recompute the target/stop price multipliers from the settings.
+        
+        Call after changing scalp_profit_target or scalp_stop_loss.
+        """
+        profit_target = self.settings.scalp_profit_target
+        stop_loss = self.settings.scalp_stop_loss
+        self._bull_target_mul = 1 + profit_target
+        self._bull_stop_mul = 1 - stop_loss
+        self._bear_target_mul = 1 - profit_target
+        self._bear_stop_mul = 1 + stop_loss
+    
+    @property
+    def trading_pairs(self) -> List[str]:
+        """Symbols this strategy trades."""
+        return self._trading_pairs
+    
+    @trading_pairs.setter
+    def trading_pairs(self, pairs: List[str]):
+        self._trading_pairs = list(pairs)
+        # Membership is checked on every tick; keep trade times of retained symbols
+        old_idx = self._symbol_idx
+        old_times = self._last_trade_time_ms
+        symbol_idx = {symbol: i for i, symbol in enumerate(dict.fromkeys(self._trading_pairs))}
+        times = np.zeros(len(symbol_idx), dtype=np.int64)
+        for symbol, i in symbol_idx.items():
+            j = old_idx.get(symbol)
+            if j is not None:
+                times[i] = old_times[j]
+        self._last_trade_time_ms = times
+        self._symbol_idx = symbol_idx
+    
+    @property
+    def last_trade_time(self) -> Dict[str, int]:
+        """Time (ms) of the last entry per traded symbol that has traded."""
+        times = self._last_trade_time_ms
+        return {symbol: int(times[i]) for symbol, i in self._symbol_idx.items() if times[i]}
+    
     def _on_market_update(self, data: Dict[str, Any]):
         """Handle incoming market data updates."""
         # Process trade data from WebSocket
-        if isinstance(data, list) and len(data) > 0:
-            trade = data[0]  # Get the latest trade
-            symbol = trade.get('symbol', self.settings.default_symbol)
-            price = float(trade.get('price', 0))
-            quantity = float(trade.get('quantity', 0))
-            trade_time = int(trade.get('tradeTime', 0))
-            
-            # Analyze price action and decide if to trade
-            if self.is_running and self.settings.trading_enabled:
-                asyncio.create_task(self._analyze_and_trade(symbol, price, quantity, trade_time))
+        if not isinstance(data, list) or not data:
+            return
+        trade = data[0]  # Get the latest trade
+        try:
+            price = float(trade['price'])
+        except (KeyError, TypeError, ValueError):
+            return
+        symbol = trade.get('symbol') or self.settings.default_symbol
+        trade_time = int(trade.get('tradeTime', 0)) or int(time.time() * 1000)
+        
+        state = self.rolling_states.get(symbol)
+        if state is not None:
+            state.update(price, trade_time)
+        
+        self._last_price[symbol] = price
+        self._last_tick_at[symbol] = time.monotonic()
+        if self.positions:
+            self._check_positions(symbol, price)
+        
+        # Analyze price action and decide if to trade
+        if not self.is_running or symbol not in self._symbol_idx:
+            return
+        if not self.settings.trading_enabled:
+            return
+        self._latest_tick[symbol] = (price, float(trade.get('quantity', 0)), trade_time)
+        task = self._scheduler_task
+        if task is None or task.done():
+            self._scheduler_task = asyncio.create_task(self._tick_scheduler())
+    
+    async def _tick_scheduler(self):
+        """Analyse the latest tick of each updated symbol on a fixed interval."""
+        while self.is_running:
+            await asyncio.sleep(self.DISPATCH_INTERVAL)
+            if not self._latest_tick:
+                continue
+            pending = self._latest_tick
+            self._latest_tick = {}
+            signals = self._batch_signals(pending)
+            for symbol, (price, quantity, trade_time) in pending.items():
+                await self._analyze_and_trade(symbol, price, quantity, trade_time,
+                                              signals.get(symbol))
+    
+    def _batch_signals(self, symbols) -> Dict[str, tuple]:
+        """
+        Evaluate the entry signal of every symbol with a full window in one
+        parallel kernel call. Symbols still warming up are left out and fall
+        back to their rolling state.
+        """
+        window = RollingState.WINDOW
+        ready = []
+        for symbol in symbols:
+            state = self.rolling_states.get(symbol)
+            if state is not None and len(state.closes) == window:
+                ready.append(symbol)
+        if len(ready) < 2:
+            return {}
+        
+        n = len(ready)
+        closes = np.empty((n, window), dtype=np.float64)
+        # Each symbol's Wilder RSI carried since seeding, as the streaming path uses
+        rsi = np.empty(n, dtype=np.float64)
+        for i, symbol in enumerate(ready):
+            state = self.rolling_states[symbol]
+            closes[i] = state.closes.window()
+            rsi[i] = state.rsi
+        bull = np.empty(n, dtype=np.bool_)
+        bear = np.empty(n, dtype=np.bool_)
+        mom = np.empty(n, dtype=np.float64)
+        mad = np.empty(n, dtype=np.float64)
+        scalp_signal_batch(closes, rsi, bull, bear, mom, mad,
+                           RollingState.SHORT, window, RollingState.SHORT)
+        return {symbol: (bool(bull[i]), bool(bear[i]), float(mom[i]), float(mad[i]))
+                for i, symbol in enumerate(ready)}
     
     async def _analyze_and_trade(self, symbol: str, price: float, quantity: float, 
-                                trade_time: int):
+                                trade_time: int, signal: Optional[tuple] = None):
         """Analyze market conditions and execute trades if conditions are met."""
         try:
             # Check if we can trade this symbol
-            if symbol not in self.trading_pairs:
+            idx = self._symbol_idx.get(symbol)
+            if idx is None:
                 return
             
             # Check if we've traded recently (to avoid over-trading)
-            if symbol in self.last_trade_time:
-                time_since_last = trade_time - self.last_trade_time[symbol]
-                # Don't trade more than once every 2 seconds
-                if time_since_last < 2000:
-                    return
+            last = self._last_trade_time_ms[idx]
+            # Don't trade more than once every 2 seconds
+            if last and trade_time - last < 2000:
+                return
+            
+            # Skip re-evaluating an unchanged window
+            state = self.rolling_states.get(symbol)
+            key = (price, state.bar) if state is not None else None
+            if key is not None and self._no_signal_at.get(symbol) == key:
+                return
             
             # Calculate if there's a scalping opportunity
-            opportunity = await self._find_scalping_opportunity(symbol, price)
+            opportunity = await self._find_scalping_opportunity(symbol, price, signal)
             
-            if opportunity:
+            if not opportunity:
+                if key is not None:
+                    self._no_signal_at[symbol] = key
+            else:
                 side, size, target_price, stop_price = opportunity
                 await self._execute_trade(symbol, side, size, target_price, stop_price)
-                self.last_trade_time[symbol] = trade_time
+                # Pairs may have been reassigned while the order was placed
+                idx = self._symbol_idx.get(symbol)
+                if idx is not None:
+                    self._last_trade_time_ms[idx] = trade_time
                 
         except Exception as e:
             self.logger.error(f"Error in analysis and trading: {e}")
     
-    async def _find_scalping_opportunity(self, symbol: str, current_price: float) -> Optional[tuple]:
+    async def _find_scalping_opportunity(self, symbol: str, current_price: float,
+                                         signal: Optional[tuple] = None) -> Optional[tuple]:
         """
         Find scalping opportunities based on technical analysis.
         
+        signal is an already evaluated (is_bullish, is_bearish, momentum,
+        mean_abs_delta) tuple, e.g. from a batched kernel call.
+        
         Returns: (side, size, target_price, stop_price) or None if no opportunity
         """
         try:
-            # Get recent price data for analysis
-            klines = await self.exchange_client.get_klines(
-                symbol, 
-                interval='1m',  # 1-minute candles for scalping
-                limit=50  # Increased for more data points
-            )
-            
-            if not klines or len(klines) < 20:
-                return None
+            if signal is None:
+                state = self.rolling_states.get(symbol)
+                if state is None:
+                    # First look at this symbol: seed the streaming state and take
+                    # this tick's signal from the compiled batch kernel
+                    closes = await self._seed_rolling_state(symbol)
+                    if closes is None:
+                        return None
+                    signal = scalp_signal(closes, RollingState.RSI_PERIOD, RollingState.SHORT,
+                                          RollingState.WINDOW, RollingState.SHORT)
+                else:
+                    signal = state.signal()
+            is_bullish, is_bearish, momentum, mean_abs_delta = signal
             
-            # Convert kline data to more usable format
-            closes = [float(k[4]) for k in klines]  # Close prices
-            highs = [float(k[2]) for k in klines]   # High prices
-            lows = [float(k[3]) for k in klines]    # Low prices
-            
-            # Calculate indicators using our Indicators class
-            sma_20 = Indicators.simple_moving_average(closes, 20)
-            sma_50 = Indicators.simple_moving_average(closes, 50)
-            rsi = Indicators.relative_strength_index(closes, 14)
-            
-            # Bollinger Bands
-            bb_upper, bb_middle, bb_lower = Indicators.bollinger_bands(closes, 20)
-            
-            # Momentum indicator
-            momentum = Indicators.momentum(closes, 10)
-            
-            current_close = closes[-1]
-            previous_close = closes[-2]
-            
-            # Look for price action signals
-            is_bullish = (
-                current_close > sma_20 and  # Price above short-term MA
-                sma_20 > sma_50 and  # Short-term MA above long-term MA (golden cross)
-                30 < rsi < 70 and  # RSI in normal range (not overbought/oversold)
-                previous_close <= bb_middle and  # Previous close below middle band
-                current_close > bb_middle  # Current close above middle band
-            )
-            
-            is_bearish = (
-                current_close < sma_20 and  # Price below short-term MA
-                sma_20 < sma_50 and  # Short-term MA below long-term MA (death cross)
-                30 < rsi < 70 and  # RSI in normal range
-                previous_close >= bb_middle and  # Previous close above middle band
-                current_close < bb_middle  # Current close below middle band
-            )
-            
-            # Additional confirmation: momentum direction
-            has_momentum = abs(momentum) > (sum(abs(closes[i] - closes[i-1]) for i in range(1, min(5, len(closes)))) / min(4, len(closes)-1)) * 0.5
+            # Additional confirmation: momentum outweighs recent bar-to-bar noise
+            has_momentum = abs(momentum) > mean_abs_delta * 0.5
             
             # Check for long opportunity
             if is_bullish and has_momentum and momentum > 0:
                 # Calculate position size based on risk management
                 size = await self._calculate_position_size(symbol, current_price)
                 if size > 0:
-                    target_price = current_price * (1 + self.settings.scalp_profit_target)
-                    stop_price = current_price * (1 - self.settings.scalp_stop_loss)
+                    target_price = current_price * self._bull_target_mul
+                    stop_price = current_price * self._bull_stop_mul
                     self.logger.debug(f"Bullish signal detected for {symbol}: BUY at {current_price}, target {target_price}, stop {stop_price}")
                     return ('BUY', size, target_price, stop_price)
             
@@ -165,8 +549,8 @@ class ScalpingStrategy(BaseStrategy):
                 # Calculate position size based on risk management
                 size = await self._calculate_position_size(symbol, current_price)
                 if size > 0:
-                    target_price = current_price * (1 - self.settings.scalp_profit_target)
-                    stop_price = current_price * (1 + self.settings.scalp_stop_loss)
+                    target_price = current_price * self._bear_target_mul
+                    stop_price = current_price * self._bear_stop_mul
                     self.logger.debug(f"Bearish signal detected for {symbol}: SELL at {current_price}, target {target_price}, stop {stop_price}")
                     return ('SELL', size, target_price, stop_price)
             
@@ -176,19 +560,50 @@ class ScalpingStrategy(BaseStrategy):
             self.logger.error(f"Error finding scalping opportunity: {e}")
             return None
     
+    async def _seed_rolling_state(self, symbol: str) -> Optional[np.ndarray]:
+        """
+        Fetch recent 1-minute klines once to seed a symbol's rolling state.
+        
+        Returns the seeded closes as a contiguous float64 array, or None.
+        """
+        klines = await self.exchange_client.get_klines(
+            symbol, 
+            interval='1m',  # 1-minute candles for scalping
+            limit=RollingState.WINDOW
+        )
+        
+        if not klines or len(klines) < 20:
+            return None
+        
+        closes = np.ascontiguousarray(np.asarray(klines, dtype=np.float64)[:, 4])
+        state = RollingState()
+        state.seed(closes, klines[-1][0])
+        self.rolling_states[symbol] = state
+        return closes
+    
+    async def _get_quote_balance(self) -> float:
+        """Free quote-currency balance, refreshed at most every BALANCE_TTL seconds."""
+        balance, fetched_at = self._balance_cache
+        now = time.monotonic()
+        if now - fetched_at < self.BALANCE_TTL:
+            return balance
+        
+        balances = await self.exchange_client.get_balance()
+        free = {b['asset']: b['free'] for b in balances}
+        balance = float(free.get(self.settings.quote_currency, 0.0))
+        self._balance_cache = (balance, now)
+        return balance
+    
+    def _invalidate_balance(self):
+        """Force the next position sizing to refetch the balance."""
+        self._balance_cache = (0.0, float('-inf'))
+    
     async def _calculate_position_size(self, symbol: str, price: float) -> float:
         """
         Calculate position size based on risk management rules.
         """
         try:
-            # Get account balance
-            balances = await self.exchange_client.get_balance()
-            
-            quote_balance = 0.0
-            for balance in balances:
-                if balance['asset'] == self.settings.quote_currency:
-                    quote_balance = float(balance['free'])
-                    break
+            quote_balance = await self._get_quote_balance()
             
             # Calculate position size based on risk per trade
             risk_amount = quote_balance * self.settings.risk_per_trade
@@ -233,88 +648,92 @@ class ScalpingStrategy(BaseStrategy):
             
             if 'orderId' in order_result:
                 # Track this position for stop loss/profit taking
-                position_info = {
-                    'symbol': symbol,
-                    'side': side,
-                    'entry_price': target_price if side == 'BUY' else stop_price,
-                    'size': size,
-                    'target_price': target_price,
-                    'stop_price': stop_price,
-                    'order_id': order_result['orderId'],
-                    'entry_time': datetime.now()
-                }
-                
-                self.active_positions[order_result['orderId']] = position_info
-                self.logger.info(f"Trade executed successfully: {order_result['orderId']}")
+                order_id = order_result['orderId']
+                self.positions.add(
+                    order_id, symbol, side,
+                    entry_price=target_price if side == 'BUY' else stop_price,
+                    target_price=target_price,
+                    stop_price=stop_price,
+                    size=size,
+                    entry_time_ns=time.monotonic_ns()
+                )
+                self._invalidate_balance()
+                self.logger.info(f"Trade executed successfully: {order_id}")
                 
-                # Start monitoring for stop loss/profit taking
-                asyncio.create_task(self._monitor_position(order_result['orderId']))
+                # Streamed trades check the position; the monitor covers a silent stream
+                asyncio.create_task(self._monitor_position(order_id))
             else:
                 self.logger.error(f"Failed to execute trade: {order_result}")
                 
         except Exception as e:
             self.logger.error(f"Error executing trade: {e}")
     
-    async def _monitor_position(self, order_id: str):
-        """
-        Monitor a position and execute stop loss/profit taking.
-        """
-        if order_id not in self.active_positions:
+    def _check_positions(self, symbol: str, price: float):
+        """Close every open position on symbol whose target or stop price was hit."""
+        for order_id in self.positions.hits(symbol, price):
+            asyncio.create_task(self._close_position(order_id, price))
+    
+    async def _close_position(self, order_id: str, current_price: float):
+        """Close a position at market and record its result."""
+        position = self.positions.get(order_id)
+        if position is None:
             return
-        
-        position = self.active_positions[order_id]
         symbol = position['symbol']
         side = position['side']
-        target_price = position['target_price']
-        stop_price = position['stop_price']
         
         try:
-            # Get real-time price updates
-            while order_id in self.active_positions:
-                ticker = await self.exchange_client.get_ticker_24hr(symbol)
-                current_price = float(ticker[0]['lastPrice']) if isinstance(ticker, list) else float(ticker['lastPrice'])
-                
-                # Check profit target
-                should_take_profit = (
-                    (side == 'BUY' and current_price >= target_price) or
-                    (side == 'SELL' and current_price <= target_price)
-                )
+            close_side = 'SELL' if side == 'BUY' else 'BUY'
+            close_result = await self.exchange_client.place_order(
+                symbol=symbol,
+                side=close_side,
+                order_type='MARKET',
+                quantity=position['size']
+            )
+            
+            if 'orderId' in close_result:
+                held = (time.monotonic_ns() - position['entry_time_ns']) / 1e9
+                self.logger.info(f"Position closed: {close_result['orderId']} after {held:.1f}s")
                 
-                # Check stop loss
-                should_stop_loss = (
-                    (side == 'BUY' and current_price <= stop_price) or
-                    (side == 'SELL' and current_price >= stop_price)
+                # Record metrics
+                profit = (
+                    (current_price - position['entry_price']) * position['size'] 
+                    if side == 'BUY' 
+                    else (position['entry_price'] - current_price) * position['size']
                 )
                 
-                if should_take_profit or should_stop_loss:
-                    # Close position
-                    close_side = 'SELL' if side == 'BUY' else 'BUY'
-                    close_result = await self.exchange_client.place_order(
-                        symbol=symbol,
-                        side=close_side,
-                        order_type='MARKET',
-                        quantity=position['size']
-                    )
-                    
-                    if 'orderId' in close_result:
-                        self.logger.info(f"Position closed: {close_result['orderId']}")
-                        
-                        # Record metrics
-                        profit = (
-                            (current_price - position['entry_price']) * position['size'] 
-                            if side == 'BUY' 
-                            else (position['entry_price'] - current_price) * position['size']
-                        )
-                        
-                        self.metrics_manager.record_trade(symbol, profit, position['size'])
-                        
-                        # Remove from active positions
-                        del self.active_positions[order_id]
-                        break
-                    else:
-                        self.logger.error(f"Failed to close position: {close_result}")
+                self.metrics_manager.record_trade(symbol, profit, position['size'])
                 
-                await asyncio.sleep(1)  # Check every second
+                # Remove from active positions; its monitor exits on its next check
+                self.positions.remove(order_id)
+                self._invalidate_balance()
+                return
+            self.logger.error(f"Failed to close position: {close_result}")
+        except Exception as e:
+            self.logger.error(f"Error closing position {order_id}: {e}")
+        # Let the next price check retry the close
+        self.positions.release(order_id)
+    
+    async def _monitor_position(self, order_id: str):
+        """
+        Check a position against the REST ticker while the trade stream is silent.
+        """
+        position = self.positions.get(order_id)
+        if position is None:
+            return
+        symbol = position['symbol']
+        
+        try:
+            while order_id in self.positions:
+                await asyncio.sleep(self.PRICE_WAIT_TIMEOUT)
+                if order_id not in self.positions:
+                    break
+                # Streamed trades are checked in _on_market_update
+                last_tick = self._last_tick_at.get(symbol, float('-inf'))
+                if time.monotonic() - last_tick < self.PRICE_WAIT_TIMEOUT:
+                    continue
+                current_price = await self.exchange_client.get_last_price(symbol)
+                if current_price is not None:
+                    self._check_positions(symbol, current_price)
                 
         except Exception as e:
             self.logger.error(f"Error monitoring position {order_id}: {e}")
@@ -333,7 +752,7 @@ class ScalpingStrategy(BaseStrategy):
         """Get the current status of the strategy."""
         return {
             'is_running': self.is_running,
-            'active_positions_count': len(self.active_positions),
+            'active_positions_count': len(self.positions),
             'trading_pairs': self.trading_pairs,
-            'last_trade_times': {k: v for k, v in self.last_trade_time.items()}
+            'last_trade_times': self.last_trade_time
         }
\ No newline at end of file
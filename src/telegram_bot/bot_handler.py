@@ -4,17 +4,165 @@ Telegram Bot Handler
 Manages the Telegram bot interface for control and monitoring
 """
 import asyncio
+import functools
+import json
 import logging
-from typing import Dict, Any, List
+import os
+import secrets
+import time
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 
 from telegram import Update, Bot
+from telegram.constants import ParseMode
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 from telegram.helpers import escape_markdown
 
-from src.exchange.api_client import MXCClient
-from src.strategies.scalping_strategy import ScalpingStrategy
-from src.monitoring.metrics import MetricsManager
-from src.config.settings import Settings
+from src.utils.helpers import parse_trading_pairs
+
+try:
+    # Optional: lets httpx multiplex Bot API calls over HTTP/2
+    import h2  # noqa: F401
+    _HTTP_VERSION = '2'
+except ImportError:
+    _HTTP_VERSION = '1.1'
+
+if TYPE_CHECKING:
+    # Annotations only; the instances are injected by the caller
+    from src.exchange.api_client import MXCClient
+    from src.strategies.scalping_strategy import ScalpingStrategy
+    from src.strategies.range_scalp_strategy import RangeScalpStrategy
+    from src.strategies.futures_strategy import FuturesStrategy
+    from src.monitoring.metrics import MetricsManager
+    from src.risk_management.risk_calculator import RiskManager
+
+
+def _parse_balances(balances: List[Dict[str, Any]]) -> Tuple[List[Tuple[str, float, float]], float]:
+    """
+    Parse exchange balances once into the non-zero (asset, free, locked)
+    entries and their combined total.
+    """
+    entries = []
+    total = 0.0
+    for balance in balances:
+        free = float(balance['free'])
+        locked = float(balance['locked'])
+        amount = free + locked
+        if amount > 0:
+            entries.append((balance['asset'], free, locked))
+            total += amount
+    return entries, total
+
+
+_UNAUTHORIZED_MSG = "You are not authorized to use this bot."
+
+# The static texts are escaped for MarkdownV2 once, at import
+_escape_md2 = functools.partial(escape_markdown, version=2)
+
+_WELCOME_MSG = "🤖 *MXC Scalp Trading Bot*\n\n" + _escape_md2(
+    "Welcome! I'm your trading assistant powered by the MXC exchange.\n\n"
+    "Available commands:\n"
+    "/help - Show all commands\n"
+    "/status - Show bot status\n"
+    "/balance - Show account balance\n"
+    "/start_trading - Start scalping strategy\n"
+    "/stop_trading - Stop scalping strategy\n"
+    "/start_range_trading - Start range scalping strategy\n"
+    "/stop_range_trading - Stop range scalping strategy\n"
+    "/start_futures_trading - Start futures strategy\n"
+    "/stop_futures_trading - Stop futures strategy\n"
+    "/set_pairs - Set trading pairs\n"
+    "/pairs - Show current trading pairs\n"
+    "/set_leverage - Set futures leverage\n"
+    "/leverage - Show current futures leverage\n"
+    "/set_risk - Set risk parameters\n"
+    "/set_size - Set position size\n"
+    "/risk_params - Show current risk parameters\n"
+    "/trades - Show recent trades\n"
+    "/profit - Show profit/loss\n"
+    "/risk - Show risk management status\n"
+    "/subscribe - Subscribe to notifications\n"
+    "/unsubscribe - Unsubscribe from notifications"
+)
+
+_HELP_MSG = "🤖 *MXC Scalp Trading Bot \\- Help*\n\n*Commands:*\n" + _escape_md2(
+    "/start - Start the bot and show welcome message\n"
+    "/help - Show this help message\n"
+    "/status - Show current bot status\n"
+    "/balance - Show account balances\n"
+    "/start_trading - Start the scalping strategy\n"
+    "/stop_trading - Stop the scalping strategy\n"
+    "/start_range_trading - Start the range scalping strategy\n"
+    "/stop_range_trading - Stop the range scalping strategy\n"
+    "/start_futures_trading - Start the futures strategy\n"
+    "/stop_futures_trading - Stop the futures strategy\n"
+    "/set_pairs - Set trading pairs (e.g., /set_pairs BTCUSDT,ETHUSDT)\n"
+    "/pairs - Show current trading pairs\n"
+    "/set_leverage - Set futures leverage (e.g., /set_leverage 10)\n"
+    "/leverage - Show current futures leverage\n"
+    "/set_risk - Set risk parameters (e.g., /set_risk max_daily_loss 100)\n"
+    "/set_size - Set position size (e.g., /set_size 100)\n"
+    "/risk_params - Show current risk parameters\n"
+    "/trades - Show recent trade history\n"
+    "/profit - Show profit/loss statistics\n"
+    "/risk - Show risk management status\n"
+    "/subscribe - Subscribe to trading notifications\n"
+    "/unsubscribe - Unsubscribe from notifications"
+) + "\n\n*" + _escape_md2("Note: Only authorized users can execute trading commands.") + "*"
+
+
+# Reply templates, filled with str.format; {ccy} is the quote currency
+_RISK_PARAMS_TPL = (
+    "📊 *Current Risk Parameters*\n\n"
+    "Max Daily Loss: ${max_daily_loss}\n"
+    "Risk Per Trade: {risk_per_trade:.2%}\n"
+    "Max Consecutive Losses: {max_consecutive_losses}\n"
+    "Profit Target: {scalp_profit_target:.2%}\n"
+    "Stop Loss: {scalp_stop_loss:.2%}\n"
+    "Max Position Size: {max_position_size} {quote_currency}"
+)
+
+_TRADE_LINE_TPL = "• {symbol}: {profit:+.4f} {ccy} ({timestamp})"
+
+_PROFIT_TPL = (
+    "📈 *Profit/Loss Statistics*\n\n"
+    "Total Profit: {total_profit:+.4f} {ccy}\n"
+    "Total Trades: {total_trades}\n"
+    "Win Rate: {win_rate:.2%}\n"
+    "Best Trade: {best_trade:+.4f} {ccy}\n"
+    "Worst Trade: {worst_trade:+.4f} {ccy}"
+)
+
+_RISK_STATUS_TPL = (
+    "🛡️ *Risk Management Status*\n\n"
+    "Daily P&L: {daily_pnl:+.4f} {ccy}\n"
+    "Daily Trades: {daily_trades_count}\n"
+    "Consecutive Losses: {consecutive_losses}\n"
+    "Max Daily Loss: {max_daily_loss} {ccy}\n"
+    "Max Consecutive Losses: {max_consecutive_losses}\n"
+    "Position Size Limit: {position_size_limit} {ccy}\n"
+    "Risk Per Trade: {risk_per_trade:.2%}"
+)
+
+# MarkdownV2; every field is escaped before filling
+_TRADE_NOTIFICATION_TPL = (
+    "💰 *New Trade Executed*\n\n"
+    "Symbol: {symbol}\n"
+    "Side: {side}\n"
+    "Size: {size}\n"
+    "Profit: {profit} {ccy}\n"
+    "Time: {timestamp}"
+)
+
+
+def _require_auth(handler):
+    """Reply with a refusal instead of running handler for unauthorized users."""
+    @functools.wraps(handler)
+    async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if update.effective_user.id not in self.authorized_users:
+            await update.message.reply_text(_UNAUTHORIZED_MSG)
+            return
+        return await handler(self, update, context)
+    return wrapper
 
 
 class TelegramBot:
@@ -22,13 +170,51 @@ class TelegramBot:
     Handles Telegram bot commands and notifications.
     """
     
+    # Seconds an account info response is shared between /status and /balance
+    ACCOUNT_CACHE_TTL = 2.0
+    # Outstanding notification sends, below Telegram's ~30 msg/s bot limit
+    MAX_CONCURRENT_SENDS = 30
+    # Broadcasts go out in batches of this many users, one batch per second
+    BROADCAST_BATCH = 25
+    # Long-polling timeout (seconds) for getUpdates when no webhook is set
+    POLL_TIMEOUT = 20
+    # HTTP connections available to concurrently running handlers
+    CONNECTION_POOL_SIZE = 32
+    # Seconds a call waits for a free pooled connection before failing
+    POOL_TIMEOUT = 5.0
+    # Seconds subscription changes are batched before being written to disk
+    SUBSCRIBERS_SAVE_DELAY = 1.0
+    # /set_risk parameter -> (cast, validator, settings attribute, label,
+    # formatter, message when out of range)
+    _RISK_PARAMS = {
+        'max_daily_loss': (
+            float, lambda v: v > 0, 'max_daily_loss', "Max daily loss",
+            lambda v: f"${v}", "❌ Max daily loss must be positive"),
+        'risk_per_trade': (
+            float, lambda v: 0 < v <= 0.5, 'risk_per_trade', "Risk per trade",
+            lambda v: f"{v:.2%}", "❌ Risk per trade must be between 0 and 0.5 (0% to 50%)"),
+        'max_consecutive_losses': (
+            int, lambda v: v > 0, 'max_consecutive_losses', "Max consecutive losses",
+            str, "❌ Max consecutive losses must be positive"),
+        'profit_target': (
+            float, lambda v: 0 < v <= 0.1, 'scalp_profit_target', "Profit target",
+            lambda v: f"{v:.2%}", "❌ Profit target must be between 0 and 0.1 (0% to 10%)"),
+        'stop_loss': (
+            float, lambda v: 0 < v <= 0.1, 'scalp_stop_loss', "Stop loss",
+            lambda v: f"{v:.2%}", "❌ Stop loss must be between 0 and 0.1 (0% to 10%)"),
+    }
+    
     def __init__(self, bot_token: str, authorized_users: List[int], 
-                 exchange_client: MXCClient, scalping_strategy: ScalpingStrategy,
-                 metrics_manager: MetricsManager, risk_manager: 'RiskManager' = None,
+                 exchange_client: 'MXCClient', scalping_strategy: 'ScalpingStrategy',
+                 metrics_manager: 'MetricsManager', risk_manager: 'RiskManager' = None,
                  range_scalp_strategy: 'RangeScalpStrategy' = None,
-                 futures_strategy: 'FuturesStrategy' = None):
+                 futures_strategy: 'FuturesStrategy' = None,
+                 webhook_url: str = '', webhook_listen: str = '0.0.0.0',
+                 webhook_port: int = 8443, webhook_path: str = 'telegram',
+                 webhook_secret: str = '', subscribers_file: Optional[str] = None):
         self.bot_token = bot_token
-        self.authorized_users = authorized_users
+        # Checked on every update
+        self.authorized_users = frozenset(authorized_users)
         self.exchange_client = exchange_client
         self.scalping_strategy = scalping_strategy
         self.range_scalp_strategy = range_scalp_strategy
@@ -37,143 +223,145 @@ class TelegramBot:
         self.risk_manager = risk_manager
         self.logger = logging.getLogger(__name__)
         
+        # Webhook delivery; polling is used when no public URL is configured
+        self.webhook_url = webhook_url
+        self.webhook_listen = webhook_listen
+        self.webhook_port = webhook_port
+        self.webhook_path = webhook_path
+        self.webhook_secret = webhook_secret
+        
         # Initialize the bot application
-        self.application = Application.builder().token(bot_token).build()
+        # Dispatch updates concurrently so one slow exchange round-trip doesn't
+        # hold up every other command, and size the HTTP pool to match. With h2
+        # installed, replies and notifications multiplex over HTTP/2.
+        self.application = (
+            Application.builder()
+            .token(bot_token)
+            .concurrent_updates(True)
+            .connection_pool_size(self.CONNECTION_POOL_SIZE)
+            .pool_timeout(self.POOL_TIMEOUT)
+            .http_version(_HTTP_VERSION)
+            .get_updates_http_version(_HTTP_VERSION)
+            .build()
+        )
         self.bot: Bot = self.application.bot
         
-        # Store user chat IDs for notifications
-        self.notification_users = set()
+        # Store user chat IDs for notifications; _subscribers is an immutable
+        # snapshot for broadcasts, rebuilt only when subscriptions change.
+        # With subscribers_file set they survive restarts.
+        self.subscribers_file = subscribers_file
+        self.notification_users = self._load_subscribers()
+        self._subscribers: Tuple[int, ...] = tuple(self.notification_users)
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._send_semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_SENDS)
+        # Strong references to fire-and-forget notification fan-outs
+        self._notify_tasks = set()
+        
+        # (monotonic fetch time, account info) and the in-flight fetch, if any
+        self._account_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._account_fetch: Optional[asyncio.Task] = None
         
         # Register command handlers
         self._register_handlers()
     
     def _register_handlers(self):
         """Register command handlers for the bot."""
-        # Command handlers
-        self.application.add_handler(CommandHandler('start', self._start))
-        self.application.add_handler(CommandHandler('help', self._help))
-        self.application.add_handler(CommandHandler('status', self._status))
-        self.application.add_handler(CommandHandler('balance', self._balance))
-        self.application.add_handler(CommandHandler('start_trading', self._start_trading))
-        self.application.add_handler(CommandHandler('stop_trading', self._stop_trading))
-        self.application.add_handler(CommandHandler('start_range_trading', self._start_range_trading))
-        self.application.add_handler(CommandHandler('stop_range_trading', self._stop_range_trading))
-        self.application.add_handler(CommandHandler('start_futures_trading', self._start_futures_trading))
-        self.application.add_handler(CommandHandler('stop_futures_trading', self._stop_futures_trading))
-        self.application.add_handler(CommandHandler('set_pairs', self._set_trading_pairs))
-        self.application.add_handler(CommandHandler('pairs', self._get_trading_pairs))
-        self.application.add_handler(CommandHandler('leverage', self._get_leverage))
-        self.application.add_handler(CommandHandler('set_leverage', self._set_leverage))
-        self.application.add_handler(CommandHandler('set_risk', self._set_risk_parameters))
-        self.application.add_handler(CommandHandler('set_size', self._set_position_size))
-        self.application.add_handler(CommandHandler('risk_params', self._get_risk_parameters))
-        self.application.add_handler(CommandHandler('trades', self._trades))
-        self.application.add_handler(CommandHandler('profit', self._profit))
-        self.application.add_handler(CommandHandler('risk', self._risk_status))
-        self.application.add_handler(CommandHandler('subscribe', self._subscribe_notifications))
-        self.application.add_handler(CommandHandler('unsubscribe', self._unsubscribe_notifications))
+        # Command name -> handler, dispatched by a single CommandHandler
+        self._commands = {
+            'start': self._start,
+            'help': self._help,
+            'status': self._status,
+            'balance': self._balance,
+            'start_trading': self._start_trading,
+            'stop_trading': self._stop_trading,
+            'start_range_trading': self._start_range_trading,
+            'stop_range_trading': self._stop_range_trading,
+            'start_futures_trading': self._start_futures_trading,
+            'stop_futures_trading': self._stop_futures_trading,
+            'set_pairs': self._set_trading_pairs,
+            'pairs': self._get_trading_pairs,
+            'leverage': self._get_leverage,
+            'set_leverage': self._set_leverage,
+            'set_risk': self._set_risk_parameters,
+            'set_size': self._set_position_size,
+            'risk_params': self._get_risk_parameters,
+            'trades': self._trades,
+            'profit': self._profit,
+            'risk': self._risk_status,
+            'subscribe': self._subscribe_notifications,
+            'unsubscribe': self._unsubscribe_notifications,
+        }
         
-        # Message handler for non-command messages
-        self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self._handle_message))
+        self.application.add_handlers([
+            CommandHandler(list(self._commands), self._dispatch_command),
+            # Message handler for non-command messages
+            MessageHandler(filters.TEXT & ~filters.COMMAND, self._handle_message),
+        ])
+        self.application.add_error_handler(self._on_error)
+    
+    async def _reply_error(self, update: Update, prefix: str, error: Exception):
+        """Tell the user a command failed."""
+        await update.message.reply_text(f"❌ {prefix}: {error}")
+    
+    async def _on_error(self, update: object, context: ContextTypes.DEFAULT_TYPE):
+        """Log exceptions that escaped a handler."""
+        self.logger.warning(f"Unhandled error while processing update: {context.error}")
+    
+    async def _dispatch_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Route a command to its handler with a single dict lookup."""
+        # "/cmd@BotName args" -> "cmd"
+        command = update.message.text.split(None, 1)[0][1:].split('@', 1)[0].lower()
+        handler = self._commands.get(command)
+        if handler is not None:
+            await handler(update, context)
     
-    def _is_authorized(self, user_id: int) -> bool:
-        """Check if user is authorized to use the bot."""
-        return user_id in self.authorized_users
+    async def _get_account_info_cached(self) -> Dict[str, Any]:
+        """
+        Account info, reused for ACCOUNT_CACHE_TTL seconds. Concurrent callers
+        share a single in-flight exchange request.
+        """
+        cached = self._account_cache
+        if cached is not None and time.monotonic() - cached[0] < self.ACCOUNT_CACHE_TTL:
+            return cached[1]
+        if self._account_fetch is None:
+            task = self._account_fetch = asyncio.create_task(self._fetch_account_info())
+            # Cleared from a callback rather than inside the task, so a task that
+            # completes eagerly (3.12+ eager task factory) can't be left behind
+            task.add_done_callback(self._account_fetch_done)
+        # Shielded so one cancelled handler doesn't cancel the others' fetch
+        return await asyncio.shield(self._account_fetch)
     
+    def _account_fetch_done(self, task: asyncio.Task):
+        if self._account_fetch is task:
+            self._account_fetch = None
+    
+    async def _fetch_account_info(self) -> Dict[str, Any]:
+        account_info = await self.exchange_client.get_account_info()
+        self._account_cache = (time.monotonic(), account_info)
+        return account_info
+    
+    @_require_auth
     async def _start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command."""
-        user_id = update.effective_user.id
-        
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
-        welcome_message = (
-            "🤖 *MXC Scalp Trading Bot* \n\n"
-            "Welcome! I'm your trading assistant powered by the MXC exchange.\n\n"
-            "Available commands:\n"
-            "/help - Show all commands\n"
-            "/status - Show bot status\n"
-            "/balance - Show account balance\n"
-            "/start_trading - Start scalping strategy\n"
-            "/stop_trading - Stop scalping strategy\n"
-            "/start_range_trading - Start range scalping strategy\n"
-            "/stop_range_trading - Stop range scalping strategy\n"
-            "/start_futures_trading - Start futures strategy\n"
-            "/stop_futures_trading - Stop futures strategy\n"
-            "/set_pairs - Set trading pairs\n"
-            "/pairs - Show current trading pairs\n"
-            "/set_leverage - Set futures leverage\n"
-            "/leverage - Show current futures leverage\n"
-            "/set_risk - Set risk parameters\n"
-            "/set_size - Set position size\n"
-            "/risk_params - Show current risk parameters\n"
-            "/trades - Show recent trades\n"
-            "/profit - Show profit/loss\n"
-            "/risk - Show risk management status\n"
-            "/subscribe - Subscribe to notifications\n"
-            "/unsubscribe - Unsubscribe from notifications"
-        )
-        
-        await update.message.reply_text(welcome_message, parse_mode='Markdown')
+        await update.message.reply_text(_WELCOME_MSG, parse_mode=ParseMode.MARKDOWN_V2)
     
+    @_require_auth
     async def _help(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command."""
-        user_id = update.effective_user.id
-        
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
-        help_message = (
-            "🤖 *MXC Scalp Trading Bot - Help*\n\n"
-            "*Commands:*\n"
-            "/start - Start the bot and show welcome message\n"
-            "/help - Show this help message\n"
-            "/status - Show current bot status\n"
-            "/balance - Show account balances\n"
-            "/start_trading - Start the scalping strategy\n"
-            "/stop_trading - Stop the scalping strategy\n"
-            "/start_range_trading - Start the range scalping strategy\n"
-            "/stop_range_trading - Stop the range scalping strategy\n"
-            "/start_futures_trading - Start the futures strategy\n"
-            "/stop_futures_trading - Stop the futures strategy\n"
-            "/set_pairs - Set trading pairs (e.g., /set_pairs BTCUSDT,ETHUSDT)\n"
-            "/pairs - Show current trading pairs\n"
-            "/set_leverage - Set futures leverage (e.g., /set_leverage 10)\n"
-            "/leverage - Show current futures leverage\n"
-            "/set_risk - Set risk parameters (e.g., /set_risk max_daily_loss 100)\n"
-            "/set_size - Set position size (e.g., /set_size 100)\n"
-            "/risk_params - Show current risk parameters\n"
-            "/trades - Show recent trade history\n"
-            "/profit - Show profit/loss statistics\n"
-            "/risk - Show risk management status\n"
-            "/subscribe - Subscribe to trading notifications\n"
-            "/unsubscribe - Unsubscribe from notifications\n\n"
-            "*Note: Only authorized users can execute trading commands.*"
-        )
-        
-        await update.message.reply_text(help_message, parse_mode='Markdown')
+        await update.message.reply_text(_HELP_MSG, parse_mode=ParseMode.MARKDOWN_V2)
     
+    @_require_auth
     async def _status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command."""
         user_id = update.effective_user.id
         
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
         try:
             # Get strategy status
             strategy_status = self.scalping_strategy.get_status()
             
             # Get account info
-            account_info = await self.exchange_client.get_account_info()
-            total_balance = sum(
-                float(balance['free']) + float(balance['locked']) 
-                for balance in account_info['balances'] 
-                if float(balance['free']) + float(balance['locked']) > 0
-            )
+            account_info = await self._get_account_info_cached()
+            _, total_balance = _parse_balances(account_info['balances'])
             
             status_message = (
                 "📊 *Bot Status*\n\n"
@@ -187,29 +375,18 @@ class TelegramBot:
             await update.message.reply_text(status_message, parse_mode='Markdown')
             
         except Exception as e:
-            error_message = f"❌ Error getting status: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error getting status", e)
     
+    @_require_auth
     async def _balance(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /balance command."""
-        user_id = update.effective_user.id
-        
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
         try:
-            account_info = await self.exchange_client.get_account_info()
+            account_info = await self._get_account_info_cached()
             
-            # Format balances
-            balances = []
-            for balance in account_info['balances']:
-                free = float(balance['free'])
-                locked = float(balance['locked'])
-                total = free + locked
-                
-                if total > 0:  # Only show non-zero balances
-                    balances.append(f"{balance['asset']}: {free:.4f} free, {locked:.4f} locked")
+            # Format balances (only non-zero ones)
+            entries, _ = _parse_balances(account_info['balances'])
+            balances = [f"{asset}: {free:.4f} free, {locked:.4f} locked"
+                        for asset, free, locked in entries]
             
             if balances:
                 balance_message = "💰 *Account Balances*\n\n" + "\n".join(balances)
@@ -219,17 +396,11 @@ class TelegramBot:
             await update.message.reply_text(balance_message, parse_mode='Markdown')
             
         except Exception as e:
-            error_message = f"❌ Error getting balance: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error getting balance", e)
     
+    @_require_auth
     async def _start_trading(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start_trading command."""
-        user_id = update.effective_user.id
-        
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
         try:
             # Update settings to enable trading
             self.scalping_strategy.settings.trading_enabled = True
@@ -239,20 +410,14 @@ class TelegramBot:
             await update.message.reply_text(success_message)
             
             # Send notification to all subscribers
-            await self._send_notification_to_all("🚨 Bot Alert: Scalping strategy started!")
+            self._notify_all_in_background("🚨 Bot Alert: Scalping strategy started!")
             
         except Exception as e:
-            error_message = f"❌ Error starting trading: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error starting trading", e)
     
+    @_require_auth
     async def _stop_trading(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /stop_trading command."""
-        user_id = update.effective_user.id
-        
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
         try:
             self.scalping_strategy.stop()
             # Also disable trading in settings
@@ -262,20 +427,14 @@ class TelegramBot:
             await update.message.reply_text(success_message)
             
             # Send notification to all subscribers
-            await self._send_notification_to_all("✅ Bot Alert: Scalping strategy stopped!")
+            self._notify_all_in_background("✅ Bot Alert: Scalping strategy stopped!")
             
         except Exception as e:
-            error_message = f"❌ Error stopping trading: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error stopping trading", e)
 
+    @_require_auth
     async def _start_range_trading(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start_range_trading command."""
-        user_id = update.effective_user.id
-
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-
         if not self.range_scalp_strategy:
             await update.message.reply_text("❌ Range scalping strategy is not initialized.")
             return
@@ -290,20 +449,14 @@ class TelegramBot:
             await update.message.reply_text(success_message)
 
             # Send notification to all subscribers
-            await self._send_notification_to_all("🚨 Bot Alert: Range scalping strategy started!")
+            self._notify_all_in_background("🚨 Bot Alert: Range scalping strategy started!")
 
         except Exception as e:
-            error_message = f"❌ Error starting range trading: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error starting range trading", e)
 
+    @_require_auth
     async def _stop_range_trading(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /stop_range_trading command."""
-        user_id = update.effective_user.id
-
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-
         if not self.range_scalp_strategy:
             await update.message.reply_text("❌ Range scalping strategy is not initialized.")
             return
@@ -317,20 +470,14 @@ class TelegramBot:
             await update.message.reply_text(success_message)
 
             # Send notification to all subscribers
-            await self._send_notification_to_all("✅ Bot Alert: Range scalping strategy stopped!")
+            self._notify_all_in_background("✅ Bot Alert: Range scalping strategy stopped!")
 
         except Exception as e:
-            error_message = f"❌ Error stopping range trading: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error stopping range trading", e)
 
+    @_require_auth
     async def _start_futures_trading(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start_futures_trading command."""
-        user_id = update.effective_user.id
-
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-
         if not self.futures_strategy:
             await update.message.reply_text("❌ Futures strategy is not initialized.")
             return
@@ -344,20 +491,14 @@ class TelegramBot:
             await update.message.reply_text(success_message)
 
             # Send notification to all subscribers
-            await self._send_notification_to_all("🚨 Bot Alert: Futures strategy started!")
+            self._notify_all_in_background("🚨 Bot Alert: Futures strategy started!")
 
         except Exception as e:
-            error_message = f"❌ Error starting futures trading: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error starting futures trading", e)
 
+    @_require_auth
     async def _stop_futures_trading(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /stop_futures_trading command."""
-        user_id = update.effective_user.id
-
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-
         if not self.futures_strategy:
             await update.message.reply_text("❌ Futures strategy is not initialized.")
             return
@@ -371,41 +512,27 @@ class TelegramBot:
             await update.message.reply_text(success_message)
 
             # Send notification to all subscribers
-            await self._send_notification_to_all("✅ Bot Alert: Futures strategy stopped!")
+            self._notify_all_in_background("✅ Bot Alert: Futures strategy stopped!")
 
         except Exception as e:
-            error_message = f"❌ Error stopping futures trading: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error stopping futures trading", e)
 
+    @_require_auth
     async def _set_trading_pairs(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /set_pairs command to set trading pairs."""
-        user_id = update.effective_user.id
-
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-
         try:
-            # Get the pairs from the command message
-            message_text = update.message.text.strip()
-            parts = message_text.split(' ', 1)
-            
-            if len(parts) < 2:
+            if not context.args:
                 await update.message.reply_text(
                     "❌ Please specify trading pairs. Usage: /set_pairs BTCUSDT,ETHUSDT"
                 )
                 return
 
-            pairs_str = parts[1]
-            pairs = [pair.strip().upper() for pair in pairs_str.split(',')]
-            
-            # Validate pairs format (basic validation)
-            valid_pairs = []
-            for pair in pairs:
-                if len(pair) >= 6 and pair.endswith('USDT'):  # Basic validation
-                    valid_pairs.append(pair)
-                else:
-                    await update.message.reply_text(f"⚠️ Invalid pair format: {pair}. Use format like BTCUSDT")
+            # Validate pairs format, reporting all bad pairs in one reply
+            valid_pairs, invalid_pairs = parse_trading_pairs(' '.join(context.args))
+            if invalid_pairs:
+                await update.message.reply_text(
+                    f"⚠️ Invalid pair format: {', '.join(invalid_pairs)}. Use format like BTCUSDT"
+                )
             
             if not valid_pairs:
                 await update.message.reply_text("❌ No valid pairs provided. Use format like: BTCUSDT,ETHUSDT")
@@ -423,36 +550,24 @@ class TelegramBot:
             await update.message.reply_text(success_message)
 
         except Exception as e:
-            error_message = f"❌ Error setting trading pairs: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error setting trading pairs", e)
 
+    @_require_auth
     async def _get_trading_pairs(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /pairs command to get current trading pairs."""
-        user_id = update.effective_user.id
-
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-
         try:
-            # Get pairs from the scalping strategy as default
-            pairs = getattr(self.scalping_strategy, 'trading_pairs', [self.scalping_strategy.settings.default_symbol]) if self.scalping_strategy else []
+            # The scalping strategy always has trading_pairs (set from settings at init)
+            pairs = self.scalping_strategy.trading_pairs if self.scalping_strategy else []
             
             pairs_message = f"📊 Current trading pairs: {', '.join(pairs) if pairs else 'No pairs set'}"
             await update.message.reply_text(pairs_message)
 
         except Exception as e:
-            error_message = f"❌ Error getting trading pairs: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error getting trading pairs", e)
 
+    @_require_auth
     async def _get_leverage(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /leverage command to get current leverage."""
-        user_id = update.effective_user.id
-
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-
         try:
             if not self.futures_strategy:
                 await update.message.reply_text("❌ Futures strategy is not initialized.")
@@ -463,34 +578,24 @@ class TelegramBot:
             await update.message.reply_text(leverage_message)
 
         except Exception as e:
-            error_message = f"❌ Error getting leverage: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error getting leverage", e)
 
+    @_require_auth
     async def _set_leverage(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /set_leverage command to set leverage for futures."""
-        user_id = update.effective_user.id
-
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-
         try:
             if not self.futures_strategy:
                 await update.message.reply_text("❌ Futures strategy is not initialized.")
                 return
 
-            # Get the leverage from the command message
-            message_text = update.message.text.strip()
-            parts = message_text.split(' ', 1)
-            
-            if len(parts) < 2:
+            if not context.args:
                 await update.message.reply_text(
                     "❌ Please specify leverage. Usage: /set_leverage 10"
                 )
                 return
 
             try:
-                leverage = int(parts[1])
+                leverage = int(context.args[0])
             except ValueError:
                 await update.message.reply_text("❌ Leverage must be a number between 1 and 125")
                 return
@@ -504,23 +609,13 @@ class TelegramBot:
             await update.message.reply_text(success_message)
 
         except Exception as e:
-            error_message = f"❌ Error setting leverage: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error setting leverage", e)
 
+    @_require_auth
     async def _set_risk_parameters(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /set_risk command to adjust risk parameters."""
-        user_id = update.effective_user.id
-
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-
         try:
-            # Get parameters from the command message
-            message_text = update.message.text.strip()
-            parts = message_text.split(' ', 1)
-            
-            if len(parts) < 2:
+            if not context.args:
                 await update.message.reply_text(
                     "❌ Please specify risk parameter and value. Usage examples:\n" +
                     "/set_risk max_daily_loss 100\n" +
@@ -531,120 +626,58 @@ class TelegramBot:
                 )
                 return
 
-            params_str = parts[1]
-            param_parts = params_str.split(' ')
-            
-            if len(param_parts) != 2:
+            if len(context.args) != 2:
                 await update.message.reply_text(
                     "❌ Invalid format. Use: /set_risk parameter_name value"
                 )
                 return
             
-            param_name = param_parts[0].lower()
-            param_value = param_parts[1]
+            param_name = context.args[0].lower()
+            param_value = context.args[1]
             
             # Get the settings from scalping strategy
             if not self.scalping_strategy:
                 await update.message.reply_text("❌ Strategy not initialized.")
                 return
                 
-            settings = self.scalping_strategy.settings
+            spec = self._RISK_PARAMS.get(param_name)
+            if spec is None:
+                await update.message.reply_text(
+                    "❌ Unknown parameter. Valid parameters:\n" +
+                    "\n".join(f"- {name}" for name in self._RISK_PARAMS)
+                )
+                return
+            cast, is_valid, attr, label, fmt, invalid_msg = spec
             
-            # Validate and update the parameter
-            success = False
             try:
-                if param_name == 'max_daily_loss':
-                    value = float(param_value)
-                    if value > 0:
-                        settings.max_daily_loss = value
-                        success = True
-                        response = f"✅ Max daily loss set to ${value}"
-                    else:
-                        await update.message.reply_text("❌ Max daily loss must be positive")
-                        return
-                        
-                elif param_name == 'risk_per_trade':
-                    value = float(param_value)
-                    if 0 < value <= 0.5:  # Max 50% risk per trade
-                        settings.risk_per_trade = value
-                        success = True
-                        response = f"✅ Risk per trade set to {value:.2%}"
-                    else:
-                        await update.message.reply_text("❌ Risk per trade must be between 0 and 0.5 (0% to 50%)")
-                        return
-                        
-                elif param_name == 'max_consecutive_losses':
-                    value = int(param_value)
-                    if value > 0:
-                        settings.max_consecutive_losses = value
-                        success = True
-                        response = f"✅ Max consecutive losses set to {value}"
-                    else:
-                        await update.message.reply_text("❌ Max consecutive losses must be positive")
-                        return
-                        
-                elif param_name == 'profit_target' or param_name == 'profit_target':
-                    value = float(param_value)
-                    if 0 < value <= 0.1:  # Max 10% profit target
-                        settings.scalp_profit_target = value
-                        success = True
-                        response = f"✅ Profit target set to {value:.2%}"
-                    else:
-                        await update.message.reply_text("❌ Profit target must be between 0 and 0.1 (0% to 10%)")
-                        return
-                        
-                elif param_name == 'stop_loss':
-                    value = float(param_value)
-                    if 0 < value <= 0.1:  # Max 10% stop loss
-                        settings.scalp_stop_loss = value
-                        success = True
-                        response = f"✅ Stop loss set to {value:.2%}"
-                    else:
-                        await update.message.reply_text("❌ Stop loss must be between 0 and 0.1 (0% to 10%)")
-                        return
-                        
-                else:
-                    await update.message.reply_text(
-                        "❌ Unknown parameter. Valid parameters:\n" +
-                        "- max_daily_loss\n" +
-                        "- risk_per_trade\n" +
-                        "- max_consecutive_losses\n" +
-                        "- profit_target\n" +
-                        "- stop_loss"
-                    )
-                    return
+                value = cast(param_value)
             except ValueError:
                 await update.message.reply_text("❌ Invalid value format. Please provide a number.")
                 return
             
-            if success:
-                await update.message.reply_text(response)
+            if not is_valid(value):
+                await update.message.reply_text(invalid_msg)
+                return
+            
+            setattr(self.scalping_strategy.settings, attr, value)
+            self.scalping_strategy.refresh_settings()
+            await update.message.reply_text(f"✅ {label} set to {fmt(value)}")
 
         except Exception as e:
-            error_message = f"❌ Error setting risk parameters: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error setting risk parameters", e)
 
+    @_require_auth
     async def _set_position_size(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /set_size command to adjust position size."""
-        user_id = update.effective_user.id
-
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-
         try:
-            # Get the size from the command message
-            message_text = update.message.text.strip()
-            parts = message_text.split(' ', 1)
-            
-            if len(parts) < 2:
+            if not context.args:
                 await update.message.reply_text(
                     "❌ Please specify position size. Usage: /set_size 100"
                 )
                 return
 
             try:
-                size = float(parts[1])
+                size = float(context.args[0])
             except ValueError:
                 await update.message.reply_text("❌ Position size must be a number")
                 return
@@ -664,106 +697,63 @@ class TelegramBot:
             await update.message.reply_text(response)
 
         except Exception as e:
-            error_message = f"❌ Error setting position size: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error setting position size", e)
 
+    @_require_auth
     async def _get_risk_parameters(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /risk_params command to get current risk parameters."""
-        user_id = update.effective_user.id
-
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-
         try:
             if not self.scalping_strategy:
                 await update.message.reply_text("❌ Strategy not initialized.")
                 return
                 
-            settings = self.scalping_strategy.settings
-            
-            risk_params_message = (
-                f"📊 *Current Risk Parameters*\n\n"
-                f"Max Daily Loss: ${settings.max_daily_loss}\n"
-                f"Risk Per Trade: {settings.risk_per_trade:.2%}\n"
-                f"Max Consecutive Losses: {settings.max_consecutive_losses}\n"
-                f"Profit Target: {settings.scalp_profit_target:.2%}\n"
-                f"Stop Loss: {settings.scalp_stop_loss:.2%}\n"
-                f"Max Position Size: {settings.max_position_size} {settings.quote_currency}"
-            )
+            risk_params_message = _RISK_PARAMS_TPL.format_map(vars(self.scalping_strategy.settings))
             
             await update.message.reply_text(risk_params_message, parse_mode='Markdown')
 
         except Exception as e:
-            error_message = f"❌ Error getting risk parameters: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error getting risk parameters", e)
 
+    @_require_auth
     async def _trades(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /trades command."""
-        user_id = update.effective_user.id
-        
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
         try:
             # Get recent trades from metrics
-            recent_trades = self.metrics_manager.get_recent_trades()
+            recent_trades = self.metrics_manager.get_recent_trades(5)
             
             if not recent_trades:
                 trades_message = "📋 No recent trades recorded."
             else:
-                # Format recent trades
-                trade_list = []
-                for trade in recent_trades[-5:]:  # Show last 5 trades
-                    trade_list.append(
-                        f"• {trade['symbol']}: {trade['profit']:+.4f} {self.scalping_strategy.settings.quote_currency} "
-                        f"({trade['timestamp']})"
-                    )
-                
-                trades_message = "📋 *Recent Trades*\n\n" + "\n".join(trade_list)
+                # Format the last 5 trades
+                ccy = self.scalping_strategy.settings.quote_currency
+                trades_message = "📋 *Recent Trades*\n\n" + "\n".join(
+                    _TRADE_LINE_TPL.format(ccy=ccy, **trade) for trade in recent_trades
+                )
             
             await update.message.reply_text(trades_message, parse_mode='Markdown')
             
         except Exception as e:
-            error_message = f"❌ Error getting trades: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error getting trades", e)
     
+    @_require_auth
     async def _profit(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /profit command."""
-        user_id = update.effective_user.id
-        
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
         try:
             # Get profit/loss statistics
             stats = self.metrics_manager.get_statistics()
             
-            profit_message = (
-                "📈 *Profit/Loss Statistics*\n\n"
-                f"Total Profit: {stats['total_profit']:+.4f} {self.scalping_strategy.settings.quote_currency}\n"
-                f"Total Trades: {stats['total_trades']}\n"
-                f"Win Rate: {stats['win_rate']:.2%}\n"
-                f"Best Trade: {stats['best_trade']:+.4f} {self.scalping_strategy.settings.quote_currency}\n"
-                f"Worst Trade: {stats['worst_trade']:+.4f} {self.scalping_strategy.settings.quote_currency}"
+            profit_message = _PROFIT_TPL.format(
+                ccy=self.scalping_strategy.settings.quote_currency, **stats
             )
             
             await update.message.reply_text(profit_message, parse_mode='Markdown')
             
         except Exception as e:
-            error_message = f"❌ Error getting profit stats: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error getting profit stats", e)
 
+    @_require_auth
     async def _risk_status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /risk command."""
-        user_id = update.effective_user.id
-
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-
         if not self.risk_manager:
             await update.message.reply_text("❌ Risk manager is not initialized.")
             return
@@ -772,32 +762,21 @@ class TelegramBot:
             # Get risk management status
             risk_status = self.risk_manager.get_risk_status()
 
-            risk_message = (
-                "🛡️ *Risk Management Status*\n\n"
-                f"Daily P&L: {risk_status['daily_pnl']:+.4f} {self.scalping_strategy.settings.quote_currency}\n"
-                f"Daily Trades: {risk_status['daily_trades_count']}\n"
-                f"Consecutive Losses: {risk_status['consecutive_losses']}\n"
-                f"Max Daily Loss: {risk_status['max_daily_loss']} {self.scalping_strategy.settings.quote_currency}\n"
-                f"Max Consecutive Losses: {risk_status['max_consecutive_losses']}\n"
-                f"Position Size Limit: {risk_status['position_size_limit']} {self.scalping_strategy.settings.quote_currency}\n"
-                f"Risk Per Trade: {risk_status['risk_per_trade']:.2%}"
+            risk_message = _RISK_STATUS_TPL.format(
+                ccy=self.scalping_strategy.settings.quote_currency, **risk_status
             )
 
             await update.message.reply_text(risk_message, parse_mode='Markdown')
 
         except Exception as e:
-            error_message = f"❌ Error getting risk status: {str(e)}"
-            await update.message.reply_text(error_message)
+            await self._reply_error(update, "Error getting risk status", e)
     
+    @_require_auth
     async def _subscribe_notifications(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /subscribe command."""
         user_id = update.effective_user.id
         
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
-        self.notification_users.add(user_id)
+        self._add_subscriber(user_id)
         
         success_message = "✅ You have subscribed to trading notifications!"
         await update.message.reply_text(success_message)
@@ -806,51 +785,144 @@ class TelegramBot:
         """Handle /unsubscribe command."""
         user_id = update.effective_user.id
         
-        self.notification_users.discard(user_id)
+        self._remove_subscriber(user_id)
         
         success_message = "✅ You have unsubscribed from trading notifications."
         await update.message.reply_text(success_message)
     
+    @_require_auth
     async def _handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle non-command messages."""
-        user_id = update.effective_user.id
-        
-        if not self._is_authorized(user_id):
-            await update.message.reply_text("You are not authorized to use this bot.")
-            return
-        
         # For non-authorized users, just acknowledge the message
         await update.message.reply_text("I received your message. Use /help to see available commands.")
     
+    async def start_updates(self):
+        """Start receiving updates by webhook if configured, otherwise by polling."""
+        if self.webhook_url:
+            await self.start_webhook()
+        else:
+            await self.start_polling()
+    
     async def start_polling(self):
         """Start the Telegram bot polling."""
         self.logger.info("Starting Telegram bot polling...")
+        await self.application.initialize()
         await self.application.start()
-        await self.application.updater.start_polling()
+        # Long-poll so an idle bot isn't re-requesting updates every few seconds
+        await self.application.updater.start_polling(timeout=self.POLL_TIMEOUT)
+    
+    async def start_webhook(self):
+        """
+        Start receiving updates pushed by Telegram to webhook_url/webhook_path.
+        
+        Requires the python-telegram-bot[webhooks] extra. Without a configured
+        secret a random one is registered, so forged POSTs are rejected.
+        """
+        self.logger.info(f"Starting Telegram bot webhook on {self.webhook_listen}:{self.webhook_port}...")
+        await self.application.initialize()
+        await self.application.start()
+        await self.application.updater.start_webhook(
+            listen=self.webhook_listen,
+            port=self.webhook_port,
+            url_path=self.webhook_path,
+            webhook_url=f"{self.webhook_url.rstrip('/')}/{self.webhook_path}",
+            secret_token=self.webhook_secret or secrets.token_urlsafe(32)
+        )
     
     async def stop(self):
         """Stop the Telegram bot."""
         self.logger.info("Stopping Telegram bot...")
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_subscribers()
+        if self.application.updater.running:
+            await self.application.updater.stop()
         await self.application.stop()
         await self.application.shutdown()
     
-    async def _send_notification_to_all(self, message: str):
-        """Send notification to all subscribed users."""
-        for user_id in self.notification_users:
+    def _add_subscriber(self, user_id: int):
+        """Subscribe a user to notifications."""
+        if user_id not in self.notification_users:
+            self.notification_users.add(user_id)
+            self._subscribers_changed()
+    
+    def _remove_subscriber(self, user_id: int):
+        """Unsubscribe a user from notifications."""
+        if user_id in self.notification_users:
+            self.notification_users.discard(user_id)
+            self._subscribers_changed()
+    
+    def _subscribers_changed(self):
+        self._subscribers = tuple(self.notification_users)
+        # Coalesce a burst of (un)subscribes into one write
+        if self.subscribers_file and self._save_handle is None:
+            self._save_handle = asyncio.get_running_loop().call_later(
+                self.SUBSCRIBERS_SAVE_DELAY, self._save_subscribers)
+    
+    def _load_subscribers(self) -> set:
+        """Load persisted notification subscribers, if any."""
+        if not self.subscribers_file or not os.path.exists(self.subscribers_file):
+            return set()
+        try:
+            with open(self.subscribers_file) as f:
+                return set(json.load(f))
+        except Exception as e:
+            self.logger.error(f"Error loading notification subscribers: {e}")
+            return set()
+    
+    def _save_subscribers(self):
+        """Write subscribers atomically so a crash never leaves a torn file."""
+        self._save_handle = None
+        tmp_path = f"{self.subscribers_file}.tmp"
+        try:
+            directory = os.path.dirname(self.subscribers_file)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(list(self._subscribers), f)
+            os.replace(tmp_path, self.subscribers_file)
+        except Exception as e:
+            self.logger.error(f"Error saving notification subscribers: {e}")
+    
+    async def _send_notification_to_all(self, message: str, parse_mode: Optional[str] = None):
+        """
+        Send notification to all subscribed users concurrently, pacing large
+        broadcasts to stay under Telegram's per-bot rate limit.
+        """
+        # Snapshot: subscriptions may change while sends are awaited
+        users = self._subscribers
+        for start in range(0, len(users), self.BROADCAST_BATCH):
+            if start:
+                await asyncio.sleep(1.0)
+            await asyncio.gather(*(self._send_notification(user_id, message, parse_mode)
+                                   for user_id in users[start:start + self.BROADCAST_BATCH]))
+    
+    async def _send_notification(self, user_id: int, message: str, parse_mode: Optional[str] = None):
+        async with self._send_semaphore:
             try:
-                await self.bot.send_message(chat_id=user_id, text=message)
+                await self.bot.send_message(chat_id=user_id, text=message, parse_mode=parse_mode)
             except Exception as e:
                 self.logger.error(f"Error sending notification to {user_id}: {e}")
     
+    def _notify_all_in_background(self, message: str):
+        """Fan a notification out without delaying the current handler's reply."""
+        task = asyncio.create_task(self._send_notification_to_all(message))
+        self._notify_tasks.add(task)
+        task.add_done_callback(self._notify_tasks.discard)
+    
     async def send_trade_notification(self, trade_info: Dict[str, Any]):
         """Send a trade notification to subscribed users."""
-        message = (
-            f"💰 *New Trade Executed*\n\n"
-            f"Symbol: {trade_info['symbol']}\n"
-            f"Side: {trade_info['side']}\n"
-            f"Size: {trade_info['size']}\n"
-            f"Profit: {trade_info['profit']:+.4f} {self.scalping_strategy.settings.quote_currency}\n"
-            f"Time: {trade_info['timestamp']}"
+        # Escaped once per broadcast, so symbols containing _ or * can't break parsing
+        fields = {
+            'symbol': trade_info['symbol'],
+            'side': trade_info['side'],
+            'size': trade_info['size'],
+            'profit': f"{trade_info['profit']:+.4f}",
+            'ccy': self.scalping_strategy.settings.quote_currency,
+            'timestamp': trade_info['timestamp'],
+        }
+        message = _TRADE_NOTIFICATION_TPL.format_map(
+            {key: _escape_md2(str(value)) for key, value in fields.items()}
         )
         
-        await self._send_notification_to_all(message)
\ No newline at end of file
+        await self._send_notification_to_all(message, parse_mode=ParseMode.MARKDOWN_V2)
\ No newline at end of file
@@ -4,7 +4,7 @@ MXC Scalp Bot - Utilities Package
 from .helpers import *
 from .validators import *
 
-__all__ = ['validate_symbol', 'calculate_profit', 'format_currency', 'percent_to_decimal', 
+__all__ = ['validate_symbol', 'validate_trading_pair', 'parse_trading_pairs', 'calculate_profit', 'format_currency', 'percent_to_decimal', 
            'decimal_to_percent', 'safe_float', 'truncate_float', 'validate_api_key', 
            'validate_secret_key', 'validate_telegram_token', 'validate_risk_parameters', 
            'validate_trade_parameters', 'validate_percentage', 'validate_positive_number']
\ No newline at end of file
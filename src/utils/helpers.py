@@ -1,17 +1,44 @@
 """
 Utility functions for the MXC Scalp Trading Bot
 """
+import asyncio
 import re
-from typing import Union
+from typing import List, Tuple, Union
+
+# Uppercase base + quote currency, at least 6 letters (e.g. BTCUSDT)
+_SYMBOL_RE = re.compile(r'^[A-Z]{6,}$')
 
 
 def validate_symbol(symbol: str) -> bool:
     """
     Validate that a symbol is in proper format (e.g., BTCUSDT).
     """
-    # Check if symbol matches the pattern: uppercase letters, followed by uppercase letters (quote currency)
-    pattern = r'^[A-Z]+[A-Z]+$'
-    return bool(re.match(pattern, symbol)) and len(symbol) >= 6
+    return bool(_SYMBOL_RE.match(symbol))
+
+
+# USDT-quoted spot pair; the base asset may contain digits (e.g. 1INCHUSDT, C98USDT)
+_PAIR_RE = re.compile(r'^[A-Z0-9]{2,}USDT$')
+# Pairs in user input are separated by commas and/or whitespace
+_PAIRS_SEP_RE = re.compile(r'[,\s]+')
+
+
+def validate_trading_pair(pair: str) -> bool:
+    """
+    Validate that a trading pair is a USDT-quoted symbol (e.g., BTCUSDT, 1INCHUSDT).
+    """
+    return bool(_PAIR_RE.match(pair))
+
+
+def parse_trading_pairs(pairs_str: str) -> Tuple[List[str], List[str]]:
+    """
+    Split user input into (valid pairs, invalid pairs).
+    
+    Pairs are upper-cased and each keeps the position of its first occurrence.
+    """
+    pairs = dict.fromkeys(pair for pair in _PAIRS_SEP_RE.split(pairs_str.upper()) if pair)
+    valid = [pair for pair in pairs if _PAIR_RE.match(pair)]
+    invalid = [pair for pair in pairs if not _PAIR_RE.match(pair)]
+    return valid, invalid
 
 
 def calculate_profit(entry_price: float, exit_price: float, quantity: float, is_long: bool = True) -> float:
@@ -33,19 +60,15 @@ def calculate_profit(entry_price: float, exit_price: float, quantity: float, is_
         return (entry_price - exit_price) * quantity
 
 
+# Decimal places per currency; stablecoins and anything unlisted show 4
+_CCY_DECIMALS = {'BTC': 8}
+
+
 def format_currency(amount: Union[float, int], currency: str = 'USDT') -> str:
     """
     Format currency amounts with appropriate decimal places.
     """
-    if currency in ['USDT', 'BUSD', 'USDC', 'DAI']:
-        # Stablecoins - show 4 decimal places
-        return f"{amount:.4f} {currency}"
-    elif currency in ['BTC']:
-        # Bitcoin - show 8 decimal places
-        return f"{amount:.8f} {currency}"
-    else:
-        # Other currencies - show 4 decimal places
-        return f"{amount:.4f} {currency}"
+    return f"{amount:.{_CCY_DECIMALS.get(currency, 4)}f} {currency}"
 
 
 def percent_to_decimal(percent: Union[float, str]) -> float:
@@ -73,17 +96,38 @@ def safe_float(value: Union[str, int, float, None], default: float = 0.0) -> flo
     """
     Safely convert a value to float, returning a default if conversion fails.
     """
+    if type(value) is float:
+        return value
+    if value is None:
+        return default
     try:
-        if value is None:
-            return default
         return float(value)
     except (ValueError, TypeError):
         return default
 
 
+# Multipliers for the usual truncation precisions (0-18 decimals)
+_POW10 = tuple(10 ** i for i in range(19))
+
+
 def truncate_float(value: float, decimals: int = 8) -> float:
     """
     Truncate a float to specified number of decimal places without rounding.
     """
-    multiplier = 10 ** decimals
-    return int(value * multiplier) / multiplier
\ No newline at end of file
+    multiplier = _POW10[decimals] if 0 <= decimals < len(_POW10) else 10 ** decimals
+    return int(value * multiplier) / multiplier
+
+
+def install_uvloop() -> bool:
+    """
+    Use uvloop's libuv-based event loop for subsequent asyncio.run() calls.
+    
+    uvloop is not available on Windows; the stdlib loop is kept there, or
+    whenever uvloop is not installed. Returns True if uvloop was installed.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
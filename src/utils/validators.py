@@ -4,6 +4,10 @@ Validation utilities for the MXC Scalp Trading Bot
 from typing import Union, Dict, Any
 import re
 
+# Telegram tokens follow the format: digits:letters (e.g., 123456789:ABCdefGhIjKlmnopqr)
+_TG_TOKEN_RE = re.compile(r'^\d+:[\w-]+$')
+_SYMBOL_RE = re.compile(r'^[A-Z]+$')
+
 
 def validate_api_key(api_key: str) -> bool:
     """Validate MXC API key format."""
@@ -29,9 +33,23 @@ def validate_telegram_token(token: str) -> bool:
     if not token or not isinstance(token, str):
         return False
     
-    # Telegram tokens follow the format: digits:letters (e.g., 123456789:ABCdefGhIjKlmnopqr)
-    pattern = r'^\d+:[\w-]+$'
-    return bool(re.match(pattern, token))
+    return bool(_TG_TOKEN_RE.match(token))
+
+
+# Risk setting -> (label, inclusive upper bound or None, out-of-range message);
+# every value must also be > 0
+_RISK_RULES = (
+    ('scalp_profit_target', "Profit target", 0.1,  # Max 10% target
+     "Profit target must be between 0 and 0.1 (0% to 10%)"),
+    ('scalp_stop_loss', "Stop loss", 0.1,  # Max 10% stop
+     "Stop loss must be between 0 and 0.1 (0% to 10%)"),
+    ('max_position_size', "Max position size", None,
+     "Max position size must be positive"),
+    ('max_daily_loss', "Max daily loss", None,
+     "Max daily loss must be positive"),
+    ('risk_per_trade', "Risk per trade", 0.5,  # Max 50% risk
+     "Risk per trade must be between 0 and 0.5 (0% to 50%)"),
+)
 
 
 def validate_risk_parameters(settings: Dict[str, Any]) -> Dict[str, str]:
@@ -42,45 +60,14 @@ def validate_risk_parameters(settings: Dict[str, Any]) -> Dict[str, str]:
     """
     errors = {}
     
-    try:
-        # Profit target validation
-        profit_target = float(settings.get('scalp_profit_target', 0))
-        if profit_target <= 0 or profit_target > 0.1:  # Max 10% target
-            errors['scalp_profit_target'] = "Profit target must be between 0 and 0.1 (0% to 10%)"
-    except (ValueError, TypeError):
-        errors['scalp_profit_target'] = "Profit target must be a valid number"
-    
-    try:
-        # Stop loss validation
-        stop_loss = float(settings.get('scalp_stop_loss', 0))
-        if stop_loss <= 0 or stop_loss > 0.1:  # Max 10% stop
-            errors['scalp_stop_loss'] = "Stop loss must be between 0 and 0.1 (0% to 10%)"
-    except (ValueError, TypeError):
-        errors['scalp_stop_loss'] = "Stop loss must be a valid number"
-    
-    try:
-        # Position size validation
-        max_position_size = float(settings.get('max_position_size', 0))
-        if max_position_size <= 0:
-            errors['max_position_size'] = "Max position size must be positive"
-    except (ValueError, TypeError):
-        errors['max_position_size'] = "Max position size must be a valid number"
-    
-    try:
-        # Daily loss validation
-        max_daily_loss = float(settings.get('max_daily_loss', 0))
-        if max_daily_loss <= 0:
-            errors['max_daily_loss'] = "Max daily loss must be positive"
-    except (ValueError, TypeError):
-        errors['max_daily_loss'] = "Max daily loss must be a valid number"
-    
-    try:
-        # Risk per trade validation
-        risk_per_trade = float(settings.get('risk_per_trade', 0))
-        if risk_per_trade <= 0 or risk_per_trade > 0.5:  # Max 50% risk
-            errors['risk_per_trade'] = "Risk per trade must be between 0 and 0.5 (0% to 50%)"
-    except (ValueError, TypeError):
-        errors['risk_per_trade'] = "Risk per trade must be a valid number"
+    for key, label, upper, range_msg in _RISK_RULES:
+        try:
+            value = float(settings.get(key, 0))
+        except (ValueError, TypeError):
+            errors[key] = f"{label} must be a valid number"
+            continue
+        if value <= 0 or (upper is not None and value > upper):
+            errors[key] = range_msg
     
     return errors
 
@@ -96,7 +83,7 @@ def validate_trade_parameters(symbol: str, side: str, quantity: float, price: fl
     # Symbol validation
     if not isinstance(symbol, str) or len(symbol) < 6:
         errors['symbol'] = "Invalid symbol format"
-    elif not re.match(r'^[A-Z]+[A-Z]+$', symbol):
+    elif not _SYMBOL_RE.match(symbol):
         errors['symbol'] = "Symbol must be in format like BTCUSDT"
     
     # Side validation
@@ -3,11 +3,26 @@ Web Control Interface for MXC Scalp Bot
 
 Provides a web-based interface to control the trading bot alongside the Telegram bot
 """
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for
+import json
 import threading
 import logging
+import time
 import os
 
+try:
+    # Optional: faster JSON encoding of polled status
+    import orjson
+    _json_dumps = orjson.dumps
+except ImportError:
+    _json_dumps = json.dumps
+
+try:
+    # Optional: production WSGI server with a bounded worker thread pool
+    from waitress import serve
+except ImportError:
+    serve = None
+
 from src.config.settings import Settings
 from src.exchange.api_client import MXCClient
 from src.strategies.scalping_strategy import ScalpingStrategy
@@ -16,6 +31,7 @@ from src.strategies.futures_strategy import FuturesStrategy
 from src.telegram_bot.bot_handler import TelegramBot
 from src.monitoring.metrics import MetricsManager
 from src.risk_management.risk_calculator import RiskManager
+from src.utils.helpers import parse_trading_pairs
 
 
 class WebController:
@@ -23,31 +39,47 @@ class WebController:
     Web controller that manages the web interface for the trading bot
     """
     
+    # Seconds a computed status / risk params dict is reused by polling pages
+    STATUS_CACHE_TTL = 0.5
+    
+    # Worker threads when served by waitress
+    SERVER_THREADS = 8
+    
     def __init__(self, bot_manager):
         self.bot_manager = bot_manager
-        self.app = Flask(__name__)
+        template_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'templates'))
+        self.app = Flask(__name__, template_folder=template_dir)
+        # (monotonic time, value) of the last get_status / get_risk_params
+        self._status_cache = None
+        self._risk_params_cache = None
+        # (status dict, encoded JSON) so polls within the TTL reuse the bytes
+        self._status_body = None
         self.setup_routes()
         
     def setup_routes(self):
         """Setup web routes for the control interface."""
+        # Resolved once; render_template still applies Flask's context
+        dashboard = self.app.jinja_env.get_template('dashboard.html')
         
         @self.app.route('/')
         def index():
             """Main dashboard page."""
-            return render_template('dashboard.html', 
+            return render_template(dashboard,
                                  status=self.get_status(),
-                                 risk_params=self.get_risk_params())
+                                 risk_params=self.get_risk_params(),
+                                 credentials=self.get_credentials_status())
         
         @self.app.route('/status')
         def status():
             """Get bot status."""
-            return jsonify(self.get_status())
+            return Response(self.get_status_json(), mimetype='application/json')
         
         @self.app.route('/start_scalp', methods=['POST'])
         def start_scalp():
             """Start scalping strategy."""
             if self.bot_manager.scalping_strategy:
                 self.bot_manager.scalping_strategy.start()
+                self.invalidate_cache()
                 return jsonify({'status': 'success', 'message': 'Scalping strategy started'})
             return jsonify({'status': 'error', 'message': 'Strategy not available'})
         
@@ -56,6 +88,7 @@ class WebController:
             """Stop scalping strategy."""
             if self.bot_manager.scalping_strategy:
                 self.bot_manager.scalping_strategy.stop()
+                self.invalidate_cache()
                 return jsonify({'status': 'success', 'message': 'Scalping strategy stopped'})
             return jsonify({'status': 'error', 'message': 'Strategy not available'})
         
@@ -64,6 +97,7 @@ class WebController:
             """Start range scalping strategy."""
             if self.bot_manager.range_scalp_strategy:
                 self.bot_manager.range_scalp_strategy.start()
+                self.invalidate_cache()
                 return jsonify({'status': 'success', 'message': 'Range scalping strategy started'})
             return jsonify({'status': 'error', 'message': 'Strategy not available'})
         
@@ -72,6 +106,7 @@ class WebController:
             """Stop range scalping strategy."""
             if self.bot_manager.range_scalp_strategy:
                 self.bot_manager.range_scalp_strategy.stop()
+                self.invalidate_cache()
                 return jsonify({'status': 'success', 'message': 'Range scalping strategy stopped'})
             return jsonify({'status': 'error', 'message': 'Strategy not available'})
         
@@ -80,6 +115,7 @@ class WebController:
             """Start futures strategy."""
             if self.bot_manager.futures_strategy:
                 self.bot_manager.futures_strategy.start()
+                self.invalidate_cache()
                 return jsonify({'status': 'success', 'message': 'Futures strategy started'})
             return jsonify({'status': 'error', 'message': 'Strategy not available'})
         
@@ -88,14 +124,15 @@ class WebController:
             """Stop futures strategy."""
             if self.bot_manager.futures_strategy:
                 self.bot_manager.futures_strategy.stop()
+                self.invalidate_cache()
                 return jsonify({'status': 'success', 'message': 'Futures strategy stopped'})
             return jsonify({'status': 'error', 'message': 'Strategy not available'})
         
         @self.app.route('/set_pairs', methods=['POST'])
         def set_pairs():
             """Set trading pairs."""
-            pairs_str = request.form.get('pairs', '')
-            pairs = [pair.strip().upper() for pair in pairs_str.split(',') if pair.strip()]
+            pairs, invalid = parse_trading_pairs(request.form.get('pairs', ''))
+            rejected = f' (invalid pairs ignored: {", ".join(invalid)})' if invalid else ''
             
             if pairs:
                 if self.bot_manager.scalping_strategy:
@@ -104,9 +141,12 @@ class WebController:
                     self.bot_manager.range_scalp_strategy.trading_pairs = pairs
                 if self.bot_manager.futures_strategy:
                     self.bot_manager.futures_strategy.set_trading_pairs(pairs)
+                self.invalidate_cache()
                 
-                return jsonify({'status': 'success', 'message': f'Trading pairs updated: {", ".join(pairs)}'})
-            return jsonify({'status': 'error', 'message': 'No valid pairs provided'})
+                return jsonify({'status': 'success', 'invalid_pairs': invalid,
+                                'message': f'Trading pairs updated: {", ".join(pairs)}{rejected}'})
+            return jsonify({'status': 'error', 'invalid_pairs': invalid,
+                            'message': f'No valid pairs provided{rejected}'})
         
         @self.app.route('/set_risk', methods=['POST'])
         def set_risk():
@@ -158,6 +198,8 @@ class WebController:
                 except ValueError:
                     pass
             
+            self.bot_manager.scalping_strategy.refresh_settings()
+            self.invalidate_cache()
             return jsonify({'status': 'success', 'message': f'{updates} risk parameters updated'})
         
         @self.app.route('/set_size', methods=['POST'])
@@ -170,6 +212,7 @@ class WebController:
                     if size > 0:
                         if self.bot_manager.scalping_strategy:
                             self.bot_manager.scalping_strategy.settings.max_position_size = size
+                            self.invalidate_cache()
                         return jsonify({'status': 'success', 'message': f'Position size set to {size}'})
                 except ValueError:
                     pass
@@ -183,8 +226,17 @@ class WebController:
                 return jsonify(stats)
             return jsonify({'error': 'Metrics not available'})
     
+    def invalidate_cache(self):
+        """Drop cached status and risk params after a change."""
+        self._status_cache = None
+        self._risk_params_cache = None
+    
     def get_status(self):
         """Get the current status of all components."""
+        cached = self._status_cache
+        if cached is not None and time.monotonic() - cached[0] < self.STATUS_CACHE_TTL:
+            return cached[1]
+        
         status = {
             'scalping_running': self.bot_manager.scalping_strategy.is_running if self.bot_manager.scalping_strategy else False,
             'range_running': self.bot_manager.range_scalp_strategy.is_running if self.bot_manager.range_scalp_strategy else False,
@@ -206,13 +258,26 @@ class WebController:
             if self.bot_manager.futures_strategy.is_running:
                 status['active_strategies'] += 1
         
+        self._status_cache = (time.monotonic(), status)
         return status
     
+    def get_status_json(self):
+        """get_status() encoded as JSON, re-encoded only when the status changes."""
+        status = self.get_status()
+        cached = self._status_body
+        if cached is None or cached[0] is not status:
+            cached = self._status_body = (status, _json_dumps(status))
+        return cached[1]
+    
     def get_risk_params(self):
         """Get current risk parameters."""
+        cached = self._risk_params_cache
+        if cached is not None and time.monotonic() - cached[0] < self.STATUS_CACHE_TTL:
+            return cached[1]
+        
         if self.bot_manager.scalping_strategy:
             settings = self.bot_manager.scalping_strategy.settings
-            return {
+            risk_params = {
                 'max_daily_loss': settings.max_daily_loss,
                 'risk_per_trade': settings.risk_per_trade,
                 'max_consecutive_losses': settings.max_consecutive_losses,
@@ -220,9 +285,29 @@ class WebController:
                 'stop_loss': settings.scalp_stop_loss,
                 'max_position_size': settings.max_position_size
             }
-        return {}
+        else:
+            risk_params = {}
+        
+        self._risk_params_cache = (time.monotonic(), risk_params)
+        return risk_params
+    
+    def get_credentials_status(self):
+        """Get current status of API credentials."""
+        settings = self.bot_manager.scalping_strategy.settings if self.bot_manager.scalping_strategy else None
+        return {
+            'api_key_set': bool(getattr(settings, 'api_key', '')),
+            'secret_key_set': bool(getattr(settings, 'secret_key', '')),
+            'bot_token_set': bool(getattr(settings, 'telegram_bot_token', '')),
+            'authorized_users_count': len(getattr(settings, 'telegram_authorized_users', []))
+        }
     
     def start(self, host='0.0.0.0', port=5000, debug=False):
         """Start the web server."""
         print(f"Starting web interface on {host}:{port}")
-        threading.Thread(target=lambda: self.app.run(host=host, port=port, debug=debug, use_reloader=False)).start()
\ No newline at end of file
+        if serve is not None and not debug:
+            target = lambda: serve(self.app, host=host, port=port, threads=self.SERVER_THREADS)
+        else:
+            # Werkzeug development server
+            target = lambda: self.app.run(host=host, port=port, debug=debug,
+                                          use_reloader=False, threaded=True)
+        threading.Thread(target=target).start()
\ No newline at end of file
@@ -6,13 +6,29 @@ Integrates web interface with the existing bot system
 import sys
 import os
 import asyncio
+import functools
 import logging
+import threading
+import time
 from concurrent.futures import TimeoutError as FuturesTimeout
 
 sys.path.insert(0, os.path.abspath('.'))
 
 from flask import Flask, render_template, request, jsonify
-from threading import Thread
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    # Optional: faster JSON encoding of exchange data responses
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: production WSGI server with a bounded worker thread pool
+    from waitress import serve
+except ImportError:
+    serve = None
+
 from src.config.settings import Settings
 from src.exchange.api_client import MXCClient
 from src.strategies.scalping_strategy import ScalpingStrategy
@@ -20,6 +36,43 @@ from src.strategies.range_scalp_strategy import RangeScalpStrategy
 from src.strategies.futures_strategy import FuturesStrategy
 from src.monitoring.metrics import MetricsManager
 from src.risk_management.risk_calculator import RiskManager
+from src.utils.helpers import install_uvloop, parse_trading_pairs
+
+_TEMPLATE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'templates'))
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes and decodes with orjson."""
+
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def _requires_client(action: str):
+    """
+    Serve a WebBotController view only when the exchange client and API
+    credentials are configured; failures are logged and returned as
+    {'error': 'Error <action>: ...'}.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(self, *args, **kwargs):
+            settings = self.settings
+            if not (self.mxc_client and settings and settings.api_key and settings.secret_key):
+                return jsonify({'error': 'Exchange client not available or credentials not set'})
+            try:
+                return view(self, *args, **kwargs)
+            except Exception as e:
+                self.logger.exception("Error %s: %s", action, e)
+                return jsonify({'error': f'Error {action}: {str(e)}'})
+        return wrapper
+    return decorator
 
 
 class WebBotController:
@@ -28,14 +81,36 @@ class WebBotController:
     Can work with existing components or initialize its own
     """
     
+    # Seconds exchange data (balance, orders, positions, trades) is reused by polling pages
+    EXCHANGE_CACHE_TTL = 2.0
+    
+    # Extra seconds a request waits for the loop to enforce a call's timeout itself
+    LOOP_TIMEOUT_GRACE = 1.0
+    
+    # Worker threads when served by waitress
+    SERVER_THREADS = 8
+    
+    # Loop used when no bot loop is running, see _get_background_loop
+    _background_loop = None
+    _background_loop_lock = threading.Lock()
+    
+    # /set_risk form field -> (settings attribute, type)
+    _RISK_FIELDS = {
+        'max_daily_loss': ('max_daily_loss', float),
+        'risk_per_trade': ('risk_per_trade', float),
+        'max_consecutive_losses': ('max_consecutive_losses', int),
+        'profit_target': ('scalp_profit_target', float),
+        'stop_loss': ('scalp_stop_loss', float),
+    }
+    
     def __init__(self, scalping_strategy=None, range_scalp_strategy=None,
                  futures_strategy=None, metrics_manager=None,
                  risk_manager=None, settings=None, mxc_client=None,
                  event_loop: asyncio.AbstractEventLoop = None):
         # Initialize Flask app
-        import os
-        template_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'templates'))
-        self.app = Flask(__name__, template_folder=template_dir)
+        self.app = Flask(__name__, template_folder=_TEMPLATE_DIR)
+        if orjson is not None:
+            self.app.json = OrjsonProvider(self.app)
         self.setup_routes()
         
         # Accept existing components or initialize our own
@@ -48,470 +123,479 @@ class WebBotController:
         self.mxc_client = mxc_client
         self.event_loop = event_loop
         self.logger = logging.getLogger(__name__)
+        # key -> (monotonic time, value) of recent exchange reads
+        self._exchange_cache = {}
+        self._exchange_cache_lock = threading.Lock()
+        # Bumped by clear_exchange_cache so reads begun before it are not stored
+        self._exchange_cache_gen = 0
+        # (settings, status) of the last get_credentials_status, reset by /set_credentials
+        self._credentials_status = None
+        # key -> future of an exchange call other requests can wait on
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
 
     def set_event_loop(self, loop: asyncio.AbstractEventLoop):
         """Assign the main bot asyncio loop for coroutines."""
         self.event_loop = loop
 
-    def _run_async_task(self, coro, timeout: float = 15.0):
-        """Run MXC client coroutine on the main loop or a temporary loop."""
+    def _run_async_task(self, coro, timeout: float = 15.0, key=None):
+        """Run MXC client coroutine on the main loop or a shared background loop.
+
+        The call is cancelled on the loop once timeout expires. Calls sharing
+        a key while one is still in flight wait for that call's result instead
+        of starting their own.
+        """
         if coro is None:
             return None
 
         loop = self.event_loop
+        if not (loop and loop.is_running()):
+            # Standalone usage: one long-lived loop keeps the client's session usable
+            loop = self._get_background_loop()
         try:
-            if loop and loop.is_running():
-                future = asyncio.run_coroutine_threadsafe(coro, loop)
-                return future.result(timeout=timeout)
-            # Fallback for standalone usage
-            return asyncio.run(coro)
+            if key is None:
+                future = asyncio.run_coroutine_threadsafe(asyncio.wait_for(coro, timeout), loop)
+            else:
+                future = self._join_inflight(key, coro, loop, timeout)
+            try:
+                return future.result(timeout=timeout + self.LOOP_TIMEOUT_GRACE)
+            except FuturesTimeout:
+                future.cancel()
+                raise
         except FuturesTimeout:
             raise TimeoutError("Timed out waiting for exchange response")
-        except RuntimeError as exc:
-            # If loop reference is invalid, fallback to running in a fresh loop
-            return asyncio.run(coro)
 
+    @classmethod
+    def _get_background_loop(cls) -> asyncio.AbstractEventLoop:
+        """Event loop on a daemon thread, started on first use and shared by all controllers."""
+        with cls._background_loop_lock:
+            if cls._background_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='web-exchange-loop', daemon=True).start()
+                cls._background_loop = loop
+            return cls._background_loop
+
+    def _join_inflight(self, key, coro, loop, timeout: float):
+        """Future of the in-flight call for key, scheduling coro if there is none."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                coro.close()
+                return future
+            future = self._inflight[key] = asyncio.run_coroutine_threadsafe(
+                asyncio.wait_for(coro, timeout), loop
+            )
+
+        def forget(done):
+            with self._inflight_lock:
+                if self._inflight.get(key) is done:
+                    del self._inflight[key]
+        future.add_done_callback(forget)
+        return future
+
+    def _cached(self, key, make_coro, ttl: float = None):
+        """Return a recent value for key, or run make_coro() on the loop and remember it."""
+        ttl = self.EXCHANGE_CACHE_TTL if ttl is None else ttl
+        with self._exchange_cache_lock:
+            hit = self._exchange_cache.get(key)
+            gen = self._exchange_cache_gen
+        if hit is not None and time.monotonic() - hit[0] < ttl:
+            return hit[1]
+        value = self._run_async_task(make_coro(), key=key)
+        with self._exchange_cache_lock:
+            if gen == self._exchange_cache_gen:
+                self._exchange_cache[key] = (time.monotonic(), value)
+        return value
+
+    def clear_exchange_cache(self):
+        """Forget cached exchange reads, e.g. after the credentials change."""
+        with self._exchange_cache_lock:
+            self._exchange_cache.clear()
+            self._exchange_cache_gen += 1
+
+    async def _check_credentials(self):
+        """Reach the public time endpoint and fetch account info concurrently.
+
+        Both calls run inside one coroutine so a credential test costs a single
+        hop onto the bot loop, and the two round-trips overlap on it.
+        """
+        server_time, account = await asyncio.gather(
+            # Public endpoint - no auth required
+            self.mxc_client._make_request('GET', '/api/v3/time', signed=False),
+            # Requires valid credentials
+            self.mxc_client.get_account_info(),
+            return_exceptions=True
+        )
+        if isinstance(server_time, Exception):
+            raise ConnectionError(str(server_time)) from server_time
+        if isinstance(account, Exception):
+            raise account
+        return account
     
     def setup_routes(self):
         """Setup Flask routes."""
-        @self.app.route('/')
-        def index():
-            return render_template('dashboard.html', 
-                                 status=self.get_status(),
-                                 risk_params=self.get_risk_parameters(),
-                                 credentials=self.get_credentials_status())
-        
-        @self.app.route('/status')
-        def status():
-            return jsonify(self.get_status())
-        
-        @self.app.route('/start_scalp', methods=['POST'])
-        def start_scalp():
-            if self.scalping_strategy:
-                try:
-                    self.scalping_strategy.start()
-                    return jsonify({'status': 'success', 'message': 'Scalping strategy started'})
-                except Exception as e:
-                    return jsonify({'status': 'error', 'message': f'Error starting scalping strategy: {str(e)}'})
-            return jsonify({'status': 'error', 'message': 'Scalping strategy not available'})
-        
-        @self.app.route('/stop_scalp', methods=['POST'])
-        def stop_scalp():
-            if self.scalping_strategy:
-                try:
-                    self.scalping_strategy.stop()
-                    return jsonify({'status': 'success', 'message': 'Scalping strategy stopped'})
-                except Exception as e:
-                    return jsonify({'status': 'error', 'message': f'Error stopping scalping strategy: {str(e)}'})
-            return jsonify({'status': 'error', 'message': 'Scalping strategy not available'})
+        # Loaded and compiled once; render_template still applies Flask's context
+        self._dashboard_template = self.app.jinja_env.get_template('dashboard.html')
         
-        @self.app.route('/start_range', methods=['POST'])
-        def start_range():
-            if self.range_scalp_strategy:
-                try:
-                    self.range_scalp_strategy.start()
-                    return jsonify({'status': 'success', 'message': 'Range scalping strategy started'})
-                except Exception as e:
-                    return jsonify({'status': 'error', 'message': f'Error starting range strategy: {str(e)}'})
-            return jsonify({'status': 'error', 'message': 'Range scalping strategy not available'})
-        
-        @self.app.route('/stop_range', methods=['POST'])
-        def stop_range():
-            if self.range_scalp_strategy:
-                try:
-                    self.range_scalp_strategy.stop()
-                    return jsonify({'status': 'success', 'message': 'Range scalping strategy stopped'})
-                except Exception as e:
-                    return jsonify({'status': 'error', 'message': f'Error stopping range strategy: {str(e)}'})
-            return jsonify({'status': 'error', 'message': 'Range scalping strategy not available'})
-        
-        @self.app.route('/start_futures', methods=['POST'])
-        def start_futures():
-            if self.futures_strategy:
-                try:
-                    self.futures_strategy.start()
-                    return jsonify({'status': 'success', 'message': 'Futures strategy started'})
-                except Exception as e:
-                    return jsonify({'status': 'error', 'message': f'Error starting futures strategy: {str(e)}'})
-            return jsonify({'status': 'error', 'message': 'Futures strategy not available'})
-        
-        @self.app.route('/stop_futures', methods=['POST'])
-        def stop_futures():
-            if self.futures_strategy:
-                try:
-                    self.futures_strategy.stop()
-                    return jsonify({'status': 'success', 'message': 'Futures strategy stopped'})
-                except Exception as e:
-                    return jsonify({'status': 'error', 'message': f'Error stopping futures strategy: {str(e)}'})
-            return jsonify({'status': 'error', 'message': 'Futures strategy not available'})
-        
-        @self.app.route('/set_pairs', methods=['POST'])
-        def set_pairs():
-            pairs_str = request.form.get('pairs', '')
-            if pairs_str:
-                try:
-                    pairs = [pair.strip().upper() for pair in pairs_str.split(',') if pair.strip()]
-                    if pairs:
-                        success_count = 0
-                        if self.scalping_strategy:
-                            self.scalping_strategy.trading_pairs = pairs
-                            success_count += 1
-                        if self.range_scalp_strategy:
-                            self.range_scalp_strategy.trading_pairs = pairs
-                            success_count += 1
-                        if self.futures_strategy:
-                            self.futures_strategy.set_trading_pairs(pairs)
-                            success_count += 1
-                            
-                        return jsonify({'status': 'success', 'message': f'Trading pairs updated to: {", ".join(pairs)} ({success_count} strategies updated)'})
-                except Exception as e:
-                    return jsonify({'status': 'error', 'message': f'Error setting pairs: {str(e)}'})
-            return jsonify({'status': 'error', 'message': 'No valid pairs provided'})
-        
-        @self.app.route('/set_risk', methods=['POST'])
-        def set_risk():
-            if not self.settings:
-                return jsonify({'status': 'error', 'message': 'Settings not available'})
-            
+        self.app.add_url_rule('/', 'index', self._index)
+        self.app.add_url_rule('/status', 'status', self._status)
+        self.app.add_url_rule('/start_scalp', 'start_scalp', self._start_scalp, methods=['POST'])
+        self.app.add_url_rule('/stop_scalp', 'stop_scalp', self._stop_scalp, methods=['POST'])
+        self.app.add_url_rule('/start_range', 'start_range', self._start_range, methods=['POST'])
+        self.app.add_url_rule('/stop_range', 'stop_range', self._stop_range, methods=['POST'])
+        self.app.add_url_rule('/start_futures', 'start_futures', self._start_futures, methods=['POST'])
+        self.app.add_url_rule('/stop_futures', 'stop_futures', self._stop_futures, methods=['POST'])
+        self.app.add_url_rule('/set_pairs', 'set_pairs', self._set_pairs, methods=['POST'])
+        self.app.add_url_rule('/set_risk', 'set_risk', self._set_risk, methods=['POST'])
+        self.app.add_url_rule('/set_size', 'set_size', self._set_size, methods=['POST'])
+        self.app.add_url_rule('/metrics', 'metrics', self._metrics)
+        self.app.add_url_rule('/set_credentials', 'set_credentials', self._set_credentials, methods=['POST'])
+        self.app.add_url_rule('/test_credentials', 'test_credentials', self._test_credentials, methods=['POST'])
+        # Exchange data endpoints, gated on a configured client by _requires_client
+        self.app.add_url_rule('/balance_data', 'get_balance', self._balance_data)
+        self.app.add_url_rule('/open_orders_data', 'get_open_orders', self._open_orders_data)
+        self.app.add_url_rule('/positions_data', 'get_positions', self._positions_data)
+        self.app.add_url_rule('/trades_data', 'get_trades', self._trades_data)
+    
+    def _index(self):
+        """Main dashboard page."""
+        return render_template(self._dashboard_template,
+                             status=self.get_status(),
+                             risk_params=self.get_risk_parameters(),
+                             credentials=self.get_credentials_status())
+    
+    def _status(self):
+        """Get bot status."""
+        return jsonify(self.get_status())
+    
+    def _start_scalp(self):
+        """Start scalping strategy."""
+        if self.scalping_strategy:
             try:
-                updates = 0
-                # Handle different risk parameters
-                for param_name, value in request.form.items():
-                    if param_name == 'max_daily_loss' and value:
-                        try:
-                            self.settings.max_daily_loss = float(value)
-                            updates += 1
-                        except ValueError:
-                            pass
-                    elif param_name == 'risk_per_trade' and value:
-                        try:
-                            self.settings.risk_per_trade = float(value)
-                            updates += 1
-                        except ValueError:
-                            pass
-                    elif param_name == 'max_consecutive_losses' and value:
-                        try:
-                            self.settings.max_consecutive_losses = int(value)
-                            updates += 1
-                        except ValueError:
-                            pass
-                    elif param_name == 'profit_target' and value:
-                        try:
-                            self.settings.scalp_profit_target = float(value)
-                            updates += 1
-                        except ValueError:
-                            pass
-                    elif param_name == 'stop_loss' and value:
-                        try:
-                            self.settings.scalp_stop_loss = float(value)
-                            updates += 1
-                        except ValueError:
-                            pass
-                
-                return jsonify({'status': 'success', 'message': f'{updates} risk parameters updated'})
+                self.scalping_strategy.start()
+                return jsonify({'status': 'success', 'message': 'Scalping strategy started'})
             except Exception as e:
-                return jsonify({'status': 'error', 'message': f'Error setting risk: {str(e)}'})
-        
-        @self.app.route('/set_size', methods=['POST'])
-        def set_size():
-            size_str = request.form.get('size', '')
-            if size_str:
+                return jsonify({'status': 'error', 'message': f'Error starting scalping strategy: {str(e)}'})
+        return jsonify({'status': 'error', 'message': 'Scalping strategy not available'})
+    
+    def _stop_scalp(self):
+        """Stop scalping strategy."""
+        if self.scalping_strategy:
+            try:
+                self.scalping_strategy.stop()
+                return jsonify({'status': 'success', 'message': 'Scalping strategy stopped'})
+            except Exception as e:
+                return jsonify({'status': 'error', 'message': f'Error stopping scalping strategy: {str(e)}'})
+        return jsonify({'status': 'error', 'message': 'Scalping strategy not available'})
+    
+    def _start_range(self):
+        """Start range scalping strategy."""
+        if self.range_scalp_strategy:
+            try:
+                self.range_scalp_strategy.start()
+                return jsonify({'status': 'success', 'message': 'Range scalping strategy started'})
+            except Exception as e:
+                return jsonify({'status': 'error', 'message': f'Error starting range strategy: {str(e)}'})
+        return jsonify({'status': 'error', 'message': 'Range scalping strategy not available'})
+    
+    def _stop_range(self):
+        """Stop range scalping strategy."""
+        if self.range_scalp_strategy:
+            try:
+                self.range_scalp_strategy.stop()
+                return jsonify({'status': 'success', 'message': 'Range scalping strategy stopped'})
+            except Exception as e:
+                return jsonify({'status': 'error', 'message': f'Error stopping range strategy: {str(e)}'})
+        return jsonify({'status': 'error', 'message': 'Range scalping strategy not available'})
+    
+    def _start_futures(self):
+        """Start futures strategy."""
+        if self.futures_strategy:
+            try:
+                self.futures_strategy.start()
+                return jsonify({'status': 'success', 'message': 'Futures strategy started'})
+            except Exception as e:
+                return jsonify({'status': 'error', 'message': f'Error starting futures strategy: {str(e)}'})
+        return jsonify({'status': 'error', 'message': 'Futures strategy not available'})
+    
+    def _stop_futures(self):
+        """Stop futures strategy."""
+        if self.futures_strategy:
+            try:
+                self.futures_strategy.stop()
+                return jsonify({'status': 'success', 'message': 'Futures strategy stopped'})
+            except Exception as e:
+                return jsonify({'status': 'error', 'message': f'Error stopping futures strategy: {str(e)}'})
+        return jsonify({'status': 'error', 'message': 'Futures strategy not available'})
+    
+    def _set_pairs(self):
+        """Set trading pairs for all strategies."""
+        pairs_str = request.form.get('pairs', '')
+        if pairs_str:
+            try:
+                pairs, invalid = parse_trading_pairs(pairs_str)
+                rejected = f'; invalid pairs ignored: {", ".join(invalid)}' if invalid else ''
+                if pairs:
+                    success_count = 0
+                    for strategy in (self.scalping_strategy, self.range_scalp_strategy):
+                        if strategy:
+                            strategy.trading_pairs = pairs
+                            success_count += 1
+                    if self.futures_strategy:
+                        self.futures_strategy.set_trading_pairs(pairs)
+                        success_count += 1
+
+                    return jsonify({'status': 'success', 'invalid_pairs': invalid,
+                                    'message': f'Trading pairs updated to: {", ".join(pairs)} ({success_count} strategies updated){rejected}'})
+                return jsonify({'status': 'error', 'invalid_pairs': invalid,
+                                'message': f'No valid pairs provided{rejected}'})
+            except Exception as e:
+                return jsonify({'status': 'error', 'message': f'Error setting pairs: {str(e)}'})
+        return jsonify({'status': 'error', 'message': 'No valid pairs provided'})
+    
+    def _set_risk(self):
+        """Set risk parameters."""
+        if not self.settings:
+            return jsonify({'status': 'error', 'message': 'Settings not available'})
+
+        try:
+            updates = 0
+            # Handle different risk parameters
+            for param_name, value in request.form.items():
+                field = self._RISK_FIELDS.get(param_name)
+                if field is None or not value:
+                    continue
+                attr, cast = field
                 try:
-                    size = float(size_str)
-                    if size > 0:
-                        if self.settings:  # Use the settings object
-                            self.settings.max_position_size = size
-                        elif self.scalping_strategy and self.scalping_strategy.settings:
-                            self.scalping_strategy.settings.max_position_size = size
-                        return jsonify({'status': 'success', 'message': f'Max position size set to {size}'})
-                    else:
-                        return jsonify({'status': 'error', 'message': 'Position size must be positive'})
+                    setattr(self.settings, attr, cast(value))
+                    updates += 1
                 except ValueError:
-                    return jsonify({'status': 'error', 'message': 'Invalid position size'})
-            return jsonify({'status': 'error', 'message': 'No position size provided'})
-        
-        @self.app.route('/metrics')
-        def metrics():
-            if self.metrics_manager:
-                try:
-                    stats = self.metrics_manager.get_statistics()
-                    return jsonify(stats)
-                except Exception as e:
-                    return jsonify({'error': f'Error retrieving metrics: {str(e)}'})
-            return jsonify({'error': 'Metrics manager not available'})
-        
-        @self.app.route('/set_credentials', methods=['POST'])
-        def set_credentials():
-            """Set API credentials."""
+                    pass
+
+            if self.scalping_strategy:
+                self.scalping_strategy.refresh_settings()
+            return jsonify({'status': 'success', 'message': f'{updates} risk parameters updated'})
+        except Exception as e:
+            return jsonify({'status': 'error', 'message': f'Error setting risk: {str(e)}'})
+    
+    def _set_size(self):
+        """Set max position size."""
+        size_str = request.form.get('size', '')
+        if size_str:
             try:
-                # Get form values
-                api_key = request.form.get('api_key', '').strip()
-                secret_key = request.form.get('secret_key', '').strip()
-                bot_token = request.form.get('bot_token', '').strip()
-                telegram_users = request.form.get('telegram_users', '').strip()
-                
-                # Update settings if values provided
-                if api_key and self.settings:
-                    self.settings.api_key = api_key
-                    os.environ['MXC_API_KEY'] = api_key  # Also update environment
-                    
-                if secret_key and self.settings:
-                    self.settings.secret_key = secret_key
-                    os.environ['MXC_SECRET_KEY'] = secret_key  # Also update environment
-
-                    
-                if bot_token and self.settings:
-                    self.settings.telegram_bot_token = bot_token
-                    os.environ['TELEGRAM_BOT_TOKEN'] = bot_token  # Also update environment
-                    
-                if telegram_users and self.settings:
-                    # Parse comma-separated user IDs
-                    user_ids = [int(uid.strip()) for uid in telegram_users.split(',') if uid.strip()]
-                    self.settings.telegram_authorized_users = user_ids
-                    os.environ['TELEGRAM_AUTHORIZED_USERS'] = ','.join(map(str, user_ids))  # Also update environment
-
-                # Update MXC client credentials immediately so exchange data works without restart
-                if self.mxc_client and (api_key or secret_key):
-                    try:
-                        self._run_async_task(
-                            self.mxc_client.update_credentials(
-                                api_key=api_key or None,
-                                secret_key=secret_key or None
-                            )
-                        )
-                        self.logger.info(
-                            "Updated MXC client credentials via web UI (api_key_set=%s, secret_key_set=%s)",
-                            bool(api_key), bool(secret_key)
-                        )
-                    except Exception as e:
-                        return jsonify({'status': 'error', 'message': f'Error updating MXC client: {str(e)}'})
-                
-                self.logger.info(
-                    "Credential update request processed (api_key=%s, secret_key=%s, bot_token=%s, users=%s)",
-                    bool(api_key), bool(secret_key), bool(bot_token), bool(telegram_users)
-                )
-                return jsonify({'status': 'success', 'message': 'API credentials updated successfully'})
-                
-            except ValueError as e:
-                return jsonify({'status': 'error', 'message': f'Invalid user ID format: {str(e)}'})
-            except Exception as e:
-                return jsonify({'status': 'error', 'message': f'Error setting credentials: {str(e)}'})
-        
-        @self.app.route('/test_credentials', methods=['POST'])
-        def test_credentials():
-            """Test API credentials by making a simple request."""
+                size = float(size_str)
+                if size > 0:
+                    if self.settings:  # Use the settings object
+                        self.settings.max_position_size = size
+                    elif self.scalping_strategy and self.scalping_strategy.settings:
+                        self.scalping_strategy.settings.max_position_size = size
+                    return jsonify({'status': 'success', 'message': f'Max position size set to {size}'})
+                else:
+                    return jsonify({'status': 'error', 'message': 'Position size must be positive'})
+            except ValueError:
+                return jsonify({'status': 'error', 'message': 'Invalid position size'})
+        return jsonify({'status': 'error', 'message': 'No position size provided'})
+    
+    def _metrics(self):
+        """Get trading metrics."""
+        if self.metrics_manager:
             try:
-                if not self.mxc_client or not self.settings:
-                    return jsonify({'status': 'error', 'message': 'MXC client not available'})
-                
-                if not self.settings.api_key or not self.settings.secret_key:
-                    return jsonify({'status': 'error', 'message': 'API credentials not configured'})
-                
-                self.logger.info("Testing API credentials...")
-                
-                # Test 1: Get server time (public endpoint - no auth required)
+                stats = self.metrics_manager.get_statistics()
+                return jsonify(stats)
+            except Exception as e:
+                return jsonify({'error': f'Error retrieving metrics: {str(e)}'})
+        return jsonify({'error': 'Metrics manager not available'})
+    
+    def _set_credentials(self):
+        """Set API credentials."""
+        try:
+            # Get form values
+            api_key = request.form.get('api_key', '').strip()
+            secret_key = request.form.get('secret_key', '').strip()
+            bot_token = request.form.get('bot_token', '').strip()
+            telegram_users = request.form.get('telegram_users', '').strip()
+
+            # Validate user IDs before touching anything
+            user_parts = [uid.strip() for uid in telegram_users.split(',')]
+            user_parts = [uid for uid in user_parts if uid]
+            user_ids = [int(uid) for uid in user_parts]
+
+            # Provided fields, applied to settings and mirrored to the environment together
+            settings_updates = {}
+            env_updates = {}
+            if api_key:
+                settings_updates['api_key'] = env_updates['MXC_API_KEY'] = api_key
+            if secret_key:
+                settings_updates['secret_key'] = env_updates['MXC_SECRET_KEY'] = secret_key
+            if bot_token:
+                settings_updates['telegram_bot_token'] = env_updates['TELEGRAM_BOT_TOKEN'] = bot_token
+            if telegram_users:
+                settings_updates['telegram_authorized_users'] = user_ids
+                env_updates['TELEGRAM_AUTHORIZED_USERS'] = ','.join(user_parts)
+
+            if settings_updates and self.settings:
+                for attr, value in settings_updates.items():
+                    setattr(self.settings, attr, value)
+                os.environ.update(env_updates)
+                self._credentials_status = None
+
+            # Update MXC client credentials immediately so exchange data works without restart
+            if self.mxc_client and (api_key or secret_key):
                 try:
-                    server_time_result = self._run_async_task(
-                        self.mxc_client._make_request('GET', '/api/v3/time', signed=False)
+                    self._run_async_task(
+                        self.mxc_client.update_credentials(
+                            api_key=api_key or None,
+                            secret_key=secret_key or None
+                        )
                     )
-                    server_time_ok = 'serverTime' in server_time_result
-                except Exception as e:
-                    return jsonify({
-                        'status': 'error',
-                        'message': f'Failed to connect to MXC API: {str(e)}',
-                        'details': 'Cannot reach MXC servers. Check your internet connection.'
-                    })
-                
-                # Test 2: Get account info (requires valid credentials)
-                try:
-                    account_result = self._run_async_task(
-                        self.mxc_client.get_account_info()
+                    # Cached exchange data belongs to the previous account; clear it
+                    # only now so a poll during the update cannot refill it
+                    self.clear_exchange_cache()
+                    self.logger.info(
+                        "Updated MXC client credentials via web UI (api_key_set=%s, secret_key_set=%s)",
+                        bool(api_key), bool(secret_key)
                     )
-                    
-                    if 'code' in account_result:
-                        # Error response from API
-                        error_code = account_result.get('code')
-                        error_msg = account_result.get('msg', 'Unknown error')
-                        
-                        if error_code == 700002:
-                            return jsonify({
-                                'status': 'error',
-                                'message': 'Invalid API signature',
-                                'details': 'Your API credentials appear to be incorrect. Please verify:\n1. API Key is correct\n2. Secret Key is correct\n3. No extra spaces or characters\n4. API key has proper permissions (Spot Trading enabled)'
-                            })
-                        elif error_code == 700001:
-                            return jsonify({
-                                'status': 'error',
-                                'message': 'Invalid API key',
-                                'details': 'The API key is not recognized. Please check if it\'s correct and not deleted.'
-                            })
-                        else:
-                            return jsonify({
-                                'status': 'error',
-                                'message': f'API Error {error_code}: {error_msg}',
-                                'details': 'Check MXC API documentation for this error code.'
-                            })
-                    
-                    # Success!
-                    if 'balances' in account_result:
-                        balance_count = len([b for b in account_result['balances'] 
-                                           if float(b.get('free', 0)) + float(b.get('locked', 0)) > 0])
+                except Exception as e:
+                    return jsonify({'status': 'error', 'message': f'Error updating MXC client: {str(e)}'})
+
+            self.logger.info(
+                "Credential update request processed (api_key=%s, secret_key=%s, bot_token=%s, users=%s)",
+                bool(api_key), bool(secret_key), bool(bot_token), bool(telegram_users)
+            )
+            return jsonify({'status': 'success', 'message': 'API credentials updated successfully'})
+
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': f'Invalid user ID format: {str(e)}'})
+        except Exception as e:
+            return jsonify({'status': 'error', 'message': f'Error setting credentials: {str(e)}'})
+    
+    def _test_credentials(self):
+        """Test API credentials by making a simple request."""
+        try:
+            if not self.mxc_client or not self.settings:
+                return jsonify({'status': 'error', 'message': 'MXC client not available'})
+
+            if not self.settings.api_key or not self.settings.secret_key:
+                return jsonify({'status': 'error', 'message': 'API credentials not configured'})
+
+            self.logger.info("Testing API credentials...")
+
+            # Server time then account info, awaited together on the bot loop
+            try:
+                account_result = self._run_async_task(self._check_credentials())
+            except ConnectionError as e:
+                return jsonify({
+                    'status': 'error',
+                    'message': f'Failed to connect to MXC API: {str(e)}',
+                    'details': 'Cannot reach MXC servers. Check your internet connection.'
+                })
+            except Exception as e:
+                return jsonify({
+                    'status': 'error',
+                    'message': f'Error testing credentials: {str(e)}',
+                    'details': 'An unexpected error occurred during testing.'
+                })
+
+            try:
+                if 'code' in account_result:
+                    # Error response from API
+                    error_code = account_result.get('code')
+                    error_msg = account_result.get('msg', 'Unknown error')
+
+                    if error_code == 700002:
+                        return jsonify({
+                            'status': 'error',
+                            'message': 'Invalid API signature',
+                            'details': 'Your API credentials appear to be incorrect. Please verify:\n1. API Key is correct\n2. Secret Key is correct\n3. No extra spaces or characters\n4. API key has proper permissions (Spot Trading enabled)'
+                        })
+                    elif error_code == 700001:
                         return jsonify({
-                            'status': 'success',
-                            'message': '✅ API credentials are valid!',
-                            'details': f'Successfully connected to your MXC account. Found {balance_count} assets with balance.'
+                            'status': 'error',
+                            'message': 'Invalid API key',
+                            'details': 'The API key is not recognized. Please check if it\'s correct and not deleted.'
                         })
                     else:
                         return jsonify({
-                            'status': 'warning',
-                            'message': 'Connected but unexpected response',
-                            'details': 'API responded but format was unexpected. Credentials might be valid.'
+                            'status': 'error',
+                            'message': f'API Error {error_code}: {error_msg}',
+                            'details': 'Check MXC API documentation for this error code.'
                         })
-                        
-                except Exception as e:
+
+                # Success!
+                if 'balances' in account_result:
+                    # Stream the count; 'locked' is only parsed when nothing is free
+                    balance_count = sum(
+                        1 for b in account_result['balances']
+                        if float(b.get('free') or 0) > 0 or float(b.get('locked') or 0) > 0
+                    )
                     return jsonify({
-                        'status': 'error',
-                        'message': f'Error testing credentials: {str(e)}',
-                        'details': 'An unexpected error occurred during testing.'
+                        'status': 'success',
+                        'message': '✅ API credentials are valid!',
+                        'details': f'Successfully connected to your MXC account. Found {balance_count} assets with balance.'
+                    })
+                else:
+                    return jsonify({
+                        'status': 'warning',
+                        'message': 'Connected but unexpected response',
+                        'details': 'API responded but format was unexpected. Credentials might be valid.'
                     })
-                    
-            except Exception as e:
-                return jsonify({'status': 'error', 'message': f'Test failed: {str(e)}'})
-        
-        @self.app.route('/balance_data')
-        def get_balance():
-            """Get account balance data from exchange."""
-            try:
-                if self.mxc_client and self.settings and self.settings.api_key and self.settings.secret_key:
-                    try:
-                        self.logger.info("Fetching balance data from MXC")
-                        balances = self._run_async_task(self.mxc_client.get_balance()) or []
-                        self.logger.info("Balance data retrieved: %d entries", len(balances))
-                        return jsonify({'balances': balances})
-                    except Exception as e:
-                        self.logger.exception("Error fetching balances: %s", e)
-                        return jsonify({'error': f'Error fetching balances: {str(e)}'})
-                return jsonify({'error': 'Exchange client not available or credentials not set'})
-            except Exception as e:
-                return jsonify({'error': f'Error in get balance: {str(e)}'})
-
-        @self.app.route('/open_orders_data')
-        def get_open_orders():
-            """Get open orders from exchange."""
-            try:
-                if self.mxc_client and self.settings and self.settings.api_key and self.settings.secret_key:
-                    try:
-                        symbol = getattr(self.settings, 'default_symbol', None)
-                        self.logger.info("Fetching open orders (symbol=%s)", symbol)
-                        orders = self._run_async_task(self.mxc_client.get_open_orders(symbol=symbol)) or []
-                        self.logger.info("Open orders retrieved: %s", len(orders) if isinstance(orders, list) else 'n/a')
-                        return jsonify({'orders': orders})
-                    except Exception as e:
-                        self.logger.exception("Error fetching open orders: %s", e)
-                        return jsonify({'error': f'Error fetching open orders: {str(e)}'})
-                return jsonify({'error': 'Exchange client not available or credentials not set'})
-            except Exception as e:
-                return jsonify({'error': f'Error in get open orders: {str(e)}'})
 
-        @self.app.route('/positions_data')
-        def get_positions():
-            """Get positions from exchange."""
-            try:
-                if self.mxc_client and self.settings and self.settings.api_key and self.settings.secret_key:
-                    try:
-                        self.logger.info("Fetching positions data")
-                        positions = self._run_async_task(self.mxc_client.get_position_info()) or {}
-                        # Ensure consistent shape {"positions": [...]}
-                        if isinstance(positions, dict):
-                            self.logger.info(
-                                "Positions retrieved: %d entries",
-                                len(positions.get('positions', []))
-                            )
-                            return jsonify(positions)
-                        self.logger.info("Positions retrieved (list): %d entries", len(positions))
-                        return jsonify({'positions': positions})
-                    except Exception as e:
-                        self.logger.exception("Error fetching positions: %s", e)
-                        return jsonify({'error': f'Error fetching positions: {str(e)}'})
-                return jsonify({'error': 'Exchange client not available or credentials not set'})
             except Exception as e:
-                return jsonify({'error': f'Error in get positions: {str(e)}'})
+                return jsonify({
+                    'status': 'error',
+                    'message': f'Error testing credentials: {str(e)}',
+                    'details': 'An unexpected error occurred during testing.'
+                })
 
-        @self.app.route('/trades_data')
-        def get_trades():
-            """Get recent trades from exchange."""
-            try:
-                if self.mxc_client and self.settings and self.settings.api_key and self.settings.secret_key:
-                    try:
-                        symbol = getattr(self.settings, 'default_symbol', 'BTCUSDT')
-                        self.logger.info("Fetching trades (symbol=%s)", symbol)
-                        trades = self._run_async_task(self.mxc_client.get_my_trades(symbol)) or []
-                        self.logger.info("Trades retrieved: %d entries", len(trades))
-                        return jsonify({'trades': trades})
-                    except Exception as e:
-                        self.logger.exception("Error fetching trades: %s", e)
-                        return jsonify({'error': f'Error fetching trades: {str(e)}'})
-                return jsonify({'error': 'Exchange client not available or credentials not set'})
-            except Exception as e:
-                return jsonify({'error': f'Error in get trades: {str(e)}'})
+        except Exception as e:
+            return jsonify({'status': 'error', 'message': f'Test failed: {str(e)}'})
     
-    def get_status(self):
-        """Get current status of all components."""
-        return {
-            'scalping_running': self.scalping_strategy.is_running if self.scalping_strategy else False,
-            'range_running': self.range_scalp_strategy.is_running if self.range_scalp_strategy else False,
-            'futures_running': self.futures_strategy.is_running if self.futures_strategy else False,
-            'trading_pairs': getattr(self.scalping_strategy, 'trading_pairs', []) if self.scalping_strategy else [],
-            'active_strategies': sum([
-                1 if self.scalping_strategy and self.scalping_strategy.is_running else 0,
-                1 if self.range_scalp_strategy and self.range_scalp_strategy.is_running else 0,
-                1 if self.futures_strategy and self.futures_strategy.is_running else 0
-            ])
-        }
+    @_requires_client('fetching balances')
+    def _balance_data(self):
+        """Get account balance data from exchange."""
+        balances = self._cached('balance', self.mxc_client.get_balance) or []
+        self.logger.info("Balance data retrieved: %d entries", len(balances))
+        return jsonify({'balances': balances})
     
-    def get_risk_parameters(self):
-        """Get current risk parameters."""
-        return {
-            'max_daily_loss': self.settings.max_daily_loss,
-            'risk_per_trade': self.settings.risk_per_trade,
-            'max_consecutive_losses': self.settings.max_consecutive_losses,
-            'profit_target': self.settings.scalp_profit_target,
-            'stop_loss': self.settings.scalp_stop_loss,
-            'max_position_size': self.settings.max_position_size
-        }
+    @_requires_client('fetching open orders')
+    def _open_orders_data(self):
+        """Get open orders from exchange."""
+        symbol = getattr(self.settings, 'default_symbol', None)
+        orders = self._cached(('orders', symbol), lambda: self.mxc_client.get_open_orders(symbol=symbol)) or []
+        self.logger.info("Open orders retrieved: %s", len(orders) if isinstance(orders, list) else 'n/a')
+        return jsonify({'orders': orders})
+    
+    @_requires_client('fetching positions')
+    def _positions_data(self):
+        """Get positions from exchange."""
+        positions = self._cached('positions', self.mxc_client.get_position_info) or {}
+        # Ensure consistent shape {"positions": [...]}
+        if isinstance(positions, dict):
+            self.logger.info("Positions retrieved: %d entries", len(positions.get('positions', [])))
+            return jsonify(positions)
+        self.logger.info("Positions retrieved (list): %d entries", len(positions))
+        return jsonify({'positions': positions})
+    
+    @_requires_client('fetching trades')
+    def _trades_data(self):
+        """Get recent trades from exchange."""
+        symbol = getattr(self.settings, 'default_symbol', 'BTCUSDT')
+        trades = self._cached(('trades', symbol), lambda: self.mxc_client.get_my_trades(symbol)) or []
+        self.logger.info("Trades retrieved: %d entries", len(trades))
+        return jsonify({'trades': trades})
     
     def get_status(self):
         """Get current status of all components."""
-        active_strategies = 0
-        
-        # Count active strategies
-        if self.scalping_strategy and hasattr(self.scalping_strategy, 'is_running'):
-            if self.scalping_strategy.is_running:
-                active_strategies += 1
-        if self.range_scalp_strategy and hasattr(self.range_scalp_strategy, 'is_running'):
-            if self.range_scalp_strategy.is_running:
-                active_strategies += 1
-        if self.futures_strategy and hasattr(self.futures_strategy, 'is_running'):
-            if self.futures_strategy.is_running:
-                active_strategies += 1
-        
-        # Get trading pairs from scalping strategy if available
-        trading_pairs = []
-        if self.scalping_strategy and hasattr(self.scalping_strategy, 'trading_pairs'):
-            trading_pairs = self.scalping_strategy.trading_pairs
-        
+        scalping = self.scalping_strategy
+        scalping_running = bool(getattr(scalping, 'is_running', False))
+        range_running = bool(getattr(self.range_scalp_strategy, 'is_running', False))
+        futures_running = bool(getattr(self.futures_strategy, 'is_running', False))
         return {
-            'scalping_running': (self.scalping_strategy.is_running 
-                                 if self.scalping_strategy and hasattr(self.scalping_strategy, 'is_running') 
-                                 else False),
-            'range_running': (self.range_scalp_strategy.is_running 
-                             if self.range_scalp_strategy and hasattr(self.range_scalp_strategy, 'is_running') 
-                             else False),
-            'futures_running': (self.futures_strategy.is_running 
-                               if self.futures_strategy and hasattr(self.futures_strategy, 'is_running') 
-                               else False),
-            'trading_pairs': trading_pairs,
-            'active_strategies': active_strategies
+            'scalping_running': scalping_running,
+            'range_running': range_running,
+            'futures_running': futures_running,
+            'trading_pairs': getattr(scalping, 'trading_pairs', None) or [],
+            'active_strategies': scalping_running + range_running + futures_running
         }
     
     def get_risk_parameters(self):
@@ -529,33 +613,53 @@ class WebBotController:
     
     def get_credentials_status(self):
         """Get current status of API credentials."""
-        if self.settings:
-            return {
-                'api_key_set': bool(getattr(self.settings, 'api_key', '')),
-                'secret_key_set': bool(getattr(self.settings, 'secret_key', '')),
-                'bot_token_set': bool(getattr(self.settings, 'telegram_bot_token', '')),
-                'authorized_users_count': len(getattr(self.settings, 'telegram_authorized_users', []))
+        settings = self.settings
+        cached = self._credentials_status
+        if cached is not None and cached[0] is settings:
+            return cached[1]
+        
+        if settings:
+            status = {
+                'api_key_set': bool(getattr(settings, 'api_key', '')),
+                'secret_key_set': bool(getattr(settings, 'secret_key', '')),
+                'bot_token_set': bool(getattr(settings, 'telegram_bot_token', '')),
+                'authorized_users_count': len(getattr(settings, 'telegram_authorized_users', []))
             }
-        return {
-            'api_key_set': False,
-            'secret_key_set': False,
-            'bot_token_set': False,
-            'authorized_users_count': 0
-        }
+        else:
+            status = {
+                'api_key_set': False,
+                'secret_key_set': False,
+                'bot_token_set': False,
+                'authorized_users_count': 0
+            }
+        self._credentials_status = (settings, status)
+        return status
 
     def start_server(self, host='0.0.0.0', port=5000, debug=False):
-        """Start the web server."""
+        """Start the web server (blocks until it stops)."""
         print(f"Starting web interface on {host}:{port}")
-        self.app.run(host=host, port=port, debug=debug, threaded=True)
+        if serve is not None and not debug:
+            serve(self.app, host=host, port=port, threads=self.SERVER_THREADS)
+        else:
+            # Werkzeug development server
+            self.app.run(host=host, port=port, debug=debug, threaded=True)
+
+
+def create_app():
+    """App factory for WSGI servers, e.g. ``waitress-serve --call src.web.web_interface:create_app``."""
+    return WebBotController().app
 
 
 def run_web_interface():
     """Function to run the web interface."""
+    # The persistent background loop comes from asyncio.new_event_loop(), so set the policy first
+    install_uvloop()
     controller = WebBotController()
     controller.start_server()
 
 
 if __name__ == '__main__':
     # For testing purposes
+    install_uvloop()
     controller = WebBotController()
     controller.start_server(debug=True)
\ No newline at end of file
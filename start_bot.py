@@ -17,6 +17,7 @@ project_root = Path(__file__).resolve().parent
 sys.path.insert(0, str(project_root / 'src'))
 
 from src.main import MXCScalpBot
+from src.utils.helpers import install_uvloop
 
 
 def main():
@@ -34,6 +35,9 @@ def main():
     print("="*60)
     print()
     
+    # Run on uvloop where available (falls back to asyncio's loop on Windows)
+    install_uvloop()
+    
     # Create the bot instance
     bot = MXCScalpBot()
     
@@ -114,6 +114,19 @@ class TestMXCScalpBotStructure:
         assert stats['total_trades'] == 3
         assert stats['total_profit'] == 6.5  # 5 - 2 + 3.5
         assert len(metrics.get_recent_trades()) > 0
+        assert [t['symbol'] for t in metrics.get_recent_trades(2)] == ['BTCUSDT', 'ETHUSDT']
+    
+    def test_metrics_statistics_use_history_window(self):
+        """Profit factor and Sharpe ratio cover only the retained trades."""
+        metrics = MetricsManager(max_trades_history=4)
+        for profit in [1.0, -2.0, 3.0, 0.5, -1.0, 2.0]:
+            metrics.record_trade('BTCUSDT', profit, 0.1)
+        
+        assert list(metrics.profit_history) == [3.0, 0.5, -1.0, 2.0]
+        stats = metrics.get_statistics()
+        assert stats['profit_factor'] == 5.5
+        assert stats['sharpe_ratio'] == 0.643
+        assert stats['worst_trade'] == -2.0
 
 
 class TestRiskManagement:
@@ -196,5 +209,25 @@ async def test_end_to_end_simulation():
             assert strategy is not None
 
 
+
+@pytest.mark.asyncio
+async def test_shutdown_closes_exchange_client():
+    """Shutdown closes the client so its pooled HTTP session is released."""
+    from src.main import MXCScalpBot
+    
+    with patch.dict('os.environ', {
+        'MXC_API_KEY': 'test_api_key',
+        'MXC_SECRET_KEY': 'test_secret_key',
+        'TELEGRAM_BOT_TOKEN': 'test_bot_token',
+        'TELEGRAM_AUTHORIZED_USERS': '123456789'
+    }), patch('src.main.setup_logging'):
+        bot = MXCScalpBot()
+    bot.mxc_client = AsyncMock()
+    
+    await bot.shutdown()
+    
+    bot.mxc_client.close.assert_awaited_once()
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
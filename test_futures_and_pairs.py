@@ -182,6 +182,67 @@ class TestFuturesStrategy:
         assert not strategy._has_position('BTCUSDT', 'SHORT')
         assert not strategy._has_position('ETHUSDT', 'LONG')
 
+    @pytest.mark.asyncio
+    async def test_monitor_wakes_on_streamed_price(self):
+        """Position monitors react to ticks without polling the REST ticker."""
+        strategy = FuturesStrategy(
+            exchange_client=self.mock_client,
+            metrics_manager=self.metrics_manager,
+            settings=self.settings
+        )
+        self.mock_client.place_order = AsyncMock(return_value={'orderId': 'close-1'})
+        strategy.active_positions['BTCUSDT_LONG'] = {
+            'symbol': 'BTCUSDT',
+            'side': 'LONG',
+            'entry_price': 40000.0,
+            'stop_loss': 39000.0,
+            'take_profit': 41000.0,
+            'quantity': 0.1,
+            'leverage': 10
+        }
+        monitor = asyncio.create_task(strategy._monitor_position('BTCUSDT_LONG'))
+        await asyncio.sleep(0)
+        
+        for price in ('40500', '41200'):
+            await strategy._on_market_update([{'symbol': 'BTCUSDT', 'price': price}])
+            await asyncio.sleep(0)
+        await asyncio.wait_for(monitor, 1)
+        
+        assert 'BTCUSDT_LONG' not in strategy.active_positions
+        self.mock_client.get_last_price.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_monitor_falls_back_to_rest_when_its_symbol_is_silent(self):
+        """Ticks for other symbols do not keep a silent symbol's monitor waiting."""
+        strategy = FuturesStrategy(
+            exchange_client=self.mock_client,
+            metrics_manager=self.metrics_manager,
+            settings=self.settings
+        )
+        strategy.PRICE_WAIT_TIMEOUT = 0.05
+        self.mock_client.get_last_price = AsyncMock(return_value=38500.0)
+        self.mock_client.place_order = AsyncMock(return_value={'orderId': 'close-1'})
+        strategy.active_positions['BTCUSDT_LONG'] = {
+            'symbol': 'BTCUSDT',
+            'side': 'LONG',
+            'entry_price': 40000.0,
+            'stop_loss': 39000.0,
+            'take_profit': 41000.0,
+            'quantity': 0.1,
+            'leverage': 10
+        }
+        monitor = asyncio.create_task(strategy._monitor_position('BTCUSDT_LONG'))
+        
+        for _ in range(100):
+            if monitor.done():
+                break
+            await strategy._on_market_update([{'symbol': 'ETHUSDT', 'price': '2500'}])
+            await asyncio.sleep(0.01)
+        assert monitor.done()
+        
+        self.mock_client.get_last_price.assert_awaited_with('BTCUSDT')
+        assert 'BTCUSDT_LONG' not in strategy.active_positions
+
 
 def test_pair_validation_logic():
     """Test the pair validation logic that would be used in the Telegram bot."""
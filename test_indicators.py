@@ -0,0 +1,205 @@
+"""
+Tests for the incremental technical indicators
+"""
+import statistics
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.strategies import _kernels
+
+from src.strategies.indicators import (
+    Indicators, RollingSMA, RollingStd, BollingerBands, RollingRSI, RollingEMA,
+    RingBuffer, RollingATR, SlidingMinMax, MACDBank
+)
+
+
+PRICES = [100.0, 101.5, 100.8, 102.3, 103.1, 102.7, 101.9, 103.8, 104.2, 103.5,
+          105.1, 104.6, 106.0, 105.4, 104.9, 106.7, 107.2, 106.1, 108.0, 107.5,
+          108.9, 108.2, 109.6, 110.1, 109.3]
+
+
+class TestRollingIndicators:
+    """Incremental indicators must agree with their batch counterparts."""
+
+    def test_rolling_sma_matches_batch(self):
+        sma = RollingSMA(5)
+        for i, price in enumerate(PRICES, 1):
+            value = sma.update(price)
+            window = PRICES[max(0, i - 5):i]
+            assert value == pytest.approx(sum(window) / len(window))
+
+    def test_rolling_std_matches_population_stdev(self):
+        rolling = RollingStd(20)
+        for i, price in enumerate(PRICES, 1):
+            value = rolling.update(price)
+            assert value == pytest.approx(statistics.pstdev(PRICES[max(0, i - 20):i]))
+
+    def test_bollinger_bands_stateful_matches_batch(self):
+        bands = BollingerBands(20, 2.0)
+        rolling = RollingStd(20)
+        for price in PRICES:
+            result = bands.update(price)
+            rolling.update(price)
+        assert result == pytest.approx(Indicators.bollinger_bands(PRICES, 20))
+        assert result == pytest.approx(Indicators.bollinger_bands(PRICES, 20, rolling_std=rolling))
+
+    def test_rolling_rsi_wilder_smoothing(self):
+        period = 14
+        rsi = RollingRSI(period)
+        for price in PRICES:
+            value = rsi.update(price)
+
+        changes = [b - a for a, b in zip(PRICES, PRICES[1:])]
+        avg_gain = sum(max(c, 0.0) for c in changes[:period]) / period
+        avg_loss = sum(max(-c, 0.0) for c in changes[:period]) / period
+        for c in changes[period:]:
+            avg_gain = (avg_gain * (period - 1) + max(c, 0.0)) / period
+            avg_loss = (avg_loss * (period - 1) + max(-c, 0.0)) / period
+        expected = 100 - 100 / (1 + avg_gain / avg_loss)
+
+        assert value == pytest.approx(expected)
+        assert Indicators.relative_strength_index(PRICES, period) == pytest.approx(expected)
+
+    def test_rolling_rsi_neutral_during_warmup(self):
+        rsi = RollingRSI(14)
+        for price in PRICES[:14]:
+            assert rsi.update(price) == 50.0
+
+    def test_rolling_ema_seed_matches_updates(self):
+        warm = RollingEMA(10)
+        for price in PRICES:
+            value = warm.update(price)
+
+        seeded = RollingEMA(10)
+        assert seeded.seed(PRICES) == pytest.approx(value)
+        assert seeded.update(111.0) == pytest.approx(warm.update(111.0))
+
+    def test_stateless_ema_is_deprecated(self):
+        with pytest.deprecated_call():
+            Indicators.exponential_moving_average(PRICES, 10)
+
+    def test_macd_signal_line_tracks_macd_history(self):
+        fast, slow, signal = RollingEMA(3), RollingEMA(6), RollingEMA(4)
+        for price in PRICES:
+            macd = fast.update(price) - slow.update(price)
+            sig = signal.update(macd)
+
+        result = Indicators.moving_average_convergence_divergence(PRICES, 3, 6, 4)
+        assert result == pytest.approx((macd, sig, macd - sig))
+        assert result[2] != 0
+
+    def test_ring_buffer_feeds_scalar_helpers(self):
+        ring = RingBuffer(20)
+        for price in PRICES:
+            ring.append(price)
+        window = PRICES[-20:]
+        assert len(ring) == 20
+        assert list(ring) == window
+        assert ring[-1] == window[-1] and ring[0] == window[0]
+        assert Indicators.simple_moving_average(ring, 20) == pytest.approx(sum(window) / 20)
+        assert Indicators.bollinger_bands(ring, 20) == pytest.approx(
+            Indicators.bollinger_bands(window, 20))
+
+    def test_sliding_min_max(self):
+        window = SlidingMinMax(5)
+        for i, price in enumerate(PRICES, 1):
+            window.push(price)
+            recent = PRICES[max(0, i - 5):i]
+            assert window.min == min(recent)
+            assert window.max == max(recent)
+
+    def test_macd_bank_matches_rolling_emas_per_symbol(self):
+        bank = MACDBank(capacity=1)
+        expected = {}
+        for symbol, scale in (('BTCUSDT', 400.0), ('ETHUSDT', 25.0), ('SOLUSDT', 1.0)):
+            fast, slow, signal = RollingEMA(12), RollingEMA(26), RollingEMA(9)
+            for price in PRICES:
+                macd = fast.update(price * scale) - slow.update(price * scale)
+                sig = signal.update(macd)
+            expected[symbol] = (macd, sig, macd - sig)
+
+        symbols = list(expected)
+        for price in PRICES:
+            bank.update(symbols, [price * 400.0, price * 25.0, price * 1.0])
+
+        for symbol, values in expected.items():
+            assert bank.values(symbol) == pytest.approx(values)
+        assert bank.values('XRPUSDT') == (0.0, 0.0, 0.0)
+
+    def test_ring_buffer_window_is_contiguous_after_wrap(self):
+        ring = RingBuffer(8)
+        ring.extend(PRICES)
+        window = ring.window()
+        assert len(ring) == 8
+        assert window.tolist() == PRICES[-8:]
+        assert window.flags.c_contiguous and not window.flags.owndata
+        assert ring.window(3).tolist() == PRICES[-3:]
+        assert Indicators.sma_series(ring.window(), 8)[-1] == pytest.approx(sum(PRICES[-8:]) / 8)
+
+    def test_ring_buffer_indexing_and_replace_last(self):
+        ring = RingBuffer(8)
+        ring.extend(PRICES[:3])
+        assert (ring[0], ring[-1]) == (PRICES[0], PRICES[2])
+        ring.extend(PRICES[3:])
+        assert [ring[i] for i in range(8)] == PRICES[-8:]
+        assert ring[-2] == PRICES[-2]
+        ring.replace_last(1.0)
+        assert ring.window().tolist() == PRICES[-8:-1] + [1.0]
+        with pytest.raises(IndexError):
+            ring[8]
+
+
+class TestSeriesIndicators:
+    """Vectorized series helpers must match the scalar implementations."""
+
+    def test_sma_series(self):
+        series = Indicators.sma_series(PRICES, 5)
+        assert len(series) == len(PRICES) - 4
+        assert series[-1] == pytest.approx(Indicators.simple_moving_average(PRICES, 5))
+
+    def test_ema_series_matches_rolling_ema(self):
+        ema = RollingEMA(10)
+        for price in PRICES:
+            value = ema.update(price)
+        assert Indicators.ema_series(PRICES, 10)[-1] == pytest.approx(value)
+
+    def test_bbands_series(self):
+        upper, middle, lower = Indicators.bbands_series(PRICES, 20)
+        assert (upper[-1], middle[-1], lower[-1]) == pytest.approx(
+            Indicators.bollinger_bands(PRICES, 20))
+
+    def test_kernels_match_series_helpers(self):
+        arr = np.asarray(PRICES * 4, dtype=np.float64)
+        mean, std = _kernels.rolling_mean_std(arr, 20)
+        assert mean == pytest.approx(Indicators.sma_series(arr, 20))
+        assert std[-1] == pytest.approx(statistics.pstdev(arr[-20:]))
+        assert _kernels.ema_1d(arr, 10) == pytest.approx(
+            pd.Series(arr).ewm(span=10, adjust=False).mean().to_numpy())
+
+    def test_atr_series_matches_rolling_atr(self):
+        highs = [p + 0.8 for p in PRICES]
+        lows = [p - 0.6 for p in PRICES]
+        atr = RollingATR(14)
+        for h, l, c in zip(highs, lows, PRICES):
+            value = atr.update(h, l, c)
+
+        series = Indicators.atr_series(highs, lows, PRICES, 14)
+        assert len(series) == len(PRICES) - 13
+        assert series[-1] == pytest.approx(value)
+        assert Indicators.average_true_range(highs, lows, PRICES, 14) == pytest.approx(value)
+
+    def test_float32_series_stay_within_level_threshold(self):
+        arr = np.asarray(PRICES * 200, dtype=np.float64) * 400  # ~40k, like BTC
+        sma32 = Indicators.sma_series(arr, 20, dtype=np.float32)
+        upper32, _, lower32 = Indicators.bbands_series(arr, 20, dtype=np.float32)
+        upper64, _, lower64 = Indicators.bbands_series(arr, 20)
+
+        assert sma32.dtype == np.float32 and upper32.dtype == np.float32
+        # Far inside the 0.5% change threshold used for support/resistance
+        np.testing.assert_allclose(sma32, Indicators.sma_series(arr, 20), rtol=1e-6)
+        np.testing.assert_allclose(upper32, upper64, rtol=1e-6)
+        np.testing.assert_allclose(lower32, lower64, rtol=1e-6)
+        np.testing.assert_allclose(Indicators.ema_series(arr, 10, dtype=np.float32),
+                                   Indicators.ema_series(arr, 10), rtol=1e-6)
@@ -5,7 +5,7 @@ import pytest
 from unittest.mock import MagicMock, AsyncMock
 import asyncio
 
-from src.strategies.range_scalp_strategy import RangeScalpStrategy
+from src.strategies.range_scalp_strategy import RangeScalpStrategy, Side
 from src.monitoring.metrics import MetricsManager
 from src.config.settings import Settings
 
@@ -169,6 +169,133 @@ class TestRangeScalpStrategy:
         # The strategy should be able to process the update
         assert True  # If we reach here, no exception occurred
 
+    @pytest.mark.asyncio
+    async def test_monitor_range_order_polls_rest_until_filled(self):
+        """Fills are detected by polling the order over REST."""
+        strategy = RangeScalpStrategy(
+            exchange_client=self.mock_client,
+            metrics_manager=self.metrics_manager,
+            settings=self.settings
+        )
+        strategy.ORDER_POLL_INTERVAL = 0.01
+        strategy._place_exit_orders = AsyncMock()
+        self.mock_client.get_order = AsyncMock(side_effect=[{'status': 'open'}, {'status': 'closed'}])
+        strategy.active_range_orders[('BTCUSDT', Side.LONG)] = {
+            'order_id': '7', 'symbol': 'BTCUSDT', 'order_type': 'LONG',
+            'entry_price': 40000.0, 'quantity': 0.001,
+            'stop_price': 36000.0, 'target_price': 40200.0
+        }
+        
+        await asyncio.wait_for(strategy._monitor_range_order(('BTCUSDT', Side.LONG)), timeout=1)
+        
+        assert self.mock_client.get_order.await_count == 2
+        strategy._place_exit_orders.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_process_ticks_refreshes_levels_once_per_interval(self):
+        """A tick batch triggers at most one klines fetch per refresh interval."""
+        strategy = RangeScalpStrategy(
+            exchange_client=self.mock_client,
+            metrics_manager=self.metrics_manager,
+            settings=self.settings
+        )
+        self.mock_client.get_klines = AsyncMock(return_value=[
+            [1634567890000, "40000.00", "40100.00", "39900.00", "40050.00", "10.00"],
+            [1634571490000, "40050.00", "40150.00", "39950.00", "40100.00", "15.00"],
+        ])
+        
+        await strategy._process_ticks([('BTCUSDT', 40000.0), ('BTCUSDT', 40010.0)])
+        await strategy._process_ticks([('BTCUSDT', 40020.0)])
+        
+        assert self.mock_client.get_klines.await_count == 1
+        assert strategy.support_level == 39900.0
+        assert strategy.resistance_level == 40150.0
+
+    @pytest.mark.asyncio
+    async def test_macd_histogram_tracks_the_default_symbol(self):
+        """The reported histogram is the default symbol's, whatever traded last in a batch."""
+        strategy = RangeScalpStrategy(
+            exchange_client=self.mock_client,
+            metrics_manager=self.metrics_manager,
+            settings=self.settings
+        )
+        strategy._last_sr_update = float('inf')  # Skip the S/R refresh
+        
+        for step in range(30):
+            await strategy._process_ticks([('BTCUSDT', 40000.0 + 10 * step), ('ETHUSDT', 3000.0 - step)])
+        
+        assert strategy.macd_histogram == strategy.macd_values('BTCUSDT')[2]
+        assert strategy.macd_histogram != strategy.macd_values('ETHUSDT')[2]
+        assert strategy.get_status()['macd_histogram'] == strategy.macd_histogram
+
+    @pytest.mark.asyncio
+    async def test_cached_klines_rolls_in_new_bar(self):
+        """Klines are reused within the TTL and rolled forward after it."""
+        strategy = RangeScalpStrategy(
+            exchange_client=self.mock_client,
+            metrics_manager=self.metrics_manager,
+            settings=self.settings
+        )
+        bars = [[i * 3600000, 1.0, 2.0, 0.5, 1.5, 10.0] for i in range(24)]
+        self.mock_client.get_klines = AsyncMock(return_value=bars)
+        
+        assert await strategy._cached_klines('BTCUSDT', '1h', 24) == bars
+        assert await strategy._cached_klines('BTCUSDT', '1h', 24) == bars
+        assert self.mock_client.get_klines.await_count == 1
+        
+        # Age the cache by one bar; only the last two bars are fetched
+        key = ('BTCUSDT', '1h', 24)
+        fetched_at, cached = strategy._klines_cache[key]
+        strategy._klines_cache[key] = (fetched_at - 3600, cached)
+        new_bars = [[23 * 3600000, 1.0, 2.5, 0.5, 1.5, 10.0], [24 * 3600000, 1.5, 3.0, 1.0, 2.0, 5.0]]
+        self.mock_client.get_klines = AsyncMock(return_value=new_bars)
+        
+        klines = await strategy._cached_klines('BTCUSDT', '1h', 24)
+        self.mock_client.get_klines.assert_awaited_once_with('BTCUSDT', interval='1h', limit=2)
+        assert len(klines) == 24
+        assert klines[0][0] == 3600000
+        assert klines[-2:] == new_bars
+
+    @pytest.mark.asyncio
+    async def test_check_opportunities_uses_precomputed_zones(self):
+        """A price inside the support zone places exactly one long order."""
+        strategy = RangeScalpStrategy(
+            exchange_client=self.mock_client,
+            metrics_manager=self.metrics_manager,
+            settings=self.settings
+        )
+        self.mock_client.get_klines = AsyncMock(return_value=[
+            [0, "100.0", "110.0", "100.0", "105.0", "1.0"],
+            [3600000, "105.0", "108.0", "101.0", "104.0", "1.0"],
+        ])
+        await strategy._update_support_resistance_levels('BTCUSDT')
+        assert strategy._sup_lower_band == pytest.approx(100.2)
+        assert strategy._sup_upper_band == pytest.approx(100.6)
+        
+        strategy._place_range_order = AsyncMock()
+        await strategy._check_range_scalp_opportunities('BTCUSDT', 100.4)
+        await strategy._check_range_scalp_opportunities('BTCUSDT', 105.0)
+        strategy._place_range_order.assert_awaited_once_with('BTCUSDT', 'LONG', 100.4)
+
+    def test_trade_parser_bound_on_first_message(self):
+        """The payload format is detected once and the parser rebound."""
+        strategy = RangeScalpStrategy(
+            exchange_client=self.mock_client,
+            metrics_manager=self.metrics_manager,
+            settings=self.settings
+        )
+        
+        assert strategy._parse_trade([{'symbol': 'ETHUSDT', 'price': '2500.5'}]) == ('ETHUSDT', 2500.5)
+        assert strategy._parse_trade == strategy._parse_trade_dict
+        
+        other = RangeScalpStrategy(
+            exchange_client=self.mock_client,
+            metrics_manager=self.metrics_manager,
+            settings=self.settings
+        )
+        assert other._parse_trade([[1634567890000, "40000.00"]]) == ('BTCUSDT', 40000.0)
+        assert other._parse_trade == other._parse_trade_row
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -92,7 +92,9 @@ class TestRiskSizeControls:
         original_reply_text = update.message.reply_text
         update.message.reply_text = AsyncMock()
         
-        await bot._set_risk_parameters(update, None)
+        context = MagicMock(args=['max_daily_loss', '200'])
+        
+        await bot._set_risk_parameters(update, context)
         
         # Check that reply was called (meaning command executed without error)
         update.message.reply_text.assert_called()
@@ -122,7 +124,9 @@ class TestRiskSizeControls:
         # Make reply_text mock async
         update.message.reply_text = AsyncMock()
         
-        await bot._set_position_size(update, None)
+        context = MagicMock(args=['50'])
+        
+        await bot._set_position_size(update, context)
         
         # Check that reply was called
         update.message.reply_text.assert_called()
@@ -156,6 +160,31 @@ class TestRiskSizeControls:
         # Check that reply was called
         update.message.reply_text.assert_called()
 
+    @pytest.mark.asyncio
+    async def test_unauthorized_user_is_refused(self):
+        """Handlers reply with a refusal and change nothing for unknown users."""
+        bot = TelegramBot(
+            bot_token='test_token',
+            authorized_users=[123456789],
+            exchange_client=self.mock_client,
+            scalping_strategy=self.scalping_strategy,
+            range_scalp_strategy=self.range_scalp_strategy,
+            futures_strategy=self.futures_strategy,
+            metrics_manager=self.metrics_manager,
+            risk_manager=self.risk_manager
+        )
+        
+        update = MagicMock()
+        update.effective_user.id = 987654321  # Not authorized
+        update.message.text = "/set_size 50"
+        update.message.reply_text = AsyncMock()
+        original_size = self.settings.max_position_size
+        
+        await bot._set_position_size(update, MagicMock(args=['50']))
+        
+        update.message.reply_text.assert_awaited_once_with("You are not authorized to use this bot.")
+        assert self.settings.max_position_size == original_size
+
     def test_risk_parameter_validation(self):
         """Test the validation logic within the risk parameter setting."""
         # This just tests the logic that would be in the command
@@ -0,0 +1,342 @@
+"""
+Test suite for the Scalping Strategy's streaming state and tick handling
+"""
+import asyncio
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+
+from src.strategies.scalping_strategy import ScalpingStrategy, RollingState, PositionBook
+from src.strategies.indicators import Indicators
+from src.strategies._kernels import scalp_signal, scalp_signal_batch, wilder_rsi
+from src.monitoring.metrics import MetricsManager
+
+
+CLOSES = [100.0 + (i % 7) * 0.6 - (i % 3) * 0.4 + i * 0.05 for i in range(60)]
+
+
+def make_klines(closes, start_ms=0):
+    return [[start_ms + i * 60_000, c, c + 1, c - 1, c, 1.0] for i, c in enumerate(closes)]
+
+
+class TestRollingState:
+    """The streaming state must agree with the batch indicators."""
+
+    def _assert_matches_batch(self, state, closes):
+        assert state.closes.window().tolist() == closes[-50:]
+        window = closes[-50:]
+        assert state.sma20 == pytest.approx(Indicators.simple_moving_average(window, 20))
+        assert state.sma50 == pytest.approx(Indicators.simple_moving_average(window, 50))
+        assert state.momentum == pytest.approx(window[-1] - window[-11])
+        deltas = [abs(window[i] - window[i - 1]) for i in range(-4, 0)]
+        assert state.mean_abs_delta == pytest.approx(sum(deltas) / 4)
+
+    def test_seed_matches_batch(self):
+        state = RollingState()
+        state.seed(CLOSES[:50], 49 * 60_000)
+        self._assert_matches_batch(state, CLOSES[:50])
+        assert state.rsi == pytest.approx(Indicators.relative_strength_index(CLOSES[:50]))
+
+    def test_ticks_replace_forming_bar_and_append_new_bars(self):
+        state = RollingState()
+        state.seed(CLOSES[:50], 49 * 60_000)
+
+        # Same minute: the forming close is replaced
+        state.update(123.0, 49 * 60_000 + 30_000)
+        closes = CLOSES[:49] + [123.0]
+        self._assert_matches_batch(state, closes)
+
+        # Later minutes append bars and roll the window
+        for i, close in enumerate(CLOSES[50:], 50):
+            state.update(close, i * 60_000)
+            closes.append(close)
+        self._assert_matches_batch(state, closes)
+        assert 0 <= state.rsi <= 100
+
+    def test_late_trade_for_closed_bar_is_ignored(self):
+        state = RollingState()
+        state.seed(CLOSES[:50], 49 * 60_000)
+
+        state.update(123.0, 48 * 60_000 + 59_000)
+
+        assert state.bar == 49
+        self._assert_matches_batch(state, CLOSES[:50])
+
+    @pytest.mark.parametrize('shift', [0.0, 1.5, -1.5])
+    def test_kernel_signal_matches_streaming_signal(self, shift):
+        closes = CLOSES[:49] + [CLOSES[49] + shift]
+        state = RollingState()
+        state.seed(closes, 49 * 60_000)
+
+        kernel = scalp_signal(np.asarray(closes), 14, 20, 50, 20)
+        streaming = state.signal()
+
+        assert kernel[:2] == streaming[:2]
+        assert kernel[2:] == pytest.approx(streaming[2:])
+
+    def test_batch_kernel_matches_per_symbol_kernel(self):
+        rows = np.array([CLOSES[i:i + 50] for i in range(0, 10, 3)])
+        n = len(rows)
+        bull = np.empty(n, dtype=np.bool_)
+        bear = np.empty(n, dtype=np.bool_)
+        mom = np.empty(n)
+        mad = np.empty(n)
+
+        rsi = np.array([wilder_rsi(row, 14) for row in rows])
+
+        scalp_signal_batch(rows, rsi, bull, bear, mom, mad, 20, 50, 20)
+
+        for i, row in enumerate(rows):
+            assert (bull[i], bear[i], mom[i], mad[i]) == scalp_signal(row, 14, 20, 50, 20)
+
+
+class TestPositionBook:
+    """Vectorized take-profit/stop-loss checks over the position arrays."""
+
+    def _book(self):
+        book = PositionBook(capacity=2)
+        book.add('a', 'BTCUSDT', 'BUY', 100.0, 101.0, 99.0, 1.0, 0)
+        book.add('b', 'BTCUSDT', 'SELL', 100.0, 99.0, 101.0, 2.0, 0)
+        book.add('c', 'ETHUSDT', 'BUY', 10.0, 11.0, 9.0, 3.0, 0)
+        return book
+
+    def test_hits_by_side_and_symbol(self):
+        book = self._book()
+        assert book.hits('BTCUSDT', 100.0) == []
+        assert sorted(book.hits('BTCUSDT', 101.5)) == ['a', 'b']
+        # Positions being closed are not reported twice until released
+        assert book.hits('BTCUSDT', 101.5) == []
+        book.release('a')
+        assert book.hits('BTCUSDT', 98.0) == ['a']
+        assert book.hits('ETHUSDT', 8.5) == ['c']
+
+    def test_remove_moves_last_row(self):
+        book = self._book()
+        book.remove('a')
+        assert len(book) == 2 and 'a' not in book
+        assert book.get('c') == {
+            'order_id': 'c', 'symbol': 'ETHUSDT', 'side': 'BUY', 'entry_price': 10.0,
+            'target_price': 11.0, 'stop_price': 9.0, 'size': 3.0, 'entry_time_ns': 0,
+        }
+        assert book.hits('ETHUSDT', 11.0) == ['c']
+
+
+class TestScalpingStrategy:
+    """Tick handling for the scalping strategy."""
+
+    def setup_method(self):
+        self.mock_client = AsyncMock()
+        self.mock_client.register_market_callback = MagicMock()
+        self.settings = MagicMock()
+        self.settings.scalp_profit_target = 0.005
+        self.settings.scalp_stop_loss = 0.003
+        self.settings.max_position_size = 10.0
+        self.settings.risk_per_trade = 0.02
+        self.settings.default_symbol = 'BTCUSDT'
+        self.settings.quote_currency = 'USDT'
+        self.settings.trading_enabled = False
+        self.strategy = ScalpingStrategy(
+            exchange_client=self.mock_client,
+            metrics_manager=MetricsManager(),
+            settings=self.settings
+        )
+
+    @pytest.mark.asyncio
+    async def test_klines_fetched_only_to_seed(self):
+        self.mock_client.get_klines = AsyncMock(return_value=make_klines(CLOSES[:50]))
+
+        await self.strategy._find_scalping_opportunity('BTCUSDT', CLOSES[49])
+        await self.strategy._find_scalping_opportunity('BTCUSDT', CLOSES[49])
+
+        assert self.mock_client.get_klines.await_count == 1
+        assert 'BTCUSDT' in self.strategy.rolling_states
+
+    @pytest.mark.asyncio
+    async def test_bursts_dispatch_latest_tick_per_symbol(self):
+        self.settings.trading_enabled = True
+        self.strategy.DISPATCH_INTERVAL = 0.01
+        self.strategy.trading_pairs = ['BTCUSDT', 'ETHUSDT']
+        self.strategy.start()
+        seen = []
+
+        async def analyze(symbol, price, quantity, trade_time, signal=None):
+            seen.append((symbol, price))
+        self.strategy._analyze_and_trade = analyze
+
+        for i in range(100):
+            for symbol in ('BTCUSDT', 'ETHUSDT'):
+                self.strategy._on_market_update(
+                    [{'symbol': symbol, 'price': str(i), 'quantity': '1', 'tradeTime': i}])
+        await asyncio.sleep(0.05)
+
+        # One analysis per symbol, using the newest price of the burst
+        assert sorted(seen) == [('BTCUSDT', 99.0), ('ETHUSDT', 99.0)]
+        self.strategy.stop()
+
+    @pytest.mark.asyncio
+    async def test_streamed_price_closes_position(self):
+        self.strategy.PRICE_WAIT_TIMEOUT = 0.05
+        self.mock_client.place_order = AsyncMock(return_value={'orderId': 'close-1'})
+        self.strategy.positions.add('42', 'BTCUSDT', 'BUY', entry_price=100.0,
+                                    target_price=101.0, stop_price=99.0, size=1.0,
+                                    entry_time_ns=0)
+        monitor = asyncio.create_task(self.strategy._monitor_position('42'))
+        await asyncio.sleep(0)
+
+        for price in ('100.5', '101.2', '101.3'):
+            self.strategy._on_market_update(
+                [{'symbol': 'BTCUSDT', 'price': price, 'quantity': '1', 'tradeTime': 1}])
+            await asyncio.sleep(0)
+        await asyncio.wait_for(monitor, 1)
+
+        assert '42' not in self.strategy.positions
+        self.mock_client.get_last_price.assert_not_called()
+        self.mock_client.place_order.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_live_stream_skips_rest_price_check(self):
+        self.strategy.PRICE_WAIT_TIMEOUT = 0.05
+        self.strategy.positions.add('42', 'BTCUSDT', 'BUY', entry_price=100.0,
+                                    target_price=101.0, stop_price=99.0, size=1.0,
+                                    entry_time_ns=0)
+        monitor = asyncio.create_task(self.strategy._monitor_position('42'))
+
+        for _ in range(20):
+            self.strategy._on_market_update(
+                [{'symbol': 'BTCUSDT', 'price': '100.2', 'quantity': '1', 'tradeTime': 1}])
+            await asyncio.sleep(0.01)
+        monitor.cancel()
+
+        self.mock_client.get_last_price.assert_not_called()
+        assert '42' in self.strategy.positions
+
+    def test_trading_pairs_assignment_refreshes_tick_filter(self):
+        self.settings.trading_enabled = True
+        self.strategy.is_running = True
+        self.strategy._scheduler_task = MagicMock(done=MagicMock(return_value=False))
+
+        self.strategy.trading_pairs = ['ETHUSDT']
+        for symbol in ('BTCUSDT', 'ETHUSDT'):
+            self.strategy._on_market_update(
+                [{'symbol': symbol, 'price': '10', 'quantity': '1', 'tradeTime': 1}])
+
+        assert self.strategy.trading_pairs == ['ETHUSDT']
+        assert list(self.strategy._latest_tick) == ['ETHUSDT']
+        # Prices are still tracked for every streamed symbol
+        assert self.strategy._last_price == {'BTCUSDT': 10.0, 'ETHUSDT': 10.0}
+
+    @pytest.mark.asyncio
+    async def test_balance_cached_between_sizing_calls(self):
+        self.mock_client.get_balance = AsyncMock(return_value=[
+            {'asset': 'BTC', 'free': '1'}, {'asset': 'USDT', 'free': '1000'}])
+        self.settings.max_position_size = 10.0
+
+        first = await self.strategy._calculate_position_size('BTCUSDT', 100.0)
+        second = await self.strategy._calculate_position_size('BTCUSDT', 100.0)
+        assert first == second == pytest.approx(0.1)
+        assert self.mock_client.get_balance.await_count == 1
+
+        self.strategy._invalidate_balance()
+        await self.strategy._calculate_position_size('BTCUSDT', 100.0)
+        assert self.mock_client.get_balance.await_count == 2
+
+    def test_refresh_settings_updates_price_multipliers(self):
+        assert self.strategy._bull_target_mul == pytest.approx(1.005)
+        assert self.strategy._bear_stop_mul == pytest.approx(1.003)
+
+        self.settings.scalp_profit_target = 0.01
+        self.settings.scalp_stop_loss = 0.02
+        self.strategy.refresh_settings()
+
+        assert self.strategy._bull_target_mul == pytest.approx(1.01)
+        assert self.strategy._bull_stop_mul == pytest.approx(0.98)
+        assert self.strategy._bear_target_mul == pytest.approx(0.99)
+        assert self.strategy._bear_stop_mul == pytest.approx(1.02)
+
+    def test_batch_signals_cover_symbols_with_full_windows(self):
+        for i, symbol in enumerate(('BTCUSDT', 'ETHUSDT', 'XRPUSDT')):
+            state = RollingState()
+            closes = CLOSES[i:i + 50] if symbol != 'XRPUSDT' else CLOSES[:30]
+            state.seed(closes, 0)
+            self.strategy.rolling_states[symbol] = state
+
+        signals = self.strategy._batch_signals(['BTCUSDT', 'ETHUSDT', 'XRPUSDT', 'SOLUSDT'])
+
+        assert sorted(signals) == ['BTCUSDT', 'ETHUSDT']
+        expected = scalp_signal(np.asarray(CLOSES[1:51]), 14, 20, 50, 20)
+        assert signals['ETHUSDT'] == pytest.approx(expected)
+
+    def test_batch_signals_use_carried_rsi(self):
+        for i, symbol in enumerate(('BTCUSDT', 'ETHUSDT')):
+            state = RollingState()
+            state.seed(CLOSES[i:i + 50], 49 * 60_000)
+            for j, close in enumerate(CLOSES[i + 50:], 50):
+                state.update(close, j * 60_000)
+            self.strategy.rolling_states[symbol] = state
+
+        signals = self.strategy._batch_signals(['BTCUSDT', 'ETHUSDT'])
+
+        for symbol, state in self.strategy.rolling_states.items():
+            # The window alone gives a different RSI than the carried one
+            assert wilder_rsi(state.closes.window(), 14) != pytest.approx(state.rsi)
+            expected = state.signal()
+            assert signals[symbol][:2] == expected[:2]
+            assert signals[symbol][2:] == pytest.approx(expected[2:])
+
+    @pytest.mark.asyncio
+    async def test_entry_tracked_locally(self):
+        self.mock_client.place_order = AsyncMock(return_value={'orderId': '7'})
+        self.strategy._monitor_position = AsyncMock()
+
+        await self.strategy._execute_trade('BTCUSDT', 'BUY', 1.0, 101.0, 99.0)
+        await asyncio.sleep(0)
+
+        assert '7' in self.strategy.positions
+        self.strategy._monitor_position.assert_awaited_once_with('7')
+
+    @pytest.mark.asyncio
+    async def test_unchanged_window_is_not_reevaluated(self):
+        self.strategy.trading_pairs = ['BTCUSDT']
+        state = RollingState()
+        state.seed(CLOSES[:50], 49 * 60_000)
+        self.strategy.rolling_states['BTCUSDT'] = state
+        self.strategy._find_scalping_opportunity = AsyncMock(return_value=None)
+
+        await self.strategy._analyze_and_trade('BTCUSDT', CLOSES[49], 1.0, 49 * 60_000)
+        await self.strategy._analyze_and_trade('BTCUSDT', CLOSES[49], 1.0, 49 * 60_000 + 10)
+        assert self.strategy._find_scalping_opportunity.await_count == 1
+
+        state.update(CLOSES[49] + 1, 49 * 60_000 + 20)
+        await self.strategy._analyze_and_trade('BTCUSDT', CLOSES[49] + 1, 1.0, 49 * 60_000 + 20)
+        assert self.strategy._find_scalping_opportunity.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_silent_stream_falls_back_to_rest_price(self):
+        self.strategy.PRICE_WAIT_TIMEOUT = 0.01
+        self.mock_client.get_last_price = AsyncMock(return_value=98.5)
+        self.mock_client.place_order = AsyncMock(return_value={'orderId': 'close-1'})
+        self.strategy.positions.add('42', 'BTCUSDT', 'BUY', entry_price=100.0,
+                                    target_price=101.0, stop_price=99.0, size=1.0,
+                                    entry_time_ns=0)
+
+        await asyncio.wait_for(self.strategy._monitor_position('42'), 1)
+
+        self.mock_client.get_last_price.assert_awaited_with('BTCUSDT')
+        assert '42' not in self.strategy.positions
+
+    @pytest.mark.asyncio
+    async def test_trade_throttle_survives_pair_changes(self):
+        self.strategy.trading_pairs = ['BTCUSDT', 'ETHUSDT']
+        self.strategy._find_scalping_opportunity = AsyncMock(return_value=('BUY', 1.0, 101.0, 99.0))
+        self.strategy._execute_trade = AsyncMock()
+
+        await self.strategy._analyze_and_trade('ETHUSDT', 100.0, 1.0, 10_000)
+        self.strategy.trading_pairs = ['ETHUSDT', 'XRPUSDT']
+        await self.strategy._analyze_and_trade('ETHUSDT', 100.0, 1.0, 11_000)
+        assert self.strategy._execute_trade.await_count == 1
+        assert self.strategy.last_trade_time == {'ETHUSDT': 10_000}
+
+        await self.strategy._analyze_and_trade('ETHUSDT', 100.0, 1.0, 12_000)
+        assert self.strategy._execute_trade.await_count == 2
+        assert self.strategy.get_status()['last_trade_times'] == {'ETHUSDT': 12_000}
@@ -0,0 +1,296 @@
+"""
+Test suite for the Telegram bot handler's caching and dispatch
+"""
+import asyncio
+import sys
+
+import pytest
+from unittest.mock import MagicMock, AsyncMock
+
+from src.config.settings import Settings
+from src.telegram_bot.bot_handler import TelegramBot
+
+
+ACCOUNT_INFO = {
+    'balances': [
+        {'asset': 'USDT', 'free': '100.5', 'locked': '0.5'},
+        {'asset': 'BTC', 'free': '0', 'locked': '0'},
+    ]
+}
+
+
+class TestTelegramBot:
+    """Telegram command handlers."""
+
+    def setup_method(self):
+        self.mock_client = AsyncMock()
+        self.scalping_strategy = MagicMock()
+        self.bot = TelegramBot(
+            bot_token='test_token',
+            authorized_users=[123456789],
+            exchange_client=self.mock_client,
+            scalping_strategy=self.scalping_strategy,
+            metrics_manager=MagicMock()
+        )
+
+    def make_update(self, text=''):
+        update = MagicMock()
+        update.effective_user.id = 123456789
+        update.message.text = text
+        update.message.reply_text = AsyncMock()
+        return update
+
+    @pytest.mark.asyncio
+    async def test_concurrent_account_requests_share_one_fetch(self):
+        async def slow_account_info():
+            await asyncio.sleep(0.01)
+            return ACCOUNT_INFO
+        self.mock_client.get_account_info = AsyncMock(side_effect=slow_account_info)
+
+        results = await asyncio.gather(*(self.bot._get_account_info_cached() for _ in range(5)))
+        assert all(result is ACCOUNT_INFO for result in results)
+
+        # Served from cache within the TTL
+        await self.bot._balance(self.make_update('/balance'), None)
+        assert self.mock_client.get_account_info.await_count == 1
+
+        self.bot._account_cache = (0.0, ACCOUNT_INFO)  # Expired
+        await self.bot._get_account_info_cached()
+        assert self.mock_client.get_account_info.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_account_fetch_is_not_reused(self):
+        self.mock_client.get_account_info = AsyncMock(side_effect=[RuntimeError('down'), ACCOUNT_INFO])
+
+        with pytest.raises(RuntimeError):
+            await self.bot._get_account_info_cached()
+        await asyncio.sleep(0)
+
+        assert await self.bot._get_account_info_cached() is ACCOUNT_INFO
+        assert self.mock_client.get_account_info.await_count == 2
+
+    @pytest.mark.skipif(sys.version_info < (3, 12), reason="eager_task_factory needs Python 3.12+")
+    @pytest.mark.asyncio
+    async def test_account_fetch_is_cleared_under_eager_tasks(self):
+        # A fetch that never suspends completes inside create_task when tasks start eagerly
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+        try:
+            self.mock_client.get_account_info = AsyncMock(side_effect=[RuntimeError('down'), ACCOUNT_INFO])
+
+            with pytest.raises(RuntimeError):
+                await self.bot._get_account_info_cached()
+            await asyncio.sleep(0)
+
+            assert self.bot._account_fetch is None
+            assert await self.bot._get_account_info_cached() is ACCOUNT_INFO
+        finally:
+            asyncio.get_running_loop().set_task_factory(None)
+
+    @pytest.mark.asyncio
+    async def test_status_and_balance_report_parsed_balances(self):
+        self.mock_client.get_account_info = AsyncMock(return_value=ACCOUNT_INFO)
+        self.scalping_strategy.get_status.return_value = {
+            'is_running': False, 'active_positions_count': 0, 'trading_pairs': ['BTCUSDT']}
+
+        update = self.make_update('/status')
+        await self.bot._status(update, None)
+        assert 'Account Balance: $101.00' in update.message.reply_text.call_args[0][0]
+
+        update = self.make_update('/balance')
+        await self.bot._balance(update, None)
+        text = update.message.reply_text.call_args[0][0]
+        assert 'USDT: 100.5000 free, 0.5000 locked' in text
+        assert 'BTC' not in text
+
+    @pytest.mark.asyncio
+    async def test_notifications_fan_out_concurrently(self):
+        in_flight = []
+        peak = 0
+
+        async def send_message(chat_id, text, parse_mode=None):
+            nonlocal peak
+            in_flight.append(chat_id)
+            peak = max(peak, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(chat_id)
+            if chat_id == 3:
+                raise RuntimeError('blocked by user')
+        self.bot.bot = MagicMock(send_message=send_message)
+        for user_id in (1, 2, 3, 4):
+            self.bot._add_subscriber(user_id)
+
+        await self.bot._send_notification_to_all('hello')
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_start_trading_replies_before_notifying(self):
+        self.bot._send_notification_to_all = AsyncMock()
+        update = self.make_update('/start_trading')
+
+        await self.bot._start_trading(update, None)
+        update.message.reply_text.assert_awaited_once()
+        await asyncio.gather(*self.bot._notify_tasks)
+
+        self.bot._send_notification_to_all.assert_awaited_once_with(
+            "🚨 Bot Alert: Scalping strategy started!")
+
+    @pytest.mark.asyncio
+    async def test_start_updates_uses_webhook_when_configured(self):
+        self.bot.application = MagicMock(initialize=AsyncMock(), start=AsyncMock())
+        self.bot.application.updater = MagicMock(start_webhook=AsyncMock(),
+                                                 start_polling=AsyncMock())
+        self.bot.webhook_url = 'https://bot.example.com/'
+        self.bot.webhook_secret = 'hook-secret'
+
+        await self.bot.start_updates()
+        self.bot.application.initialize.assert_awaited_once()
+        self.bot.application.updater.start_webhook.assert_awaited_once_with(
+            listen='0.0.0.0', port=8443, url_path='telegram',
+            webhook_url='https://bot.example.com/telegram', secret_token='hook-secret')
+        self.bot.application.updater.start_polling.assert_not_awaited()
+
+    def test_application_dispatches_updates_concurrently(self):
+        assert self.bot.application.concurrent_updates > 1
+
+    @pytest.mark.asyncio
+    async def test_commands_are_routed_by_name(self):
+        self.bot._commands['pairs'] = AsyncMock()
+        update = self.make_update('/pairs@MxcScalpBot extra')
+
+        await self.bot._dispatch_command(update, None)
+        self.bot._commands['pairs'].assert_awaited_once_with(update, None)
+
+    @pytest.mark.asyncio
+    async def test_set_risk_applies_table_rules(self):
+        settings = self.scalping_strategy.settings
+        settings.scalp_stop_loss = 0.003
+        update = self.make_update()
+
+        await self.bot._set_risk_parameters(update, MagicMock(args=['stop_loss', '0.5']))
+        update.message.reply_text.assert_awaited_with(
+            "❌ Stop loss must be between 0 and 0.1 (0% to 10%)")
+        assert settings.scalp_stop_loss == 0.003
+
+        await self.bot._set_risk_parameters(update, MagicMock(args=['max_consecutive_losses', '4']))
+        update.message.reply_text.assert_awaited_with("✅ Max consecutive losses set to 4")
+        assert settings.max_consecutive_losses == 4
+        self.scalping_strategy.refresh_settings.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_set_pairs_reports_invalid_pairs_in_one_reply(self):
+        update = self.make_update()
+
+        await self.bot._set_trading_pairs(update, MagicMock(args=['btcusdt,ETHUSD,x,', 'C98USDT']))
+        replies = [c.args[0] for c in update.message.reply_text.await_args_list]
+        assert replies[0] == "⚠️ Invalid pair format: ETHUSD, X. Use format like BTCUSDT"
+        assert len(replies) == 2
+        assert self.scalping_strategy.trading_pairs == ['BTCUSDT', 'C98USDT']
+
+    @pytest.mark.asyncio
+    async def test_help_is_sent_as_escaped_markdown_v2(self):
+        update = self.make_update('/help')
+
+        await self.bot._help(update, None)
+        text = update.message.reply_text.await_args.args[0]
+        assert '/start\\_trading \\- Start the scalping strategy' in text
+        assert update.message.reply_text.await_args.kwargs['parse_mode'] == 'MarkdownV2'
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_are_reported_to_the_user(self):
+        self.mock_client.get_account_info.side_effect = RuntimeError('timeout')
+        update = self.make_update('/balance')
+
+        await self.bot._balance(update, None)
+        update.message.reply_text.assert_awaited_once_with("❌ Error getting balance: timeout")
+
+    @pytest.mark.asyncio
+    async def test_large_broadcasts_are_paced_in_batches(self, monkeypatch):
+        sent = []
+        pauses = []
+
+        async def send_message(chat_id, text, parse_mode=None):
+            sent.append(chat_id)
+
+        async def fake_sleep(delay):
+            pauses.append((delay, len(sent)))
+        monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+        self.bot.bot = MagicMock(send_message=send_message)
+        for user_id in range(60):
+            self.bot._add_subscriber(user_id)
+
+        await self.bot._send_notification_to_all('hello')
+        assert sorted(sent) == list(range(60))
+        assert pauses == [(1.0, 25), (1.0, 50)]
+
+    @pytest.mark.asyncio
+    async def test_risk_params_and_profit_fill_templates(self):
+        settings = Settings()
+        settings.max_daily_loss = 50.0
+        settings.risk_per_trade = 0.02
+        settings.max_position_size = 10.0
+        settings.quote_currency = 'USDT'
+        self.scalping_strategy.settings = settings
+        self.bot.metrics_manager.get_statistics.return_value = {
+            'total_profit': 1.5, 'total_trades': 4, 'win_rate': 0.75,
+            'best_trade': 1.0, 'worst_trade': -0.25,
+        }
+        update = self.make_update()
+
+        await self.bot._get_risk_parameters(update, None)
+        text = update.message.reply_text.await_args.args[0]
+        assert "Max Daily Loss: $50.0\nRisk Per Trade: 2.00%" in text
+        assert text.endswith("Max Position Size: 10.0 USDT")
+
+        await self.bot._profit(update, None)
+        text = update.message.reply_text.await_args.args[0]
+        assert "Total Profit: +1.5000 USDT" in text
+        assert text.endswith("Worst Trade: -0.2500 USDT")
+
+    @pytest.mark.asyncio
+    async def test_subscribe_and_unsubscribe_update_broadcast_snapshot(self):
+        update = self.make_update('/subscribe')
+
+        await self.bot._subscribe_notifications(update, None)
+        snapshot = self.bot._subscribers
+        assert snapshot == (123456789,)
+        await self.bot._subscribe_notifications(update, None)
+        assert self.bot._subscribers is snapshot
+
+        await self.bot._unsubscribe_notifications(update, None)
+        assert self.bot._subscribers == ()
+
+    @pytest.mark.asyncio
+    async def test_trade_notification_is_sent_as_escaped_markdown_v2(self):
+        self.bot.bot = MagicMock(send_message=AsyncMock())
+        self.scalping_strategy.settings.quote_currency = 'USDT'
+        self.bot._add_subscriber(1)
+
+        await self.bot.send_trade_notification({
+            'symbol': 'BTC_USDT', 'side': 'SELL', 'size': 0.001,
+            'profit': 0.25, 'timestamp': '2024-01-01T00:00:00',
+        })
+        self.bot.bot.send_message.assert_awaited_once()
+        kwargs = self.bot.bot.send_message.await_args.kwargs
+        assert kwargs['parse_mode'] == 'MarkdownV2'
+        assert 'Symbol: BTC\\_USDT\n' in kwargs['text']
+        assert 'Profit: \\+0\\.2500 USDT' in kwargs['text']
+
+    @pytest.mark.asyncio
+    async def test_subscribers_are_saved_and_reloaded(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(TelegramBot, 'SUBSCRIBERS_SAVE_DELAY', 0.01)
+        path = str(tmp_path / 'data' / 'subs.json')
+        self.bot.subscribers_file = path
+        self.bot._add_subscriber(1)
+        self.bot._add_subscriber(2)
+        self.bot._remove_subscriber(1)
+
+        await asyncio.sleep(0.05)
+        reloaded = TelegramBot(
+            bot_token='test_token',
+            authorized_users=[123456789],
+            exchange_client=self.mock_client,
+            scalping_strategy=self.scalping_strategy,
+            metrics_manager=MagicMock(),
+            subscribers_file=path
+        )
+        assert reloaded._subscribers == (2,)
@@ -1,7 +1,9 @@
 """
 Test to verify the web interface works
 """
+import os
 import pytest
+from src.web.web_controller import WebController
 from src.web.web_interface import WebBotController
 from unittest.mock import MagicMock
 
@@ -65,9 +67,423 @@ def test_get_risk_parameters_method():
     assert isinstance(params, dict)
 
 
+def test_web_controller_status_is_cached_until_changed():
+    """Polled status is reused briefly and recomputed after a control action."""
+    bot_manager = MagicMock()
+    bot_manager.scalping_strategy.is_running = False
+    controller = WebController(bot_manager)
+    client = controller.app.test_client()
+    
+    assert controller.get_status() is controller.get_status()
+    
+    bot_manager.scalping_strategy.is_running = True
+    assert controller.get_status()['scalping_running'] is False
+    client.post('/start_scalp')
+    assert controller.get_status()['scalping_running'] is True
+
+
+def test_web_controller_renders_dashboard_and_status_json():
+    """The dashboard template is found and /status serves the cached status."""
+    bot_manager = MagicMock()
+    bot_manager.scalping_strategy.is_running = False
+    bot_manager.scalping_strategy.trading_pairs = ['BTCUSDT']
+    bot_manager.scalping_strategy.settings.max_daily_loss = 100.0
+    bot_manager.scalping_strategy.settings.risk_per_trade = 0.02
+    bot_manager.scalping_strategy.settings.scalp_profit_target = 0.005
+    bot_manager.scalping_strategy.settings.scalp_stop_loss = 0.003
+    bot_manager.range_scalp_strategy = None
+    bot_manager.futures_strategy = None
+    controller = WebController(bot_manager)
+    client = controller.app.test_client()
+    
+    assert client.get('/').status_code == 200
+    
+    response = client.get('/status')
+    assert response.get_json()['trading_pairs'] == ['BTCUSDT']
+    assert controller.get_status_json() is controller.get_status_json()
+
+
+def test_web_controller_set_pairs_dedups_and_drops_invalid():
+    """Pairs are upper-cased, de-duplicated and malformed entries dropped."""
+    bot_manager = MagicMock()
+    controller = WebController(bot_manager)
+    client = controller.app.test_client()
+    
+    response = client.post('/set_pairs', data={'pairs': ' btcusdt, 1inchUSDT,BTCUSDT,,bad-1 '})
+    body = response.get_json()
+    assert body['status'] == 'success'
+    assert body['invalid_pairs'] == ['BAD-1']
+    assert body['message'].endswith('(invalid pairs ignored: BAD-1)')
+    assert bot_manager.scalping_strategy.trading_pairs == ['BTCUSDT', '1INCHUSDT']
+    bot_manager.futures_strategy.set_trading_pairs.assert_called_once_with(['BTCUSDT', '1INCHUSDT'])
+    
+    response = client.post('/set_pairs', data={'pairs': 'x,1'})
+    body = response.get_json()
+    assert body['status'] == 'error'
+    assert body['invalid_pairs'] == ['X', '1']
+
+
+def test_test_credentials_checks_in_one_loop_hop():
+    """Server time and account info are awaited in a single _run_async_task call."""
+    from unittest.mock import AsyncMock
+    client = MagicMock()
+    client._make_request = AsyncMock(return_value={'serverTime': 1})
+    client.get_account_info = AsyncMock(return_value={'balances': [
+        {'free': '1', 'locked': '0'},
+        {'free': '0', 'locked': '2.5'},
+        {'free': None, 'locked': '0'},
+        {'free': '0'}
+    ]})
+    settings = MagicMock(api_key='key', secret_key='secret')
+    controller = WebBotController(settings=settings, mxc_client=client)
+    
+    hops = []
+    run = controller._run_async_task
+    controller._run_async_task = lambda coro, **kw: hops.append(coro) or run(coro, **kw)
+    
+    body = controller.app.test_client().post('/test_credentials').get_json()
+    
+    assert body['status'] == 'success'
+    assert body['details'].endswith('Found 2 assets with balance.')
+    assert len(hops) == 1
+    client._make_request.assert_awaited_once()
+    client.get_account_info.assert_awaited_once()
+
+
+def test_test_credentials_reports_unreachable_api():
+    """A failing server-time probe is reported as a connection problem."""
+    from unittest.mock import AsyncMock
+    client = MagicMock()
+    client._make_request = AsyncMock(side_effect=OSError('down'))
+    client.get_account_info = AsyncMock(return_value={'balances': []})
+    settings = MagicMock(api_key='key', secret_key='secret')
+    controller = WebBotController(settings=settings, mxc_client=client)
+    
+    body = controller.app.test_client().post('/test_credentials').get_json()
+    
+    assert body['status'] == 'error'
+    assert body['message'].startswith('Failed to connect to MXC API')
+
+
+def test_exchange_reads_are_cached_until_credentials_change(monkeypatch):
+    """Dashboard polls within the TTL reuse one exchange call per endpoint."""
+    from unittest.mock import AsyncMock
+    # set_credentials mirrors the key into the environment; restore it afterwards
+    monkeypatch.setenv('MXC_API_KEY', '')
+    client = MagicMock()
+    client.get_balance = AsyncMock(return_value=[{'asset': 'USDT', 'free': 1.0}])
+    client.update_credentials = AsyncMock()
+    settings = MagicMock(api_key='key', secret_key='secret')
+    controller = WebBotController(settings=settings, mxc_client=client)
+    http = controller.app.test_client()
+    
+    first = http.get('/balance_data').get_json()
+    second = http.get('/balance_data').get_json()
+    assert first == second == {'balances': [{'asset': 'USDT', 'free': 1.0}]}
+    assert client.get_balance.await_count == 1
+    
+    http.post('/set_credentials', data={'api_key': 'other'})
+    http.get('/balance_data')
+    assert client.get_balance.await_count == 2
+
+
+def test_exchange_read_in_flight_during_clear_is_not_cached():
+    """A read that started before a credentials switch does not refill the cache."""
+    client = MagicMock()
+    settings = MagicMock(api_key='key', secret_key='secret')
+    controller = WebBotController(settings=settings, mxc_client=client)
+    calls = []
+    
+    async def get_balance():
+        calls.append(None)
+        if len(calls) == 1:
+            # The credentials change while this read is on the wire
+            controller.clear_exchange_cache()
+        return [{'asset': 'USDT', 'free': float(len(calls))}]
+    
+    client.get_balance = get_balance
+    http = controller.app.test_client()
+    
+    assert http.get('/balance_data').get_json() == {'balances': [{'asset': 'USDT', 'free': 1.0}]}
+    assert http.get('/balance_data').get_json() == {'balances': [{'asset': 'USDT', 'free': 2.0}]}
+    assert len(calls) == 2
+
+
+def test_concurrent_identical_exchange_calls_share_one_request():
+    """Requests for the same key while a call is in flight wait on that call."""
+    import asyncio
+    import threading
+    import time
+    
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        controller = WebBotController(event_loop=loop)
+        release = threading.Event()
+        calls = []
+        
+        async def fetch_positions():
+            calls.append(1)
+            await loop.run_in_executor(None, release.wait)
+            return {'positions': []}
+        
+        joined = []
+        join = controller._join_inflight
+        controller._join_inflight = lambda *a: joined.append(1) or join(*a)
+        
+        results = []
+        workers = [
+            threading.Thread(target=lambda: results.append(
+                controller._run_async_task(fetch_positions(), key='positions')))
+            for _ in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        while len(joined) < 3:
+            time.sleep(0.01)
+        release.set()
+        for worker in workers:
+            worker.join(5)
+        
+        assert results == [{'positions': []}] * 3
+        assert len(calls) == 1
+        assert controller._inflight == {}
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+
+def test_check_credentials_overlaps_both_requests():
+    """The time probe and account lookup are in flight at the same time."""
+    import asyncio
+    
+    started = []
+    
+    async def call(name, result):
+        started.append(name)
+        await asyncio.sleep(0)
+        # Both requests were issued before either finished
+        assert started == ['time', 'account']
+        return result
+    
+    client = MagicMock()
+    client._make_request = lambda *a, **kw: call('time', {'serverTime': 1})
+    client.get_account_info = lambda: call('account', {'balances': []})
+    controller = WebBotController(mxc_client=client)
+    
+    assert asyncio.run(controller._check_credentials()) == {'balances': []}
+
+
+def test_get_status_counts_running_strategies():
+    """Status reports each strategy's state and the number running."""
+    controller = WebBotController(
+        scalping_strategy=MagicMock(is_running=True, trading_pairs=['BTCUSDT']),
+        range_scalp_strategy=MagicMock(is_running=False),
+        futures_strategy=MagicMock(is_running=True)
+    )
+    
+    assert controller.get_status() == {
+        'scalping_running': True,
+        'range_running': False,
+        'futures_running': True,
+        'trading_pairs': ['BTCUSDT'],
+        'active_strategies': 2
+    }
+
+
+def test_set_risk_applies_known_fields_and_skips_bad_values():
+    """Each known form field is cast and stored; unknown or malformed ones are ignored."""
+    settings = MagicMock()
+    settings.max_daily_loss = 100.0
+    settings.max_consecutive_losses = 5
+    strategy = MagicMock()
+    controller = WebBotController(scalping_strategy=strategy, settings=settings)
+    
+    body = controller.app.test_client().post('/set_risk', data={
+        'max_daily_loss': '250',
+        'max_consecutive_losses': 'three',
+        'profit_target': '0.01',
+        'stop_loss': '',
+        'unknown': '1'
+    }).get_json()
+    
+    assert body == {'status': 'success', 'message': '2 risk parameters updated'}
+    assert settings.max_daily_loss == 250.0
+    assert settings.max_consecutive_losses == 5
+    assert settings.scalp_profit_target == 0.01
+    strategy.refresh_settings.assert_called_once()
+
+
+def test_exchange_data_endpoints_require_client_and_report_errors():
+    """Data endpoints refuse without credentials and turn failures into an error body."""
+    from unittest.mock import AsyncMock
+    client = MagicMock()
+    client.get_my_trades = AsyncMock(side_effect=RuntimeError('boom'))
+    
+    controller = WebBotController(settings=MagicMock(api_key='', secret_key=''), mxc_client=client)
+    body = controller.app.test_client().get('/trades_data').get_json()
+    assert body == {'error': 'Exchange client not available or credentials not set'}
+    
+    controller.settings = MagicMock(api_key='key', secret_key='secret', default_symbol='BTCUSDT')
+    body = controller.app.test_client().get('/trades_data').get_json()
+    assert body['error'].startswith('Error fetching trades:')
+
+
+def test_create_app_returns_a_wsgi_app():
+    """The module-level factory builds a fresh dashboard app."""
+    from src.web.web_interface import create_app
+    
+    app = create_app()
+    
+    assert app.test_client().get('/status').status_code == 200
+
+
+def test_set_credentials_validates_users_before_applying(monkeypatch):
+    """A malformed user list rejects the whole update; a valid one is applied with the keys."""
+    for name in ('MXC_API_KEY', 'MXC_SECRET_KEY', 'TELEGRAM_BOT_TOKEN', 'TELEGRAM_AUTHORIZED_USERS'):
+        monkeypatch.setenv(name, '')
+    settings = MagicMock(api_key='old', telegram_authorized_users=[])
+    controller = WebBotController(settings=settings)
+    http = controller.app.test_client()
+    
+    body = http.post('/set_credentials', data={'api_key': 'new', 'telegram_users': '1, x'}).get_json()
+    assert body['status'] == 'error'
+    assert settings.api_key == 'old'
+    
+    body = http.post('/set_credentials', data={'api_key': 'new', 'telegram_users': ' 1, 2 ,'}).get_json()
+    assert body['status'] == 'success'
+    assert settings.api_key == 'new'
+    assert settings.telegram_authorized_users == [1, 2]
+    assert os.environ['MXC_API_KEY'] == 'new'
+    assert os.environ['TELEGRAM_AUTHORIZED_USERS'] == '1,2'
+
+
+def test_json_responses_use_orjson_provider():
+    """Responses are encoded by orjson when it is installed, keeping Flask's key order."""
+    from decimal import Decimal
+    from src.web.web_interface import OrjsonProvider
+    pytest.importorskip('orjson')
+    controller = WebBotController()
+    
+    assert isinstance(controller.app.json, OrjsonProvider)
+    assert controller.app.json.dumps({'b': Decimal('1.5'), 'a': 1}) == '{"a":1,"b":"1.5"}'
+    assert controller.app.test_client().get('/status').get_json()['active_strategies'] == 0
+
+
+def test_timed_out_exchange_call_is_cancelled_on_the_loop():
+    """A call that outlives its timeout raises TimeoutError and is cancelled on the loop."""
+    import asyncio
+    import threading
+    
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        controller = WebBotController(event_loop=loop)
+        cancelled = threading.Event()
+        
+        async def slow_call():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        
+        with pytest.raises(TimeoutError, match='Timed out waiting for exchange response'):
+            controller._run_async_task(slow_call(), timeout=0.05)
+        assert cancelled.wait(1)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+
+def test_credentials_status_is_cached_until_credentials_change(monkeypatch):
+    """The dashboard reuses the credentials summary until /set_credentials changes it."""
+    monkeypatch.setenv('TELEGRAM_BOT_TOKEN', '')
+    settings = MagicMock(api_key='', secret_key='', telegram_bot_token='', telegram_authorized_users=[])
+    controller = WebBotController(settings=settings)
+    
+    first = controller.get_credentials_status()
+    assert controller.get_credentials_status() is first
+    assert first['bot_token_set'] is False
+    
+    controller.app.test_client().post('/set_credentials', data={'bot_token': '123:abc'})
+    assert controller.get_credentials_status()['bot_token_set'] is True
+    
+    controller.settings = None
+    assert controller.get_credentials_status()['bot_token_set'] is False
+
+
+def test_set_pairs_normalizes_and_updates_each_strategy():
+    """Valid pairs are upper-cased, de-duplicated and applied to every strategy; rejects are reported."""
+    scalping, ranging, futures = MagicMock(), MagicMock(), MagicMock()
+    controller = WebBotController(
+        scalping_strategy=scalping, range_scalp_strategy=ranging, futures_strategy=futures
+    )
+    
+    body = controller.app.test_client().post(
+        '/set_pairs', data={'pairs': ' btcusdt, 1inchusdt solusdt,,BTCUSDT, btc-usd, eth'}
+    ).get_json()
+    
+    assert body['status'] == 'success'
+    assert body['invalid_pairs'] == ['BTC-USD', 'ETH']
+    assert body['message'].endswith('(3 strategies updated); invalid pairs ignored: BTC-USD, ETH')
+    assert scalping.trading_pairs == ranging.trading_pairs == ['BTCUSDT', '1INCHUSDT', 'SOLUSDT']
+    futures.set_trading_pairs.assert_called_once_with(['BTCUSDT', '1INCHUSDT', 'SOLUSDT'])
+    
+    body = controller.app.test_client().post('/set_pairs', data={'pairs': 'btc-usd, eth'}).get_json()
+    assert body == {'status': 'error', 'invalid_pairs': ['BTC-USD', 'ETH'],
+                    'message': 'No valid pairs provided; invalid pairs ignored: BTC-USD, ETH'}
+    futures.set_trading_pairs.assert_called_once()
+
+
+def test_routes_are_bound_methods_with_stable_endpoints():
+    """Every view is a bound method of the controller, registered under its endpoint name."""
+    controller = WebBotController()
+    views = controller.app.view_functions
+    
+    assert views['start_scalp'] == controller._start_scalp
+    assert views['get_balance'].__self__ is controller
+    assert {rule.rule for rule in controller.app.url_map.iter_rules()} >= {
+        '/', '/status', '/set_pairs', '/set_credentials', '/test_credentials', '/balance_data'
+    }
+
+
+def test_standalone_calls_share_one_background_loop():
+    """Without a running bot loop, every call runs on the same long-lived loop."""
+    import asyncio
+    
+    async def current_loop():
+        return asyncio.get_running_loop()
+    
+    first = WebBotController()._run_async_task(current_loop())
+    second = WebBotController()._run_async_task(current_loop())
+    
+    assert first is second
+    assert first.is_running()
+
+
+def test_dashboard_renders_from_preloaded_template():
+    """The dashboard template is loaded once at setup and rendered on each visit."""
+    settings = MagicMock(
+        max_daily_loss=100.0, risk_per_trade=0.02, max_consecutive_losses=5,
+        scalp_profit_target=0.005, scalp_stop_loss=0.003, max_position_size=10.0,
+        api_key='', secret_key='', telegram_bot_token='', telegram_authorized_users=[]
+    )
+    controller = WebBotController(settings=settings)
+    
+    assert controller._dashboard_template.name == 'dashboard.html'
+    response = controller.app.test_client().get('/')
+    assert response.status_code == 200
+    assert b'<html' in response.data.lower()
+
+
 if __name__ == "__main__":
     test_web_controller_initialization()
     test_web_controller_with_components()
     test_get_status_method()
     test_get_risk_parameters_method()
-    print("All web interface tests passed!")
\ No newline at end of file
+    print("All web interface tests passed!")
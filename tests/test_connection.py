@@ -81,6 +81,14 @@ class TestMXCConnection(unittest.TestCase):
             await self.client._handle_websocket_message(message)
             callback.assert_awaited_once_with(message['data'])
 
+            # Synchronous callbacks are called without being awaited
+            sync_callback = MagicMock(return_value=None)
+            self.client.market_callbacks[channel] = [sync_callback]
+            with patch.object(self.client.logger, 'error') as log_error:
+                await self.client._handle_websocket_message(message)
+            sync_callback.assert_called_once_with(message['data'])
+            log_error.assert_not_called()
+
         asyncio.run(test())
         
     def test_market_data_handler(self):